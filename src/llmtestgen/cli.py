@@ -7,16 +7,40 @@ import os
 import platform
 import shutil
 import subprocess  # nosec linter, used safely
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from llmtestgen.services.test_generation.test_spec_generator import (
     generate_test_spec_from_paths,
     CodeContextLevel,
+    TestSpecification,
+)
+from dotenv import dotenv_values
+
+from llmtestgen.core.utils_files import write_chunks_atomic
+from llmtestgen.core.utils_memory import MemoryProfiler, profile_stage
+from llmtestgen.core.utils_watch import FileWatcher
+from llmtestgen.services.cost_forecast import forecast_test_generation, load_price_table
+from llmtestgen.services.model_routing import ModelRoutingPolicy
+from llmtestgen.services.results_store import ResultsStore
+from llmtestgen.services.test_generation.context_compression import ContextCompression
+from llmtestgen.services.test_generation.coverage_targeting import (
+    CoverageData,
+    CoverageError,
+    run_suite_with_coverage,
 )
 from llmtestgen.services.test_generation.python_test_writer import (
-    write_test_spec_file,
+    write_test_spec_file_outcome,
+)
+from llmtestgen.services.test_generation.pytest_validation import (
+    build_llm_case_regenerator,
+    emit_validated_pytest,
 )
+from llmtestgen.services.test_generation.watch_session import WatchSession
+from llmtestgen.wrappers.hedging import HedgedSender
+from llmtestgen.wrappers.llm_backend import LLMBackend
+from llmtestgen.wrappers.provider_pool import ProviderPool
 from llmtestgen.wrappers.openrouter_client import send_prompt
 
 from llmtestgen.cli_args import args
@@ -129,6 +153,62 @@ def open_env_file() -> None:
     print(f"No supported text editor detected. Edit the file manually: {env_path}")
 
 
+def _warm_up_providers(pool: ProviderPool) -> None:
+    """Health-check the pool's backends (runs alongside spec parsing and repo loading)."""
+    for name, healthy in pool.check_health().items():
+        if not healthy:
+            print(f"⚠️ Provider {name} failed its health check; ejected for now.")
+
+
+def _context_compression() -> ContextCompression:
+    if args.no_context_compression:
+        return ContextCompression.disabled()
+    return ContextCompression(strip_docstrings=args.strip_docstrings)
+
+
+def _coverage() -> Optional[CoverageData]:
+    """Coverage of the repository's existing tests, if requested on the command line."""
+    if args.coverage_data:
+        return CoverageData.load(args.coverage_data)
+    if args.run_coverage:
+        print("Running the repository's test suite under coverage...")
+        return run_suite_with_coverage(args.repo_source)
+    return None
+
+
+def _dry_run(
+    code_context_level: CodeContextLevel,
+    routing: ModelRoutingPolicy,
+    env: Dict[str, Optional[str]],
+    coverage: Optional[CoverageData],
+) -> int:
+    """Forecast the run without calling any LLM; non-zero when over budget."""
+    forecast = forecast_test_generation(
+        args.spec_path,
+        args.repo_source,
+        model=args.model,
+        default_model=env.get("OPENROUTER_DEFAULT_MODEL"),
+        code_context_level=code_context_level,
+        use_llm_for_spec=args.force_spec_llm,
+        llm_fallback_for_spec=args.fallback_spec_llm,
+        routing=routing,
+        prompt_cache_hints=not args.no_prompt_cache_hints,
+        code_index_path=args.code_index,
+        repo_ref=args.ref,
+        price_table=load_price_table(args.price_table) if args.price_table else None,
+        context_compression=_context_compression(),
+        coverage=coverage,
+    )
+    print(forecast.render())
+
+    problems = forecast.budget_violations(
+        max_cost=args.max_cost, max_input_tokens=args.max_input_tokens
+    )
+    for problem in problems:
+        print(f"❌ Over budget: {problem}")
+    return 2 if problems else 0
+
+
 def main():
     """Entry point for `llmtestgen`."""
     if not ENV_PATH.exists():
@@ -139,6 +219,66 @@ def main():
     # Map CLI string to CodeContextLevel enum
     code_context_level = CodeContextLevel(args.code_context_level)
 
+    # Per-stage models: .env / environment first, CLI flags on top
+    env = {**dotenv_values(ENV_PATH), **os.environ}
+    routing = ModelRoutingPolicy.from_env(env)
+    routing = routing.with_overrides(
+        escalation_model=args.escalation_model,
+        routes=args.route,
+        parse=args.parse_model,
+        generate=args.model,
+    )
+
+    coverage = None
+    if args.watch and (args.coverage_data or args.run_coverage):
+        print("⚠️ Coverage data is ignored with --watch: its line numbers go stale.")
+    elif args.ref and args.run_coverage:
+        # The suite runs on the working tree, the context is read at --ref
+        print("⚠️ --run-coverage is ignored with --ref: its line numbers would not match.")
+    else:
+        if args.ref and args.coverage_data:
+            print(f"ℹ️ {args.coverage_data} must be measured at {args.ref} to match its lines.")
+        try:
+            coverage = _coverage()
+        except CoverageError as exc:
+            print(f"❌ {exc}")
+            raise SystemExit(1)
+
+    if args.dry_run:
+        raise SystemExit(_dry_run(code_context_level, routing, env, coverage))
+
+    send_prompt_fn = send_prompt
+    primary = LLMBackend("openrouter", send_prompt)
+    pool = None
+    warm_up = None
+    if args.provider:
+        try:
+            pool = ProviderPool.from_specs(args.provider)
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            raise SystemExit(1)
+        warm_up = partial(_warm_up_providers, pool)
+        send_prompt_fn = pool
+        primary = LLMBackend("pool", pool)
+    if args.hedge_to:
+        try:
+            send_prompt_fn = HedgedSender(
+                primary,
+                [LLMBackend.from_spec(target) for target in args.hedge_to],
+                hedge_percentile=args.hedge_percentile / 100,
+            )
+        except ValueError as exc:
+            print(f"❌ {exc}")
+            raise SystemExit(1)
+
+    if args.watch:
+        if warm_up is not None:
+            warm_up()
+        _watch(code_context_level, routing, send_prompt_fn)
+        return
+
+    memory_profiler = MemoryProfiler() if args.profile_memory else None
+
     print("---- Generating Tests ----")
     print(f"Using spec: {args.spec_path}")
     print(f"Using repo: {args.repo_source}")
@@ -153,7 +293,8 @@ def main():
     test_spec = generate_test_spec_from_paths(
         spec_path=args.spec_path,
         repo_source=args.repo_source,
-        send_prompt_fn=send_prompt,   # OpenRouter backend
+        repo_ref=args.ref,
+        send_prompt_fn=send_prompt_fn,   # OpenRouter backend (optionally hedged)
         model=args.model,             # None -> uses OPENROUTER_DEFAULT_MODEL
         api_key=None,                 # None -> uses OPENROUTER_API_KEY env var
         code_context_level=code_context_level,
@@ -161,15 +302,165 @@ def main():
         max_chars_per_file=4000,
         use_llm_for_spec=args.force_spec_llm,       # parse spec with classical parsers first
         llm_fallback_for_spec=args.fallback_spec_llm,   # if parsing fails, fallback to LLM
+        lean=args.lean or args.raw_response_dir is not None,
+        raw_response_dir=args.raw_response_dir,
+        prompt_cache_hints=not args.no_prompt_cache_hints,
+        dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+        routing=routing,
+        structured_output=not args.no_structured_output,
+        max_continuations=args.max_continuations,
+        code_index_path=args.code_index,
+        warm_up=warm_up,
+        memory_profiler=memory_profiler,
+        context_compression=_context_compression(),
+        coverage=coverage,
     )
 
+    if test_spec.truncated:
+        print(
+            f"⚠️ LLM answer is still truncated after {test_spec.continuations} "
+            "continuation request(s); some test cases may be missing. "
+            "Raise --max-continuations or the model's output limit."
+        )
+    elif test_spec.continuations:
+        print(
+            f"LLM answer was truncated; recovered it with "
+            f"{test_spec.continuations} continuation request(s)."
+        )
+
+    if test_spec.duplicates:
+        print(f"Removed {len(test_spec.duplicates)} near-duplicate test case(s):")
+        for dup in test_spec.duplicates:
+            print(
+                f"  - {dup.removed_id or dup.removed_description} "
+                f"~ {dup.kept_id or dup.kept_description} ({dup.similarity:.0%})"
+            )
+
+    if test_spec.usage is not None:
+        usage = test_spec.usage
+        print(
+            f"Tokens: {usage.prompt_tokens} prompt "
+            f"({usage.cached_tokens} cached, {usage.cache_hit_ratio:.0%}), "
+            f"{usage.completion_tokens} completion"
+        )
+
+    if pool is not None:
+        for status in pool.status():
+            print(
+                f"Provider {status.name}: {status.calls} call(s), {status.failures} failure(s)"
+                + ("" if status.healthy else " [ejected]")
+            )
+    if isinstance(send_prompt_fn, HedgedSender):
+        print(f"Hedges fired: {send_prompt_fn.hedges_fired}, won: {send_prompt_fn.hedge_wins}")
+        for name, stats in send_prompt_fn.tracker.stats().items():
+            print(f"  {name}: {stats.count} call(s), p50 {stats.p50:.2f}s, p95 {stats.p95:.2f}s")
+
     output_path = Path(args.output_path)
-    write_test_spec_file(test_spec, output_path=output_path)
+    with profile_stage(memory_profiler, "render"):
+        written = _write_output(test_spec, output_path, send_prompt_fn)
 
-    print(f"\n✅ Generated tests written to: {output_path}")
+    if args.results_db:
+        with ResultsStore(args.results_db) as store:
+            run_id = store.record_run([test_spec], repo_source=args.repo_source, ref=args.ref)
+        print(f"Recorded as run {run_id} in {args.results_db}")
+
+    if written:
+        print(f"\n✅ Generated tests written to: {output_path}")
+    else:
+        print(f"\n✅ Generated tests unchanged, left untouched: {output_path}")
     print("You can now run:")
     print(f"  pytest {output_path}")
 
+    if memory_profiler is not None:
+        memory_profiler.stop()
+        print()
+        print(memory_profiler.render())
+
+
+def _watch(
+    code_context_level: CodeContextLevel,
+    routing: ModelRoutingPolicy,
+    send_prompt_fn,
+) -> None:
+    """Regenerate the output after each edit of the spec or the repository sources."""
+    session = WatchSession.from_paths(
+        args.spec_path,
+        args.repo_source,
+        send_prompt_fn=send_prompt_fn,
+        model=args.model,
+        code_context_level=code_context_level,
+        max_files=20,
+        max_chars_per_file=4000,
+        use_llm_for_spec=args.force_spec_llm,
+        llm_fallback_for_spec=args.fallback_spec_llm,
+        raw_response_dir=args.raw_response_dir,
+        prompt_cache_hints=not args.no_prompt_cache_hints,
+        dedup_threshold=None if args.no_dedup else args.dedup_threshold,
+        routing=routing,
+        structured_output=not args.no_structured_output,
+        max_continuations=args.max_continuations,
+        code_index_path=args.code_index,
+        repo_ref=args.ref,
+        context_compression=_context_compression(),
+        lean=args.lean or args.raw_response_dir is not None,
+    )
+    output_path = Path(args.output_path)
+    repo_root = session.repo_root
+    watcher = FileWatcher(
+        [args.spec_path],
+        [repo_root] if repo_root is not None else [],
+        ignore=[output_path],
+        debounce=args.watch_debounce,
+    )
+    watched = f"{args.spec_path} and {repo_root}" if repo_root is not None else args.spec_path
+    print(f"Watching {watched} ({watcher.backend}); press Ctrl+C to stop.")
+
+    def refresh(changed) -> None:
+        try:
+            run = session.refresh(changed)
+        except Exception as exc:  # keep watching: the next save may fix it
+            print(f"⚠️ Refresh failed, keeping the previous output: {exc}")
+            return
+        if run.regenerated == "none":
+            print(f"✅ {run.summary()}")
+            return
+        written = _write_output(run.test_spec, output_path, send_prompt_fn)
+        state = "written to" if written else "unchanged in"
+        print(f"✅ {run.summary()}; tests {state} {output_path}")
+
+    try:
+        refresh(None)
+        for changed in watcher.changes():
+            print(f"Changed: {', '.join(sorted(changed))}")
+            refresh(changed)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        session.close()
+
+
+def _write_output(test_spec: TestSpecification, output_path: Path, send_prompt_fn) -> bool:
+    """Render and write the generated tests; True if the file was (re)written."""
+    if output_path.suffix == ".py" and not args.no_pytest_validation:
+        # Check the module compiles and collects; regenerate only failing cases
+        repo_root = Path(args.repo_source)
+        [emission] = emit_validated_pytest(
+            [test_spec],
+            repo_root=repo_root if repo_root.is_dir() else None,
+            regenerate_fn=build_llm_case_regenerator(send_prompt_fn, model=test_spec.llm_model),
+            skip_placeholders=args.skip_placeholders,
+        )
+        if emission.regenerated:
+            print(f"Regenerated {len(emission.regenerated)} failing test case(s).")
+        if emission.skipped_imports:
+            print(f"Unresolved imports commented out: {', '.join(emission.skipped_imports)}")
+        if not emission.validation.ok:
+            print("⚠️ Generated module still fails validation; review it before running.")
+        return write_chunks_atomic(output_path, [emission.module.source])
+    return write_test_spec_file_outcome(
+        test_spec, output_path=output_path, skip_placeholders=args.skip_placeholders
+    ).written
+
 
 def settings() -> None:
     """Entry point for `llmtestgen-settings`."""
@@ -1,26 +1,79 @@
 import argparse
 
+from llmtestgen.services.model_routing import parse_route
+from llmtestgen.services.test_generation.case_dedup import check_dedup_threshold
 from llmtestgen.services.test_generation.test_spec_generator import CodeContextLevel
+from llmtestgen.wrappers.llm_backend import LLMBackend
+
+
+def _dedup_threshold(value: str) -> float:
+    try:
+        threshold = float(value)
+        check_dedup_threshold(threshold)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a similarity in (0, 1], got {value!r}")
+    return threshold
+
+
+def _route(value: str) -> str:
+    try:
+        parse_route(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+    return value
+
+
+def _hedge_target(value: str) -> str:
+    try:
+        LLMBackend.from_spec(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+    return value
+
+
+def _percentile(value: str) -> float:
+    try:
+        percentile = float(value)
+        if not 0.0 < percentile < 100.0:
+            raise ValueError(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a percentile in (0, 100), got {value!r}")
+    return percentile
+
 
 parser = argparse.ArgumentParser(
     description="Generate pytest tests for the task service using LLMTestGen."
 )
 
 parser.add_argument(
-    "spec-path",
+    "spec_path",
+    metavar="spec-path",
     type=str,
     help="Path to the specification file (Markdown, JSON, YAML, OpenAPI, etc.).",
 )
 parser.add_argument(
-    "repo-source",
+    "repo_source",
+    metavar="repo-source",
     type=str,
     help="Path to the Python project root (Git repo or plain directory).",
 )
+parser.add_argument(
+    "--ref",
+    type=str,
+    default=None,
+    help=(
+        "Branch, tag or commit of the repository to analyze. It is read straight from "
+        "the git object database; the working tree is not checked out or modified."
+    ),
+)
 parser.add_argument(
     "--output-path",
     type=str,
     default=".",
-    help="Where to write the generated pytest file.",
+    help=(
+        "Where to write the generated tests: a pytest module for .py, JSON Lines for "
+        ".jsonl, Markdown otherwise."
+    ),
 )
 parser.add_argument(
     "--model",
@@ -28,6 +81,61 @@ parser.add_argument(
     default=None,  # will fall back to OPENROUTER_DEFAULT_MODEL if None
     help="LLM model name (optional, defaults to OPENROUTER_DEFAULT_MODEL).",
 )
+parser.add_argument(
+    "--parse-model",
+    type=str,
+    default=None,
+    help="Model for LLM spec parsing (defaults to LLMTESTGEN_PARSE_MODEL, then --model).",
+)
+parser.add_argument(
+    "--escalation-model",
+    type=str,
+    default=None,
+    help=(
+        "Stronger model retried when LLM parsing reports low confidence or a stage "
+        "returns invalid output (defaults to LLMTESTGEN_ESCALATION_MODEL)."
+    ),
+)
+parser.add_argument(
+    "--route",
+    action="append",
+    type=_route,
+    default=[],
+    metavar="STAGE[.SIZE]=MODEL",
+    help=(
+        "Model route by stage (parse, generate) and optional prompt size "
+        "(small, medium, large), e.g. generate.large=MODEL. Repeatable."
+    ),
+)
+parser.add_argument(
+    "--provider",
+    action="append",
+    default=[],
+    metavar="PROVIDER[:MODEL][@BASE_URL][*WEIGHT]",
+    help=(
+        "Balance requests over several backends (openrouter, openai, or any "
+        "OpenAI-compatible BASE_URL) with weighted round-robin and failover. "
+        "Repeatable; defaults to OpenRouter only."
+    ),
+)
+parser.add_argument(
+    "--hedge-to",
+    action="append",
+    type=_hedge_target,
+    default=[],
+    metavar="PROVIDER[:MODEL]",
+    help=(
+        "Hedge slow generation requests: if OpenRouter has not answered within "
+        "--hedge-percentile of its observed latency, send the same request here "
+        "(openrouter:MODEL or openai[:MODEL]) and keep the first valid answer. Repeatable."
+    ),
+)
+parser.add_argument(
+    "--hedge-percentile",
+    type=_percentile,
+    default=95.0,
+    help="Latency percentile of the primary provider after which a hedge is fired.",
+)
 parser.add_argument(
     "--code-context-level",
     type=str,
@@ -38,6 +146,106 @@ parser.add_argument(
         f"{[lvl.value for lvl in CodeContextLevel]}"
     ),
 )
+parser.add_argument(
+    "--no-context-compression",
+    action="store_true",
+    help=(
+        "Send code context files verbatim (by default comment-only lines and blank runs "
+        "are dropped and identical files are sent once)."
+    ),
+)
+parser.add_argument(
+    "--strip-docstrings",
+    action="store_true",
+    help="With --code-context-level full, also strip docstrings from the code context.",
+)
+parser.add_argument(
+    "--coverage-data",
+    type=str,
+    default=None,
+    help=(
+        "coverage.py data of the repository's existing tests (a .coverage file or a "
+        "`coverage json` report): untested functions and branches get priority in the "
+        "code context, fully covered code is left out."
+    ),
+)
+parser.add_argument(
+    "--run-coverage",
+    action="store_true",
+    help=(
+        "Run the repository's test suite once under coverage.py (pytest, with branch "
+        "data) and use the result like --coverage-data."
+    ),
+)
+parser.add_argument(
+    "--code-index",
+    type=str,
+    default=None,
+    help=(
+        "SQLite file for the persistent symbol index used by the 'outline' code context "
+        "level; later runs only re-parse changed files."
+    ),
+)
+parser.add_argument(
+    "--results-db",
+    type=str,
+    default=None,
+    help=(
+        "Also record the run in this SQLite results store, queried with "
+        "`llmtestgen-results` (e.g. .llmtestgen/results.db)."
+    ),
+)
+parser.add_argument(
+    "--dry-run",
+    action="store_true",
+    help=(
+        "Assemble all prompts without sending them and print estimated tokens, "
+        "latency and cost. Exits with status 2 when --max-cost/--max-input-tokens is exceeded."
+    ),
+)
+parser.add_argument(
+    "--max-cost",
+    type=float,
+    default=None,
+    help="Dry-run budget: maximum estimated cost of the run in USD.",
+)
+parser.add_argument(
+    "--max-input-tokens",
+    type=int,
+    default=None,
+    help="Dry-run budget: maximum total input tokens of the run.",
+)
+parser.add_argument(
+    "--price-table",
+    type=str,
+    default=None,
+    help=(
+        "JSON file of model profiles overriding the built-in price/throughput table, e.g. "
+        '{"gpt-4o-mini": {"input_per_mtok": 0.15, "output_per_mtok": 0.6}}.'
+    ),
+)
+parser.add_argument(
+    "--watch",
+    action="store_true",
+    help=(
+        "Keep running: watch the spec and the repository's Python sources and refresh the "
+        "output after each edit, re-running only the stages the edit affects."
+    ),
+)
+parser.add_argument(
+    "--watch-debounce",
+    type=float,
+    default=0.5,
+    help="With --watch, seconds without further changes before a refresh starts.",
+)
+parser.add_argument(
+    "--profile-memory",
+    action="store_true",
+    help=(
+        "Trace memory per stage (parse, context, prompt, request, response parse, render) "
+        "and report peak usage, top allocation sites and peak RSS. Stages run sequentially."
+    ),
+)
 parser.add_argument(
     "--force-spec-llm",
     action="store_true",
@@ -48,6 +256,66 @@ parser.add_argument(
     action="store_true",
     help="Fallback to LLM parsing if classical parsing of the specification fails.",
 )
+parser.add_argument(
+    "--lean",
+    action="store_true",
+    help=(
+        "Memory-lean mode: keep spec raw text by reference and spill raw LLM "
+        "responses to side files."
+    ),
+)
+parser.add_argument(
+    "--raw-response-dir",
+    type=str,
+    default=None,
+    help="Directory for spilled raw LLM responses (implies --lean; defaults to a temp dir).",
+)
+parser.add_argument(
+    "--no-prompt-cache-hints",
+    action="store_true",
+    help="Do not send cache_control hints to models that support explicit prompt caching.",
+)
+parser.add_argument(
+    "--no-structured-output",
+    action="store_true",
+    help="Do not request JSON-schema structured output, even from models that support it.",
+)
+parser.add_argument(
+    "--max-continuations",
+    type=int,
+    default=2,
+    help=(
+        "When the LLM answer is cut off by its output limit, keep the complete test "
+        "cases and ask this many times at most for the remaining ones (0 disables)."
+    ),
+)
+parser.add_argument(
+    "--dedup-threshold",
+    type=_dedup_threshold,
+    default=0.8,
+    help="Similarity (0-1] above which generated test cases are merged as near-duplicates.",
+)
+parser.add_argument(
+    "--no-dedup",
+    action="store_true",
+    help="Keep near-duplicate test cases returned by the LLM.",
+)
+parser.add_argument(
+    "--skip-placeholders",
+    action="store_true",
+    help=(
+        "For .py outputs, make unwritten tests and precondition fixtures call "
+        "pytest.skip instead of failing."
+    ),
+)
+parser.add_argument(
+    "--no-pytest-validation",
+    action="store_true",
+    help=(
+        "For .py outputs, skip the compile/collection check and regeneration "
+        "of failing test cases."
+    ),
+)
 
 # Parse the arguments
 # use import from other files to access them
@@ -1,6 +1,7 @@
 """Core utilities for spec parsing."""
 
-from .utils_errors import SpecParsingError
+from .utils_errors import RawTextRefError, SpecParsingError
+from .utils_raw_text import RawTextRef
 from .utils_warnings import SpecWarning
 
-__all__ = ["SpecParsingError", "SpecWarning"]
+__all__ = ["RawTextRef", "RawTextRefError", "SpecParsingError", "SpecWarning"]
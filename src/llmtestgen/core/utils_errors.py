@@ -5,3 +5,7 @@ class SpecParsingError(Exception):
     """Raised when a spec cannot be parsed or normalized."""
 
     pass
+
+
+class RawTextRefError(RuntimeError):
+    """Raised when by-reference raw text cannot be loaded or no longer matches."""
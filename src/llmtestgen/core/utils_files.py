@@ -0,0 +1,119 @@
+"""Atomic, skip-if-unchanged file writing and bounded text reading."""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# mkstemp creates files as 0600; give new outputs the usual permissions instead.
+_DEFAULT_FILE_MODE = 0o666 & ~_current_umask()
+_HASH_CHUNK_SIZE = 1 << 16
+# Bytes inspected for NUL bytes when deciding whether a file is binary
+_BINARY_SNIFF_SIZE = 8192
+
+
+def file_sha256(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_chunks_atomic(
+    path: str | Path,
+    chunks: Iterable[str],
+    *,
+    encoding: str = "utf-8",
+    skip_unchanged: bool = True,
+) -> bool:
+    """Stream `chunks` to a temp file next to `path` and rename it into place.
+
+    Readers never see a half-written file. When `skip_unchanged` is set and the
+    existing file already has the same content hash, the temp file is discarded
+    and `path` is left untouched (its mtime does not change).
+
+    Returns True if `path` was (re)written, False if it was left unchanged.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            for chunk in chunks:
+                data = chunk.encode(encoding)
+                digest.update(data)
+                size += len(data)
+                fh.write(data)
+
+        if (
+            skip_unchanged
+            and path.is_file()
+            and path.stat().st_size == size
+            and file_sha256(path) == digest.hexdigest()
+        ):
+            tmp_path.unlink()
+            return False
+
+        mode = path.stat().st_mode & 0o777 if path.exists() else _DEFAULT_FILE_MODE
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+        return True
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class TextHead(NamedTuple):
+    """The (possibly truncated) text of a file read by `read_text_head`."""
+    text: str
+    size: int          # file size in bytes
+    truncated: bool    # True when only the first `max_bytes` were read
+
+
+def read_text_head(
+    path: str | Path,
+    max_bytes: Optional[int] = None,
+    *,
+    encoding: str = "utf-8",
+) -> Optional[TextHead]:
+    """Read at most `max_bytes` of a text file, without loading the rest.
+
+    Returns None for binary files (a NUL byte near the start) and content
+    that does not decode. A multi-byte character cut by `max_bytes` is
+    dropped rather than treated as a decoding error.
+    """
+    path = Path(path)
+    with path.open("rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        data = fh.read() if max_bytes is None else fh.read(max_bytes)
+    return decode_text_head(data, size, encoding=encoding)
+
+
+def decode_text_head(data: bytes, size: int, *, encoding: str = "utf-8") -> Optional[TextHead]:
+    """Decode the first bytes of a `size`-byte file as `read_text_head` does."""
+    truncated = size > len(data)
+    if b"\x00" in data[:_BINARY_SNIFF_SIZE]:
+        return None
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        text = decoder.decode(data, final=not truncated)
+    except UnicodeDecodeError:
+        return None
+    return TextHead(text=text, size=size, truncated=truncated)
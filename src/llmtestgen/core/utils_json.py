@@ -0,0 +1,89 @@
+"""Tolerant extraction of JSON from LLM responses."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+# ```json ... ``` (or a bare ``` fence), anywhere in the text
+_FENCE = re.compile(r"```[ \t]*(?:json|JSON)?[ \t]*\r?\n(.*?)```", re.DOTALL)
+_OPENER = re.compile(r"[\[{]")
+_MAX_CANDIDATES = 64
+
+_decoder = json.JSONDecoder()
+
+
+def extract_json(text: str) -> Any:
+    """Return the JSON value in an LLM response, tolerating fences and prose.
+
+    Tries, in order: the whole (stripped) text, the contents of Markdown code
+    fences, then the largest object/array embedded in the text (so leading
+    chatter and trailing explanations are ignored). Never calls the LLM again.
+
+    Raises `json.JSONDecodeError` (a ValueError) when nothing decodes.
+    """
+    stripped = text.strip().lstrip("﻿")
+    try:
+        return json.loads(stripped)
+    except json.JSONDecodeError as err:
+        first_error = err
+
+    for block in _FENCE.findall(stripped):
+        try:
+            return json.loads(block.strip())
+        except json.JSONDecodeError:
+            continue
+
+    best: Optional[Tuple[int, Any]] = None
+    pos = 0
+    for _ in range(_MAX_CANDIDATES):
+        match = _OPENER.search(stripped, pos)
+        if match is None:
+            break
+        start = match.start()
+        try:
+            value, end = _decoder.raw_decode(stripped, start)
+        except json.JSONDecodeError:
+            pos = start + 1
+            continue
+        if best is None or end - start > best[0]:
+            best = (end - start, value)
+        pos = end  # skip values nested inside this one
+
+    if best is None:
+        raise first_error
+    return best[1]
+
+
+def salvage_json_array(text: str, key: Optional[str] = None) -> Tuple[List[Any], bool]:
+    """Recover the complete items of a JSON array that may be cut off.
+
+    The array is the value of `"key"` when given (found anywhere in the text),
+    else the first top-level `[`. Items are decoded one by one until the
+    closing bracket or the first incomplete item.
+
+    Returns `(items, closed)`; `closed` is False when the array was truncated.
+    """
+    if key is not None:
+        match = re.search(r'"%s"\s*:\s*\[' % re.escape(key), text)
+    else:
+        match = re.search(r"\[", text)
+    if match is None:
+        return [], False
+
+    items: List[Any] = []
+    pos = match.end()
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= length:
+            return items, False
+        if text[pos] == "]":
+            return items, True
+        try:
+            value, pos = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            return items, False
+        items.append(value)
@@ -0,0 +1,125 @@
+"""Per-stage memory profiling with tracemalloc and peak RSS."""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover - platform dependent
+    resource = None  # type: ignore[assignment]
+
+
+class AllocationSite(BaseModel):
+    """Source line that allocated memory during a stage (net of frees)."""
+    location: str        # "path/to/file.py:123"
+    size_bytes: int
+    count: int
+
+
+class StageMemory(BaseModel):
+    """Memory use of one pipeline stage."""
+    stage: str
+    allocated_bytes: int             # net traced allocations kept after the stage
+    peak_bytes: int                  # traced peak while the stage ran
+    rss_peak_bytes: Optional[int]    # process peak RSS so far (None if unavailable)
+    top: List[AllocationSite] = Field(default_factory=list)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _mib(size: Optional[int]) -> str:
+    return "n/a" if size is None else f"{size / (1 << 20):.1f} MiB"
+
+
+class MemoryProfiler:
+    """Record tracemalloc snapshots around named pipeline stages.
+
+    Stages should not overlap: tracemalloc traces the whole process, so
+    concurrent stages would be charged each other's allocations.
+    """
+
+    def __init__(self, *, top: int = 5, frames: int = 1) -> None:
+        """
+        Args:
+            top: allocation sites reported per stage
+            frames: traceback depth recorded by tracemalloc
+        """
+        self.top = top
+        self.frames = frames
+        self.stages: List[StageMemory] = []
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as stage `name`."""
+        self.start()
+        before = tracemalloc.take_snapshot()
+        start_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            diff = after.filter_traces(filters).compare_to(
+                before.filter_traces(filters), "lineno"
+            )
+            top = [
+                AllocationSite(
+                    location=f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    size_bytes=stat.size_diff,
+                    count=stat.count_diff,
+                )
+                for stat in diff
+                if stat.size_diff > 0
+            ][: self.top]
+            self.stages.append(
+                StageMemory(
+                    stage=name,
+                    allocated_bytes=current - start_current,
+                    peak_bytes=peak,
+                    rss_peak_bytes=peak_rss_bytes(),
+                    top=top,
+                )
+            )
+
+    def render(self) -> str:
+        lines = ["---- Memory profile ----"]
+        for entry in self.stages:
+            lines.append(
+                f"{entry.stage:<15} peak {_mib(entry.peak_bytes)}, "
+                f"kept {_mib(entry.allocated_bytes)}, peak RSS {_mib(entry.rss_peak_bytes)}"
+            )
+            for site in entry.top:
+                lines.append(f"    {_mib(site.size_bytes):>10}  {site.location} ({site.count} blocks)")
+        lines.append(f"Peak RSS: {_mib(peak_rss_bytes())}")
+        return "\n".join(lines)
+
+
+def profile_stage(profiler: Optional[MemoryProfiler], name: str) -> ContextManager[None]:
+    """`profiler.stage(name)`, or a no-op when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
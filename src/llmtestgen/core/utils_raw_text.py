@@ -0,0 +1,92 @@
+"""By-reference storage for large raw texts (spec sources, LLM responses)."""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import tempfile
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from .utils_errors import RawTextRefError
+
+
+class RawTextRef(BaseModel):
+    """Pointer to raw text kept on disk instead of in memory.
+
+    The text is identified by its path and the SHA-256 of its UTF-8 encoding,
+    so a later `load()` can detect that the file changed underneath us.
+    """
+
+    path: str
+    sha256: str
+    size: int
+    encoding: str = "utf-8"
+
+    @classmethod
+    def from_text(cls, path: str | Path, text: str, *, encoding: str = "utf-8") -> "RawTextRef":
+        """Build a reference for `text` that was read from `path`."""
+        data = text.encode(encoding)
+        return cls(
+            path=str(path),
+            sha256=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+            encoding=encoding,
+        )
+
+    @classmethod
+    def spill(
+        cls,
+        text: str,
+        directory: str | Path,
+        *,
+        suffix: str = ".txt",
+        encoding: str = "utf-8",
+    ) -> "RawTextRef":
+        """Write `text` to a content-addressed side file and return its reference.
+
+        Identical texts share a single file; existing files are not rewritten.
+        """
+        data = text.encode(encoding)
+        digest = hashlib.sha256(data).hexdigest()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / f"{digest}{suffix}"
+
+        if not target.exists():
+            fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".spill-", suffix=suffix)
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp_name, target)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+        return cls(path=str(target), sha256=digest, size=len(data), encoding=encoding)
+
+    def load(self, *, verify: bool = True) -> str:
+        """Read the referenced text back (memory-mapped) and optionally verify its hash."""
+        path = Path(self.path)
+        try:
+            with path.open("rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    data = b""
+                else:
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = mm[:]
+        except OSError as exc:
+            raise RawTextRefError(f"Unable to read raw text from '{self.path}': {exc}") from exc
+
+        # Mirror Path.read_text() universal newline handling so hashes line up.
+        text = data.decode(self.encoding).replace("\r\n", "\n").replace("\r", "\n")
+
+        if verify:
+            digest = hashlib.sha256(text.encode(self.encoding)).hexdigest()
+            if digest != self.sha256:
+                raise RawTextRefError(
+                    f"Raw text at '{self.path}' changed since it was referenced."
+                )
+        return text
@@ -18,3 +18,4 @@ class SpecWarning(str, Enum):
     LLM_LOW_CONFIDENCE = (
         "LLM confidence {confidence}% is below threshold {threshold}%; results may be incomplete."
     )
+    LLM_ESCALATED = "Retrying LLM parsing with stronger model {model} ({reason})."
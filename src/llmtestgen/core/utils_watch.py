@@ -0,0 +1,152 @@
+"""Debounced file watching, native (`watchfiles`) where installed, polling otherwise."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+try:  # optional: inotify/FSEvents/ReadDirectoryChangesW (ships with uvicorn[standard])
+    import watchfiles
+except ImportError:  # pragma: no cover - depends on the environment
+    watchfiles = None
+
+# Directory names never worth watching inside a source tree
+SKIPPED_DIRS = frozenset(
+    {".git", ".hg", ".svn", "__pycache__", ".venv", "venv", "node_modules", ".mypy_cache",
+     ".pytest_cache", ".ruff_cache", ".tox", "build", "dist"}
+)
+
+
+class FileWatcher:
+    """Watch some files plus the sources under some roots, reporting changes in batches.
+
+    Each batch is the set of paths (absolute, as strings) created, modified or
+    deleted since the previous one. A batch is only reported once no further
+    change arrived for `debounce` seconds, so an editor's save (often several
+    writes and a rename) or a `git checkout` triggers a single refresh.
+    """
+
+    def __init__(
+        self,
+        files: Iterable[str | Path] = (),
+        roots: Iterable[str | Path] = (),
+        *,
+        suffixes: Tuple[str, ...] = (".py",),
+        ignore: Iterable[str | Path] = (),
+        debounce: float = 0.5,
+        interval: float = 0.5,
+        native: bool = True,
+    ) -> None:
+        """
+        Args:
+            files: individual files to watch (e.g. the spec)
+            roots: directories whose files ending in `suffixes` are watched
+            ignore: files never reported (e.g. an output written under a root)
+            debounce: quiet period, in seconds, closing a batch of changes
+            interval: polling period, in seconds, of the polling backend
+            native: use `watchfiles` when it is installed
+        """
+        self.files = {str(Path(f).resolve()) for f in files}
+        self.roots = [Path(r).resolve() for r in roots]
+        self.suffixes = suffixes
+        self.ignore = {str(Path(f).resolve()) for f in ignore}
+        self.debounce = debounce
+        self.interval = interval
+        self.native = native and watchfiles is not None
+        self._snapshot: Dict[str, Tuple[int, int]] = self.scan()
+
+    @property
+    def backend(self) -> str:
+        return "watchfiles" if self.native else "polling"
+
+    def relevant(self, path: str | Path) -> bool:
+        """True if a change to `path` should be reported."""
+        path = str(path)
+        if path in self.ignore:
+            return False
+        if path in self.files:
+            return True
+        if not path.endswith(self.suffixes):
+            return False
+        for root in self.roots:
+            try:
+                parts = Path(path).relative_to(root).parts
+            except ValueError:
+                continue
+            return not any(part in SKIPPED_DIRS or part.startswith(".") for part in parts[:-1])
+        return False
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Current `(mtime_ns, size)` of every watched file."""
+        found: Dict[str, Tuple[int, int]] = {}
+
+        def add(path: str) -> None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return
+            found[path] = (stat.st_mtime_ns, stat.st_size)
+
+        for path in self.files:
+            add(path)
+        for root in self.roots:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [
+                    d for d in dirnames if d not in SKIPPED_DIRS and not d.startswith(".")
+                ]
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    if name.endswith(self.suffixes) and path not in self.ignore:
+                        add(path)
+        return found
+
+    def poll(self) -> Set[str]:
+        """Paths changed since the previous scan (one polling step)."""
+        current = self.scan()
+        previous, self._snapshot = self._snapshot, current
+        return {
+            path
+            for path in previous.keys() | current.keys()
+            if previous.get(path) != current.get(path)
+        }
+
+    def changes(self, stop_event: Optional[threading.Event] = None) -> Iterator[Set[str]]:
+        """Yield debounced batches of changed paths until `stop_event` is set."""
+        if self.native:
+            yield from self._native_changes(stop_event)
+        else:
+            yield from self._polling_changes(stop_event)
+
+    def _native_changes(self, stop_event: Optional[threading.Event]) -> Iterator[Set[str]]:
+        # Spec files are watched through their directory so atomic saves
+        # (write a temp file, rename it over the original) are still seen
+        targets = {str(Path(f).parent) for f in self.files} | {str(r) for r in self.roots}
+        for batch in watchfiles.watch(
+            *sorted(targets),
+            debounce=int(self.debounce * 1000),
+            step=50,
+            stop_event=stop_event,
+        ):
+            changed = {path for _, path in batch if self.relevant(path)}
+            if changed:
+                yield changed
+
+    def _polling_changes(self, stop_event: Optional[threading.Event]) -> Iterator[Set[str]]:
+        stop = stop_event or threading.Event()
+        pending: Set[str] = set()
+        last_change = 0.0
+        while not stop.is_set():
+            step = min(self.interval, self.debounce) if pending else self.interval
+            if stop.wait(step):
+                break
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                yield pending
+                pending = set()
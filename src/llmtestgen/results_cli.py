@@ -0,0 +1,108 @@
+# CLI entry point for querying the llmtestgen results store
+
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional, Sequence
+
+from llmtestgen.services.results_store import ResultsStore, StoredTestCase
+from llmtestgen.services.test_generation.jsonl_io import read_test_specs_jsonl
+from llmtestgen.services.test_generation.test_spec_generator import TestCase
+
+DEFAULT_RESULTS_DB = ".llmtestgen/results.db"
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Query the local store of generated test specifications."
+    )
+    parser.add_argument(
+        "--db",
+        default=DEFAULT_RESULTS_DB,
+        help=f"SQLite results store (default: {DEFAULT_RESULTS_DB}).",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs = commands.add_parser("runs", help="List recorded runs, newest first.")
+    runs.add_argument("--limit", type=int, default=20)
+
+    requirement = commands.add_parser("requirement", help="Test cases covering a requirement.")
+    requirement.add_argument("text")
+    requirement.add_argument(
+        "--contains", action="store_true", help="Match requirements containing TEXT."
+    )
+    requirement.add_argument("--run", type=int, default=None, help="Only this run.")
+
+    element = commands.add_parser(
+        "element", help="Test cases targeting a code element (or anything inside it)."
+    )
+    element.add_argument("name")
+    element.add_argument("--run", type=int, default=None, help="Only this run.")
+
+    diff = commands.add_parser(
+        "diff", help="Test cases added, removed or changed between two runs."
+    )
+    diff.add_argument("old", type=int, nargs="?", help="Older run (default: the previous one).")
+    diff.add_argument("new", type=int, nargs="?", help="Newer run (default: the latest one).")
+
+    record = commands.add_parser("import", help="Record JSONL outputs as one run.")
+    record.add_argument("paths", nargs="+")
+    record.add_argument("--label", default=None)
+    return parser
+
+
+def _case_line(spec_source_path: str, test_case: TestCase) -> str:
+    return f"{spec_source_path}  {test_case.id or '-'}: {test_case.description}"
+
+
+def _print_cases(cases: List[StoredTestCase]) -> None:
+    for stored in cases:
+        print(f"run {stored.run_id}  {_case_line(stored.spec_source_path, stored.test_case)}")
+    print(f"{len(cases)} test case(s)")
+
+
+def run(argv: Optional[Sequence[str]] = None) -> int:
+    """Execute one results command; returns the exit status."""
+    args = _build_parser().parse_args(argv)
+    with ResultsStore(args.db) as store:
+        if args.command == "runs":
+            for entry in store.runs(limit=args.limit):
+                label = f"  [{entry.label}]" if entry.label else ""
+                print(
+                    f"{entry.id:>5}  {entry.created_at}  {entry.spec_count} spec(s), "
+                    f"{entry.test_case_count} case(s){label}"
+                )
+        elif args.command == "requirement":
+            _print_cases(
+                store.cases_for_requirement(args.text, run_id=args.run, contains=args.contains)
+            )
+        elif args.command == "element":
+            _print_cases(store.cases_for_code_element(args.name, run_id=args.run))
+        elif args.command == "diff":
+            new = args.new if args.new is not None else store.latest_run_id()
+            old = args.old if args.old is not None else store.latest_run_id(offset=1)
+            if old is None or new is None:
+                print("Need two recorded runs to diff.")
+                return 1
+            diff = store.diff_runs(old, new)
+            print(f"Run {old} -> {new}:")
+            for stored in diff.added:
+                print(f"  + {_case_line(stored.spec_source_path, stored.test_case)}")
+            for stored in diff.removed:
+                print(f"  - {_case_line(stored.spec_source_path, stored.test_case)}")
+            for change in diff.changed:
+                print(f"  ~ {_case_line(change.spec_source_path, change.after)}")
+            print(
+                f"{len(diff.added)} added, {len(diff.removed)} removed, "
+                f"{len(diff.changed)} changed, {diff.unchanged} unchanged"
+            )
+        elif args.command == "import":
+            specs = (spec for path in args.paths for spec in read_test_specs_jsonl(path))
+            run_id = store.record_run(specs, label=args.label)
+            print(f"Recorded run {run_id}.")
+    return 0
+
+
+def main() -> None:
+    """Entry point for `llmtestgen-results`."""
+    raise SystemExit(run())
@@ -0,0 +1,402 @@
+"""Persistent, incremental index of the Python symbols in a repository.
+
+The index lives in a SQLite file and records, per Python file, the module
+docstring, its top-level functions and classes (with methods), their
+signatures and docstrings, and its import edges. Files are keyed by
+modification time and size (or by blob SHA when a repository is read from
+its object database), so a later run re-parses only the files that changed;
+a cold build parses in a process pool.
+
+Context building and target validation can then query symbols instead of
+re-reading and scanning source text.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+# Below this many changed files, parsing in-process beats pool start-up
+PARALLEL_PARSE_THRESHOLD = 32
+_DOC_MAX_CHARS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    file_key TEXT NOT NULL,
+    module TEXT NOT NULL,
+    docstring TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    path TEXT NOT NULL,
+    qualname TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    lineno INTEGER NOT NULL,
+    signature TEXT NOT NULL,
+    docstring TEXT
+);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT NOT NULL,
+    imported TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(qualname);
+CREATE INDEX IF NOT EXISTS imports_path ON imports(path);
+CREATE INDEX IF NOT EXISTS imports_imported ON imports(imported);
+"""
+
+
+class SymbolRecord(BaseModel):
+    """A function, class or method defined in an indexed file."""
+    path: str
+    qualname: str                 # e.g. "create_task", "TaskStore.add"
+    kind: str                     # "function", "class" or "method"
+    lineno: int
+    signature: str                # e.g. "def add(self, task: Task) -> None"
+    docstring: Optional[str] = None
+
+
+class ModuleRecord(BaseModel):
+    """Everything the index knows about one Python file."""
+    path: str
+    module: str                   # dotted module name derived from the path
+    docstring: Optional[str] = None
+    imports: List[str] = Field(default_factory=list)
+    symbols: List[SymbolRecord] = Field(default_factory=list)
+    error: Optional[str] = None   # set when the file could not be parsed
+
+
+class IndexUpdate(BaseModel):
+    """Outcome of `CodeIndex.update`."""
+    parsed: int = 0               # new or changed files (re-)parsed
+    reused: int = 0               # unchanged files served from the index
+    removed: int = 0              # files no longer in the repository
+
+
+# ==============================================================================
+# Parsing
+# ==============================================================================
+
+
+def module_name_for_path(path: str) -> str:
+    """`src/pkg/mod.py` -> `pkg.mod` (a leading `src/` layout folder is dropped)."""
+    parts = path.replace("\\", "/").removesuffix(".py").split("/")
+    if parts and parts[-1] == "__init__":
+        parts = parts[:-1]
+    if len(parts) > 1 and parts[0] == "src":
+        parts = parts[1:]
+    return ".".join(parts)
+
+
+def _short_doc(node: ast.AST) -> Optional[str]:
+    doc = ast.get_docstring(node)  # type: ignore[arg-type]
+    if not doc:
+        return None
+    return doc if len(doc) <= _DOC_MAX_CHARS else doc[:_DOC_MAX_CHARS] + "..."
+
+
+def _signature(node: ast.AST) -> str:
+    if isinstance(node, ast.ClassDef):
+        bases = ", ".join(ast.unparse(base) for base in node.bases)
+        return f"class {node.name}({bases})" if bases else f"class {node.name}"
+    assert isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))  # nosec - callers filter
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+
+def _imports(tree: ast.Module, module: str) -> List[str]:
+    package = module.split(".")[:-1]
+    found: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                target = ".".join([*base, node.module] if node.module else base)
+            else:
+                target = node.module or ""
+            if target:
+                found.append(target)
+    return sorted(set(found))
+
+
+def parse_python_module(path: str, source: str) -> ModuleRecord:
+    """Extract the symbols, docstrings and imports of one Python file."""
+    module = module_name_for_path(path)
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as exc:
+        return ModuleRecord(path=path, module=module, error=f"{type(exc).__name__}: {exc}")
+
+    symbols: List[SymbolRecord] = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            kind = "function"
+        elif isinstance(node, ast.ClassDef):
+            kind = "class"
+        else:
+            continue
+        symbols.append(
+            SymbolRecord(
+                path=path, qualname=node.name, kind=kind, lineno=node.lineno,
+                signature=_signature(node), docstring=_short_doc(node),
+            )
+        )
+        if isinstance(node, ast.ClassDef):
+            for child in node.body:
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    symbols.append(
+                        SymbolRecord(
+                            path=path, qualname=f"{node.name}.{child.name}", kind="method",
+                            lineno=child.lineno, signature=_signature(child),
+                            docstring=_short_doc(child),
+                        )
+                    )
+
+    return ModuleRecord(
+        path=path,
+        module=module,
+        docstring=_short_doc(tree),
+        imports=_imports(tree, module),
+        symbols=symbols,
+    )
+
+
+def _parse_file(root: str, path: str) -> Dict[str, Any]:
+    """Process-pool worker: read and parse one file, returned as plain data."""
+    try:
+        source = (Path(root) / path).read_text(encoding="utf-8", errors="replace")
+    except OSError as exc:
+        record = ModuleRecord(path=path, module=module_name_for_path(path), error=str(exc))
+    else:
+        record = parse_python_module(path, source)
+    return record.model_dump()
+
+
+def _parse_source(path: str, source: str) -> Dict[str, Any]:
+    """Process-pool worker for sources read by the caller."""
+    return parse_python_module(path, source).model_dump()
+
+
+def _file_key(stat: os.stat_result) -> str:
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+# ==============================================================================
+# Index
+# ==============================================================================
+
+
+class CodeIndex:
+    """SQLite-backed symbol index of the Python files under a repository root."""
+
+    def __init__(self, db_path: str | Path = ":memory:") -> None:
+        """
+        Args:
+            db_path: SQLite file to keep the index in across runs
+                (in-memory, i.e. rebuilt every run, by default)
+        """
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        # Built on pipeline worker threads; one thread uses the index at a time
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "CodeIndex":
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def update(
+        self,
+        root: str | Path,
+        paths: Iterable[str],
+        *,
+        max_workers: Optional[int] = None,
+    ) -> IndexUpdate:
+        """Bring the index in line with `paths` (relative to `root`).
+
+        Unchanged files (same mtime and size) are kept; new or changed files
+        are re-parsed, in a process pool when there are many of them; files
+        missing from `paths` are dropped.
+        """
+        root = Path(root)
+        wanted: Dict[str, str] = {}
+        for path in paths:
+            if not path.endswith(".py"):
+                continue
+            try:
+                wanted[path] = _file_key((root / path).stat())
+            except OSError:
+                continue
+
+        def parse(stale: List[str], parallel: bool) -> List[Dict[str, Any]]:
+            if not parallel:
+                return [_parse_file(str(root), path) for path in stale]
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(_parse_file, [str(root)] * len(stale), stale, chunksize=16))
+
+        return self._refresh(wanted, parse, max_workers)
+
+    def update_repository(self, repo: Any, *, max_workers: Optional[int] = None) -> IndexUpdate:
+        """`update` from a `GitRepository`, reading blobs when it has no checkout."""
+        repo.open()
+        if not repo.reads_objects:
+            return self.update(repo.path, repo.list_files(), max_workers=max_workers)
+
+        wanted = {p: repo.file_key(p) for p in repo.list_files() if p.endswith(".py")}
+
+        def parse(stale: List[str], parallel: bool) -> List[Dict[str, Any]]:
+            sources = [repo.read_bytes(path).decode("utf-8", errors="replace") for path in stale]
+            if not parallel:
+                return [_parse_source(path, source) for path, source in zip(stale, sources)]
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(_parse_source, stale, sources, chunksize=16))
+
+        return self._refresh(wanted, parse, max_workers)
+
+    def _refresh(
+        self,
+        wanted: Dict[str, str],
+        parse: Callable[[List[str], bool], List[Dict[str, Any]]],
+        max_workers: Optional[int],
+    ) -> IndexUpdate:
+        """Re-parse the `wanted` files whose key changed and drop the rest."""
+        known = dict(self._conn.execute("SELECT path, file_key FROM files"))
+        stale = [p for p, key in wanted.items() if known.get(p) != key]
+        removed = [p for p in known if p not in wanted]
+
+        parallel = len(stale) >= PARALLEL_PARSE_THRESHOLD and max_workers != 1
+        records = parse(stale, parallel)
+
+        with self._conn:
+            self._delete(removed + stale)
+            for data in records:
+                self._insert(ModuleRecord.model_validate(data), wanted[data["path"]])
+
+        return IndexUpdate(parsed=len(stale), reused=len(wanted) - len(stale), removed=len(removed))
+
+    def _delete(self, paths: Sequence[str]) -> None:
+        for table in ("files", "symbols", "imports"):
+            self._conn.executemany(f"DELETE FROM {table} WHERE path = ?", [(p,) for p in paths])  # nosec - fixed table names
+
+    def _insert(self, record: ModuleRecord, file_key: str) -> None:
+        self._conn.execute(
+            "INSERT INTO files (path, file_key, module, docstring, error) VALUES (?, ?, ?, ?, ?)",
+            (record.path, file_key, record.module, record.docstring, record.error),
+        )
+        self._conn.executemany(
+            "INSERT INTO symbols (path, qualname, kind, lineno, signature, docstring) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (s.path, s.qualname, s.kind, s.lineno, s.signature, s.docstring)
+                for s in record.symbols
+            ],
+        )
+        self._conn.executemany(
+            "INSERT INTO imports (path, imported) VALUES (?, ?)",
+            [(record.path, name) for name in record.imports],
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def paths(self) -> List[str]:
+        return [row[0] for row in self._conn.execute("SELECT path FROM files ORDER BY path")]
+
+    def module(self, path: str) -> Optional[ModuleRecord]:
+        row = self._conn.execute(
+            "SELECT path, module, docstring, error FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return ModuleRecord(
+            path=row[0], module=row[1], docstring=row[2], error=row[3],
+            imports=self.imports_of(path), symbols=self.symbols(path),
+        )
+
+    def symbols(self, path: Optional[str] = None) -> List[SymbolRecord]:
+        query = "SELECT path, qualname, kind, lineno, signature, docstring FROM symbols"
+        params: Tuple[Any, ...] = ()
+        if path is not None:
+            query += " WHERE path = ?"
+            params = (path,)
+        rows = self._conn.execute(query + " ORDER BY path, lineno", params)
+        return [_symbol(row) for row in rows]
+
+    def find_symbols(self, name: str) -> List[SymbolRecord]:
+        """Symbols whose qualified name is `name` or ends with `.name`."""
+        rows = self._conn.execute(
+            "SELECT path, qualname, kind, lineno, signature, docstring FROM symbols "
+            "WHERE qualname = ? OR qualname LIKE ? ESCAPE '\\' ORDER BY path, lineno",
+            (name, "%." + name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")),
+        )
+        return [_symbol(row) for row in rows]
+
+    def has_symbol(self, module_or_path: str, qualname: Optional[str] = None) -> bool:
+        """Whether a module (dotted name or file path) exists, and defines `qualname`."""
+        row = self._conn.execute(
+            "SELECT path FROM files WHERE path = ? OR module = ?", (module_or_path, module_or_path)
+        ).fetchone()
+        if row is None:
+            return False
+        if qualname is None:
+            return True
+        return self._conn.execute(
+            "SELECT 1 FROM symbols WHERE path = ? AND qualname = ?", (row[0], qualname)
+        ).fetchone() is not None
+
+    def imports_of(self, path: str) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT imported FROM imports WHERE path = ? ORDER BY imported", (path,)
+        )
+        return [row[0] for row in rows]
+
+    def importers_of(self, module: str) -> List[str]:
+        """Files importing `module` (or a name from it)."""
+        rows = self._conn.execute(
+            "SELECT DISTINCT path FROM imports WHERE imported = ? OR imported LIKE ? ORDER BY path",
+            (module, module + ".%"),
+        )
+        return [row[0] for row in rows]
+
+    def outline(self, path: str) -> str:
+        """Compact text outline of a file: docstring plus one line per symbol."""
+        record = self.module(path)
+        if record is None:
+            return ""
+        lines: List[str] = []
+        if record.docstring:
+            lines.append(f'"""{record.docstring.splitlines()[0]}"""')
+        if record.error:
+            lines.append(f"# [Not parsed: {record.error}]")
+        for symbol in record.symbols:
+            indent = "    " if symbol.kind == "method" else ""
+            doc = f'  # {symbol.docstring.splitlines()[0]}' if symbol.docstring else ""
+            lines.append(f"{indent}{symbol.signature}{doc}")
+        return "\n".join(lines)
+
+
+def _symbol(row: Sequence[Any]) -> SymbolRecord:
+    return SymbolRecord(
+        path=row[0], qualname=row[1], kind=row[2], lineno=row[3], signature=row[4], docstring=row[5]
+    )
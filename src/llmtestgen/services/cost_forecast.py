@@ -0,0 +1,381 @@
+"""Dry-run forecasting of prompt size, cost and latency.
+
+A dry run goes through the real pipeline (spec parsing, code context,
+routing, prompt assembly) with a send function that records each prompt
+instead of sending it. Tokens are counted with `tiktoken` when it is
+installed and the model is an OpenAI one, otherwise with a chars-per-token
+heuristic calibrated per model family. Output size, latency and cost come
+from a small local table of prices and throughputs, which can be overridden
+with a JSON file since list prices change.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+from llmtestgen.core.utils_errors import SpecParsingError
+from llmtestgen.services.code_index import CodeIndex
+from llmtestgen.services.model_routing import ModelRoutingPolicy, PipelineStage
+from llmtestgen.services.spec_analyser.parse_router_normalizer import (
+    NormalizedSpec,
+    parse_spec,
+)
+from llmtestgen.services.test_generation.context_compression import ContextCompression
+from llmtestgen.services.test_generation.coverage_targeting import CoverageData
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    TestSpecGenerator,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+try:  # optional: exact counts for OpenAI models
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+
+# Characters per token, measured on English prose mixed with Python code
+CHARS_PER_TOKEN: Dict[str, float] = {
+    "openai": 4.0,
+    "anthropic": 3.5,
+    "google": 4.0,
+    "meta-llama": 3.7,
+    "mistralai": 3.4,
+    "deepseek": 3.6,
+    "qwen": 3.6,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.6
+# Per-message framing added by chat templates
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+# Predicted answer sizes
+_TOKENS_PER_TEST_CASE = 140
+_CASES_PER_REQUIREMENT = 3
+_MIN_PREDICTED_CASES = 5
+_PARSE_OUTPUT_RATIO = 0.6
+_MIN_PARSE_OUTPUT_TOKENS = 100
+
+
+class ModelProfile(BaseModel):
+    """Price (USD per million tokens) and speed assumptions for a model."""
+    input_per_mtok: Optional[float] = None    # None: price unknown
+    output_per_mtok: Optional[float] = None
+    output_tokens_per_s: float = 50.0
+    prefill_tokens_per_s: float = 4000.0
+    first_token_s: float = 1.0
+
+
+# Approximate list prices; override with `load_price_table` for accurate numbers.
+# Keys are matched as prefixes of the model name without its vendor prefix.
+DEFAULT_PRICE_TABLE: Dict[str, ModelProfile] = {
+    "gpt-4o-mini": ModelProfile(input_per_mtok=0.15, output_per_mtok=0.60, output_tokens_per_s=80),
+    "gpt-4o": ModelProfile(input_per_mtok=2.50, output_per_mtok=10.00, output_tokens_per_s=60),
+    "gpt-4.1-mini": ModelProfile(input_per_mtok=0.40, output_per_mtok=1.60, output_tokens_per_s=80),
+    "gpt-4.1": ModelProfile(input_per_mtok=2.00, output_per_mtok=8.00, output_tokens_per_s=60),
+    "claude-3.5-haiku": ModelProfile(input_per_mtok=0.80, output_per_mtok=4.00, output_tokens_per_s=60),
+    "claude-3.5-sonnet": ModelProfile(input_per_mtok=3.00, output_per_mtok=15.00, output_tokens_per_s=50),
+    "claude-3.7-sonnet": ModelProfile(input_per_mtok=3.00, output_per_mtok=15.00, output_tokens_per_s=50),
+    "claude-sonnet-4": ModelProfile(input_per_mtok=3.00, output_per_mtok=15.00, output_tokens_per_s=50),
+    "gemini-2.0-flash": ModelProfile(input_per_mtok=0.10, output_per_mtok=0.40, output_tokens_per_s=120),
+    "gemini-1.5-pro": ModelProfile(input_per_mtok=1.25, output_per_mtok=5.00, output_tokens_per_s=60),
+}
+# OpenRouter's free variants
+_FREE_PROFILE = ModelProfile(input_per_mtok=0.0, output_per_mtok=0.0, output_tokens_per_s=30)
+
+
+class PromptForecast(BaseModel):
+    """Forecast for one LLM request of the run."""
+    stage: PipelineStage
+    model: Optional[str]
+    input_tokens: int
+    output_tokens: int              # predicted
+    latency_s: float
+    cost_usd: Optional[float]       # None when the model has no known price
+    exact_tokens: bool = False      # counted with a tokenizer, not estimated
+
+
+class RunForecast(BaseModel):
+    """Forecast for a whole run, one entry per prompt."""
+    prompts: List[PromptForecast] = Field(default_factory=list)
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(p.input_tokens for p in self.prompts)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(p.output_tokens for p in self.prompts)
+
+    @property
+    def latency_s(self) -> float:
+        return sum(p.latency_s for p in self.prompts)
+
+    @property
+    def cost_usd(self) -> float:
+        return sum(p.cost_usd or 0.0 for p in self.prompts)
+
+    @property
+    def fully_priced(self) -> bool:
+        return all(p.cost_usd is not None for p in self.prompts)
+
+    def budget_violations(
+        self,
+        *,
+        max_cost: Optional[float] = None,
+        max_input_tokens: Optional[int] = None,
+    ) -> List[str]:
+        """Human-readable reasons the run exceeds the given budget (empty if within)."""
+        problems: List[str] = []
+        if max_input_tokens is not None and self.input_tokens > max_input_tokens:
+            problems.append(
+                f"input tokens {self.input_tokens} exceed the budget of {max_input_tokens}"
+            )
+        if max_cost is not None:
+            if self.cost_usd > max_cost:
+                problems.append(f"estimated cost ${self.cost_usd:.4f} exceeds ${max_cost:.4f}")
+            elif not self.fully_priced:
+                problems.append("cost cannot be checked: some models have no known price")
+        return problems
+
+    def render(self) -> str:
+        lines = ["---- Dry run forecast ----"]
+        for p in self.prompts:
+            cost = "unknown price" if p.cost_usd is None else f"${p.cost_usd:.4f}"
+            approx = "" if p.exact_tokens else "~"
+            lines.append(
+                f"{p.stage.value:<9} {p.model or '(provider default)'}: "
+                f"{approx}{p.input_tokens} in, ~{p.output_tokens} out, "
+                f"~{p.latency_s:.1f}s, {cost}"
+            )
+        total_cost = f"${self.cost_usd:.4f}" + ("" if self.fully_priced else " (partial)")
+        lines.append(
+            f"Total: {self.input_tokens} input tokens, ~{self.output_tokens} output tokens, "
+            f"~{self.latency_s:.1f}s, {total_cost}"
+        )
+        return "\n".join(lines)
+
+
+# ==============================================================================
+# Estimation
+# ==============================================================================
+
+
+def _bare_model(model: Optional[str]) -> str:
+    return (model or "").split("/")[-1].lower()
+
+
+def _family(model: Optional[str]) -> Optional[str]:
+    if not model:
+        return None
+    if "/" in model:
+        return model.split("/")[0].lower()
+    bare = model.lower()
+    if bare.startswith(("gpt-", "o1", "o3", "o4")):
+        return "openai"
+    if bare.startswith("claude"):
+        return "anthropic"
+    if bare.startswith("gemini"):
+        return "google"
+    return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> tuple[int, bool]:
+    """Return `(tokens, exact)` for `text` as seen by `model`."""
+    if tiktoken is not None and _family(model) == "openai":
+        encoding = tiktoken.get_encoding("o200k_base")
+        return len(encoding.encode(text, disallowed_special=())), True
+    ratio = CHARS_PER_TOKEN.get(_family(model) or "", DEFAULT_CHARS_PER_TOKEN)
+    return math.ceil(len(text) / ratio), False
+
+
+def model_profile(
+    model: Optional[str], table: Optional[Mapping[str, ModelProfile]] = None
+) -> ModelProfile:
+    """Profile of the longest table key matching `model`; unknown price otherwise."""
+    table = DEFAULT_PRICE_TABLE if table is None else table
+    if model and model.endswith(":free"):
+        return _FREE_PROFILE
+    bare = _bare_model(model)
+    matches = [key for key in table if bare.startswith(key.lower()) or (model or "") == key]
+    if not matches:
+        return ModelProfile()
+    return table[max(matches, key=len)]
+
+
+def load_price_table(path: str | Path) -> Dict[str, ModelProfile]:
+    """Default table updated with the profiles in a JSON file `{model: {...}}`."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    table = dict(DEFAULT_PRICE_TABLE)
+    for key, values in data.items():
+        base = table.get(key, ModelProfile())
+        table[key] = base.model_copy(update=values)
+    return table
+
+
+def forecast_prompt(
+    stage: PipelineStage,
+    model: Optional[str],
+    text: str,
+    output_tokens: int,
+    *,
+    table: Optional[Mapping[str, ModelProfile]] = None,
+) -> PromptForecast:
+    tokens, exact = count_tokens(text, model)
+    tokens += 2 * _MESSAGE_OVERHEAD_TOKENS  # system + user messages
+    profile = model_profile(model, table)
+    latency = (
+        profile.first_token_s
+        + tokens / profile.prefill_tokens_per_s
+        + output_tokens / profile.output_tokens_per_s
+    )
+    cost: Optional[float] = None
+    if profile.input_per_mtok is not None and profile.output_per_mtok is not None:
+        cost = (tokens * profile.input_per_mtok + output_tokens * profile.output_per_mtok) / 1e6
+    return PromptForecast(
+        stage=stage, model=model, input_tokens=tokens, output_tokens=output_tokens,
+        latency_s=latency, cost_usd=cost, exact_tokens=exact,
+    )
+
+
+def predicted_generation_tokens(spec: NormalizedSpec) -> int:
+    """Expected answer size for a spec: a few test cases per requirement."""
+    requirements = len(spec.requirements) + len(spec.acceptance_criteria)
+    cases = max(_MIN_PREDICTED_CASES, _CASES_PER_REQUIREMENT * requirements)
+    return cases * _TOKENS_PER_TEST_CASE
+
+
+# ==============================================================================
+# Dry run
+# ==============================================================================
+
+
+class _DryRunStop(Exception):
+    """Raised by the recorder so no stage goes past prompt assembly."""
+
+
+class _RecordedPrompt(BaseModel):
+    stage: PipelineStage
+    model: Optional[str]
+    text: str
+
+
+class PromptRecorder:
+    """`send_prompt`-compatible callable that records prompts and sends nothing."""
+
+    def __init__(self, default_model: Optional[str] = None) -> None:
+        self.default_model = default_model
+        self.stage = PipelineStage.PARSE
+        self.prompts: List[_RecordedPrompt] = []
+
+    def __call__(
+        self,
+        prompt: Any,
+        *,
+        model: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        **_kwargs: Any,
+    ) -> str:
+        if isinstance(prompt, list):
+            user_text = "\n\n".join(part.get("text", "") for part in prompt)
+        else:
+            user_text = str(prompt)
+        text = f"{system_prompt}\n\n{user_text}" if system_prompt else user_text
+        self.prompts.append(
+            _RecordedPrompt(stage=self.stage, model=model or self.default_model, text=text)
+        )
+        raise _DryRunStop()
+
+
+def forecast_test_generation(
+    spec_path: str | Path,
+    repo_source: Optional[str],
+    *,
+    model: Optional[str] = None,
+    default_model: Optional[str] = None,
+    code_context_level: CodeContextLevel = CodeContextLevel.FILE_SNIPPETS,
+    max_files: int = 20,
+    max_chars_per_file: int = 4000,
+    use_llm_for_spec: bool = False,
+    llm_fallback_for_spec: bool = False,
+    routing: Optional[ModelRoutingPolicy] = None,
+    prompt_cache_hints: bool = True,
+    code_index_path: Optional[str | Path] = None,
+    repo_ref: Optional[str] = None,
+    price_table: Optional[Mapping[str, ModelProfile]] = None,
+    context_compression: Optional[ContextCompression] = None,
+    coverage: Optional[CoverageData] = None,
+) -> RunForecast:
+    """Assemble every prompt `generate_test_spec_from_paths` would send, and forecast them.
+
+    Nothing is sent. An LLM spec-parsing prompt is included when that stage
+    would run (forced, or as a fallback because classical parsing fails); the
+    generation prompt is then built from the classically parsed spec.
+    `default_model` stands for the provider default when no model is routed.
+    """
+    recorder = PromptRecorder(default_model)
+    path = Path(spec_path)
+
+    spec: Optional[NormalizedSpec] = None
+    if use_llm_for_spec or llm_fallback_for_spec:
+        try:
+            spec = parse_spec(
+                path, send_prompt_fn=recorder, model=model, use_llm=use_llm_for_spec,
+                llm_fallback=llm_fallback_for_spec, routing=routing,
+            ).spec
+        except SpecParsingError:
+            spec = None
+    if spec is None or use_llm_for_spec:
+        try:
+            spec = parse_spec(path, send_prompt_fn=recorder, model=model, routing=routing).spec
+        except SpecParsingError:
+            spec = NormalizedSpec(raw_text=path.read_text(encoding="utf-8"), source_path=str(path))
+
+    repo: Optional[GitRepository] = None
+    if repo_source is not None:
+        if repo_ref is not None:
+            repo = GitRepository(repo_source, ref=repo_ref, checkout=False)
+        else:
+            repo = GitRepository(repo_source)
+
+    code_index = CodeIndex(code_index_path) if code_index_path is not None else None
+    generator = TestSpecGenerator(
+        recorder,
+        model=model,
+        code_context_level=code_context_level,
+        max_files=max_files,
+        max_chars_per_file=max_chars_per_file,
+        prompt_cache_hints=prompt_cache_hints,
+        routing=routing,
+        code_index=code_index,
+        context_compression=context_compression,
+        coverage=coverage,
+    )
+    recorder.stage = PipelineStage.GENERATE
+    try:
+        generator.generate(spec, repo)
+    except _DryRunStop:
+        pass
+    finally:
+        if code_index is not None:
+            code_index.close()
+        if repo is not None:
+            repo.close()
+
+    forecast = RunForecast()
+    for recorded in recorder.prompts:
+        if recorded.stage == PipelineStage.PARSE:
+            spec_tokens, _ = count_tokens(spec.get_raw_text(), recorded.model)
+            output_tokens = max(_MIN_PARSE_OUTPUT_TOKENS, int(spec_tokens * _PARSE_OUTPUT_RATIO))
+        else:
+            output_tokens = predicted_generation_tokens(spec)
+        forecast.prompts.append(
+            forecast_prompt(
+                recorded.stage, recorded.model, recorded.text, output_tokens, table=price_table
+            )
+        )
+    return forecast
@@ -0,0 +1,179 @@
+"""Per-stage model routing.
+
+Spec extraction is a much easier task than test design, so the pipeline can
+use a cheap, fast model for parsing and a stronger one for generation, pick
+models by prompt size, and escalate to a stronger model only when a stage
+fails validation or reports low confidence.
+
+Routes are keyed by stage, optionally refined by prompt-size class:
+`parse`, `parse.large`, `generate.small`, ... Lookup goes from the most
+specific key to the stage key, then to `default_model`.
+"""
+
+from __future__ import annotations
+
+import os
+from enum import Enum
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class PipelineStage(str, Enum):
+    """LLM-backed stages of the pipeline."""
+    PARSE = "parse"          # LLM spec extraction (forced or fallback)
+    GENERATE = "generate"    # test specification generation
+
+
+class PromptSize(str, Enum):
+    """Prompt-size classes used to refine routes."""
+    SMALL = "small"
+    MEDIUM = "medium"
+    LARGE = "large"
+
+
+ENV_PREFIX = "LLMTESTGEN_"
+
+
+def _env_value(env: Mapping[str, Optional[str]], key: str) -> Optional[str]:
+    value = env.get(ENV_PREFIX + key)
+    if value is None:
+        return None
+    value = value.split("#", 1)[0].strip()
+    return value or None
+
+
+def parse_route(route: str) -> Tuple[str, str]:
+    """Split a `STAGE[.SIZE]=MODEL` route into its key and model.
+
+    Raises ValueError naming the valid stages and sizes if it is malformed.
+    """
+    key, sep, model = route.partition("=")
+    key, model = key.strip(), model.strip()
+    if not sep or not model:
+        raise ValueError(f"Invalid route {route!r}; expected STAGE[.SIZE]=MODEL.")
+    stage, _, size = key.partition(".")
+    stages = [s.value for s in PipelineStage]
+    sizes = [s.value for s in PromptSize]
+    if stage not in stages:
+        raise ValueError(
+            f"Invalid route {route!r}: unknown stage {stage!r}; "
+            f"expected one of {', '.join(stages)}."
+        )
+    if size and size not in sizes:
+        raise ValueError(
+            f"Invalid route {route!r}: unknown size {size!r}; "
+            f"expected one of {', '.join(sizes)}."
+        )
+    return key, model
+
+
+class ModelRoutingPolicy(BaseModel):
+    """Choose a model per pipeline stage and prompt-size class."""
+
+    default_model: Optional[str] = None  # None lets the client use its own default
+    routes: Dict[str, str] = Field(default_factory=dict)
+    escalation_model: Optional[str] = None
+    escalation_confidence: float = 0.7  # escalate LLM parsing below this confidence
+    small_prompt_chars: int = 8_000
+    large_prompt_chars: int = 60_000
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_env(cls, env: Optional[Mapping[str, Optional[str]]] = None) -> "ModelRoutingPolicy":
+        """Build a policy from `LLMTESTGEN_*` variables (os.environ by default).
+
+        Recognised keys: `LLMTESTGEN_PARSE_MODEL`, `LLMTESTGEN_GENERATE_MODEL`,
+        `LLMTESTGEN_<STAGE>_MODEL_<SIZE>` (e.g. `LLMTESTGEN_GENERATE_MODEL_LARGE`),
+        `LLMTESTGEN_ESCALATION_MODEL`, `LLMTESTGEN_ESCALATION_CONFIDENCE`,
+        `LLMTESTGEN_SMALL_PROMPT_CHARS` and `LLMTESTGEN_LARGE_PROMPT_CHARS`.
+        """
+        env = os.environ if env is None else env
+        routes: Dict[str, str] = {}
+        for stage in PipelineStage:
+            model = _env_value(env, f"{stage.name}_MODEL")
+            if model:
+                routes[stage.value] = model
+            for size in PromptSize:
+                model = _env_value(env, f"{stage.name}_MODEL_{size.name}")
+                if model:
+                    routes[f"{stage.value}.{size.value}"] = model
+
+        data: Dict[str, object] = {"routes": routes}
+        escalation_model = _env_value(env, "ESCALATION_MODEL")
+        if escalation_model:
+            data["escalation_model"] = escalation_model
+        for key, field in (
+            ("ESCALATION_CONFIDENCE", "escalation_confidence"),
+            ("SMALL_PROMPT_CHARS", "small_prompt_chars"),
+            ("LARGE_PROMPT_CHARS", "large_prompt_chars"),
+        ):
+            value = _env_value(env, key)
+            if value is not None:
+                data[field] = value
+        return cls.model_validate(data)
+
+    def with_overrides(
+        self,
+        *,
+        default_model: Optional[str] = None,
+        escalation_model: Optional[str] = None,
+        routes: Iterable[str] = (),
+        **stage_models: Optional[str],
+    ) -> "ModelRoutingPolicy":
+        """Return a copy with CLI-style overrides applied.
+
+        Args:
+            default_model: model for every stage without a more specific route
+            escalation_model: stronger model used on low confidence / failures
+            routes: `STAGE[.SIZE]=MODEL` strings
+            **stage_models: per-stage models, e.g. `parse="..."`
+        """
+        new_routes = dict(self.routes)
+        for stage, model in stage_models.items():
+            if model:
+                new_routes[PipelineStage(stage).value] = model
+        for route in routes:
+            key, model = parse_route(route)
+            new_routes[key] = model
+
+        return self.model_copy(
+            update={
+                "default_model": default_model or self.default_model,
+                "escalation_model": escalation_model or self.escalation_model,
+                "routes": new_routes,
+            }
+        )
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def size_class(self, prompt_chars: int) -> PromptSize:
+        if prompt_chars < self.small_prompt_chars:
+            return PromptSize.SMALL
+        if prompt_chars >= self.large_prompt_chars:
+            return PromptSize.LARGE
+        return PromptSize.MEDIUM
+
+    def select(self, stage: PipelineStage | str, prompt_chars: int = 0) -> Optional[str]:
+        """Model for `stage` given the prompt size (None means client default)."""
+        stage = PipelineStage(stage)
+        size = self.size_class(prompt_chars)
+        return (
+            self.routes.get(f"{stage.value}.{size.value}")
+            or self.routes.get(stage.value)
+            or self.default_model
+        )
+
+    def escalate(self, current_model: Optional[str]) -> Optional[str]:
+        """Stronger model to retry with, or None if there is nothing to escalate to."""
+        if self.escalation_model and self.escalation_model != current_model:
+            return self.escalation_model
+        return None
+
+    def should_escalate_confidence(self, confidence: Optional[float]) -> bool:
+        return confidence is None or confidence < self.escalation_confidence
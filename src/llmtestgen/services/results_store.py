@@ -0,0 +1,401 @@
+"""Local, queryable store of generated test specifications.
+
+Every run is recorded in a SQLite file: the run itself, the specifications
+it generated, their test cases, and the requirements and target code
+elements those cases point to. Requirements and code elements are interned
+in their own tables and indexed, as are cases by run and specification, so
+questions like "which tests cover requirement X", "which tests target
+`tasks.create_task`" or "what changed since the previous run" are answered
+from indexes rather than by scanning results, however many runs are kept.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    repo_source TEXT,
+    ref TEXT
+);
+CREATE TABLE IF NOT EXISTS specs (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    spec_source_path TEXT NOT NULL,
+    llm_model TEXT,
+    prompt_tokens INTEGER,
+    completion_tokens INTEGER
+);
+CREATE TABLE IF NOT EXISTS requirements (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS code_elements (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS test_cases (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    case_key TEXT NOT NULL,
+    requirement_id INTEGER REFERENCES requirements(id),
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS case_elements (
+    case_id INTEGER NOT NULL REFERENCES test_cases(id) ON DELETE CASCADE,
+    element_id INTEGER NOT NULL REFERENCES code_elements(id),
+    run_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS specs_run ON specs(run_id);
+CREATE INDEX IF NOT EXISTS specs_path ON specs(spec_source_path, run_id);
+CREATE INDEX IF NOT EXISTS test_cases_run ON test_cases(run_id);
+CREATE INDEX IF NOT EXISTS test_cases_spec ON test_cases(spec_id, position);
+CREATE INDEX IF NOT EXISTS test_cases_requirement ON test_cases(requirement_id, run_id);
+CREATE INDEX IF NOT EXISTS case_elements_element ON case_elements(element_id, run_id);
+CREATE INDEX IF NOT EXISTS case_elements_case ON case_elements(case_id);
+"""
+
+_CASE_COLUMNS = "tc.run_id, s.spec_source_path, tc.data"
+_CASE_FROM = "test_cases tc JOIN specs s ON s.id = tc.spec_id"
+
+
+class RunRecord(BaseModel):
+    """A recorded run with its totals."""
+    id: int
+    created_at: str               # ISO 8601, UTC
+    label: Optional[str] = None
+    repo_source: Optional[str] = None
+    ref: Optional[str] = None
+    spec_count: int = 0
+    test_case_count: int = 0
+
+
+class StoredTestCase(BaseModel):
+    """A test case found by a query, with where it came from."""
+    run_id: int
+    spec_source_path: str
+    test_case: TestCase
+
+
+class CaseChange(BaseModel):
+    """A test case present in both runs of a diff whose content changed."""
+    spec_source_path: str
+    before: TestCase
+    after: TestCase
+
+
+class RunDiff(BaseModel):
+    """Test cases added, removed and changed between two runs."""
+    old_run: int
+    new_run: int
+    added: List[StoredTestCase] = Field(default_factory=list)
+    removed: List[StoredTestCase] = Field(default_factory=list)
+    changed: List[CaseChange] = Field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def case_key(test_case: TestCase) -> str:
+    """Identity of a case across runs: its ID, or its description without one."""
+    return test_case.id or test_case.description
+
+
+def _like_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ResultsStore:
+    """SQLite-backed history of runs and their generated test cases."""
+
+    def __init__(self, db_path: str | Path = ":memory:") -> None:
+        """
+        Args:
+            db_path: SQLite file keeping the history (in-memory by default)
+        """
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def record_run(
+        self,
+        test_specs: Iterable[TestSpecification],
+        *,
+        label: Optional[str] = None,
+        repo_source: Optional[str] = None,
+        ref: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+    ) -> int:
+        """Record one run and all its specifications in a single transaction.
+
+        `test_specs` may be a generator (e.g. `read_test_specs_jsonl`); each
+        specification's cases are inserted with `executemany`. Returns the
+        new run ID.
+        """
+        created = (created_at or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+        requirement_ids: Dict[str, int] = {}
+        element_ids: Dict[str, int] = {}
+        with self._conn:
+            run_id = self._conn.execute(
+                "INSERT INTO runs (created_at, label, repo_source, ref) VALUES (?, ?, ?, ?)",
+                (created, label, repo_source, ref),
+            ).lastrowid
+            assert run_id is not None  # nosec - set by INSERT
+            for test_spec in test_specs:
+                self._insert_spec(run_id, test_spec, requirement_ids, element_ids)
+        return run_id
+
+    def _insert_spec(
+        self,
+        run_id: int,
+        test_spec: TestSpecification,
+        requirement_ids: Dict[str, int],
+        element_ids: Dict[str, int],
+    ) -> None:
+        usage = test_spec.usage
+        spec_id = self._conn.execute(
+            "INSERT INTO specs (run_id, spec_source_path, llm_model, prompt_tokens, "
+            "completion_tokens) VALUES (?, ?, ?, ?, ?)",
+            (
+                run_id,
+                test_spec.spec_source_path,
+                test_spec.llm_model,
+                usage.prompt_tokens if usage else None,
+                usage.completion_tokens if usage else None,
+            ),
+        ).lastrowid
+
+        cases = test_spec.test_cases
+        self._intern(
+            "requirements", "text", requirement_ids,
+            [tc.requirement for tc in cases if tc.requirement],
+        )
+        self._intern(
+            "code_elements", "name", element_ids,
+            [elem for tc in cases for elem in tc.target_code_elements],
+        )
+
+        rows = []
+        for position, test_case in enumerate(cases):
+            data = test_case.model_dump_json()
+            rows.append(
+                (
+                    run_id,
+                    spec_id,
+                    position,
+                    case_key(test_case),
+                    requirement_ids.get(test_case.requirement or ""),
+                    hashlib.blake2b(data.encode("utf-8"), digest_size=12).hexdigest(),
+                    data,
+                )
+            )
+        self._conn.executemany(
+            "INSERT INTO test_cases (run_id, spec_id, position, case_key, requirement_id, "
+            "fingerprint, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+        # Row IDs of the cases just inserted, in position order
+        case_ids = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT id FROM test_cases WHERE spec_id = ? ORDER BY position", (spec_id,)
+            )
+        ]
+        self._conn.executemany(
+            "INSERT INTO case_elements (case_id, element_id, run_id) VALUES (?, ?, ?)",
+            [
+                (case_id, element_ids[elem], run_id)
+                for case_id, test_case in zip(case_ids, cases)
+                for elem in dict.fromkeys(test_case.target_code_elements)
+            ],
+        )
+
+    def _intern(self, table: str, column: str, ids: Dict[str, int], values: List[str]) -> None:
+        """Fill `ids` with the row IDs of `values` in `table`, inserting new ones."""
+        new = [value for value in dict.fromkeys(values) if value not in ids]
+        if not new:
+            return
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", [(v,) for v in new]  # nosec - fixed names
+        )
+        for start in range(0, len(new), 500):  # stay under SQLite's variable limit
+            chunk = new[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            ids.update(
+                self._conn.execute(
+                    f"SELECT {column}, id FROM {table} WHERE {column} IN ({marks})", chunk  # nosec - fixed names
+                )
+            )
+
+    def delete_run(self, run_id: int) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM case_elements WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def runs(self, *, limit: Optional[int] = None) -> List[RunRecord]:
+        """Recorded runs, newest first."""
+        rows = self._conn.execute(
+            "SELECT r.id, r.created_at, r.label, r.repo_source, r.ref, "
+            "(SELECT COUNT(*) FROM specs WHERE run_id = r.id), "
+            "(SELECT COUNT(*) FROM test_cases WHERE run_id = r.id) "
+            "FROM runs r ORDER BY r.id DESC LIMIT ?",
+            (-1 if limit is None else limit,),
+        )
+        return [
+            RunRecord(
+                id=row[0], created_at=row[1], label=row[2], repo_source=row[3], ref=row[4],
+                spec_count=row[5], test_case_count=row[6],
+            )
+            for row in rows
+        ]
+
+    def latest_run_id(self, offset: int = 0) -> Optional[int]:
+        """ID of the newest run (`offset=1`: the one before it, and so on)."""
+        row = self._conn.execute(
+            "SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?", (offset,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def test_specification(self, run_id: int, spec_source_path: str) -> Optional[TestSpecification]:
+        """Rebuild a recorded specification."""
+        row = self._conn.execute(
+            "SELECT id, llm_model FROM specs WHERE run_id = ? AND spec_source_path = ?",
+            (run_id, spec_source_path),
+        ).fetchone()
+        if row is None:
+            return None
+        data = self._conn.execute(
+            "SELECT data FROM test_cases WHERE spec_id = ? ORDER BY position", (row[0],)
+        )
+        return TestSpecification(
+            spec_source_path=spec_source_path,
+            llm_model=row[1],
+            test_cases=[TestCase.model_validate_json(d[0]) for d in data],
+        )
+
+    def cases_for_requirement(
+        self,
+        requirement: str,
+        *,
+        run_id: Optional[int] = None,
+        contains: bool = False,
+    ) -> List[StoredTestCase]:
+        """Test cases recorded for `requirement`.
+
+        The text must match exactly, or with `contains` appear anywhere in the
+        requirement (ASCII case-insensitive, as SQLite's LIKE).
+        """
+        if contains:
+            match = "text LIKE ? ESCAPE '\\'"
+            value = f"%{_like_escape(requirement)}%"
+        else:
+            match, value = "text = ?", requirement
+        return self._cases(
+            f"tc.requirement_id IN (SELECT id FROM requirements WHERE {match})",
+            [value],
+            run_id,
+        )
+
+    def cases_for_code_element(
+        self,
+        element: str,
+        *,
+        run_id: Optional[int] = None,
+    ) -> List[StoredTestCase]:
+        """Test cases targeting `element` or anything inside it (`element.*`)."""
+        return self._cases(
+            "tc.id IN (SELECT ce.case_id FROM case_elements ce WHERE ce.element_id IN "
+            "(SELECT id FROM code_elements WHERE name = ? OR name LIKE ? ESCAPE '\\')"
+            + (" AND ce.run_id = ?" if run_id is not None else "")
+            + ")",
+            [element, f"{_like_escape(element)}.%"] + ([run_id] if run_id is not None else []),
+            run_id,
+        )
+
+    def _cases(
+        self, condition: str, params: Sequence[Any], run_id: Optional[int]
+    ) -> List[StoredTestCase]:
+        query = f"SELECT {_CASE_COLUMNS} FROM {_CASE_FROM} WHERE {condition}"  # nosec - fixed SQL
+        args = list(params)
+        if run_id is not None:
+            query += " AND tc.run_id = ?"
+            args.append(run_id)
+        rows = self._conn.execute(query + " ORDER BY tc.run_id DESC, tc.spec_id, tc.position", args)
+        return [_stored(row) for row in rows]
+
+    def diff_runs(self, old_run: int, new_run: int) -> RunDiff:
+        """Compare two runs case by case, matching cases by spec and ID (or description)."""
+        old = self._run_cases(old_run)
+        new = self._run_cases(new_run)
+        diff = RunDiff(old_run=old_run, new_run=new_run)
+        for key, (fingerprint, stored) in new.items():
+            previous = old.get(key)
+            if previous is None:
+                diff.added.append(stored)
+            elif previous[0] != fingerprint:
+                diff.changed.append(
+                    CaseChange(
+                        spec_source_path=stored.spec_source_path,
+                        before=previous[1].test_case,
+                        after=stored.test_case,
+                    )
+                )
+            else:
+                diff.unchanged += 1
+        diff.removed = [stored for key, (_, stored) in old.items() if key not in new]
+        return diff
+
+    def _run_cases(self, run_id: int) -> Dict[Tuple[str, str], Tuple[str, StoredTestCase]]:
+        rows = self._conn.execute(
+            f"SELECT {_CASE_COLUMNS}, tc.case_key, tc.fingerprint FROM {_CASE_FROM} "  # nosec - fixed SQL
+            "WHERE tc.run_id = ? ORDER BY tc.spec_id, tc.position",
+            (run_id,),
+        )
+        return {(row[1], row[3]): (row[4], _stored(row)) for row in rows}
+
+
+def _stored(row: Sequence[Any]) -> StoredTestCase:
+    return StoredTestCase(
+        run_id=row[0], spec_source_path=row[1], test_case=TestCase.model_validate_json(row[2])
+    )
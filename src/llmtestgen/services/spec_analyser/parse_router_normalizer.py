@@ -10,7 +10,9 @@ import yaml
 from pydantic import BaseModel, Field
 
 from llmtestgen.core.utils_errors import SpecParsingError
+from llmtestgen.core.utils_raw_text import RawTextRef
 from llmtestgen.core.utils_warnings import SpecWarning
+from llmtestgen.services.model_routing import ModelRoutingPolicy, PipelineStage
 
 # --- Parser models -------------------------------------------------------------
 
@@ -33,10 +35,17 @@ class NormalizedSpec(BaseModel):
     requirements: List[str] = Field(default_factory=list)
     acceptance_criteria: List[str] = Field(default_factory=list)
     examples: List[str] = Field(default_factory=list)
-    raw_text: str
+    raw_text: str = ""
+    raw_text_ref: Optional[RawTextRef] = None  # set instead of raw_text in lean mode
     source_path: str
     confidence: Optional[float] = None
 
+    def get_raw_text(self) -> str:
+        """Return the raw spec text, loading it from disk in lean mode."""
+        if self.raw_text_ref is not None and not self.raw_text:
+            return self.raw_text_ref.load()
+        return self.raw_text
+
 
 ParsedSpecType = Union[
     ParsedMarkdown,
@@ -47,16 +56,44 @@ ParsedSpecType = Union[
 ]
 
 
-def normalize_parsed_spec(parsed: ParsedSpecType) -> NormalizedSpec:
-    """Normalize any parser output into a unified model."""
+def _spec_file_ref(
+    parsed: ParsedSpecType, source_path: str, raw_text: str
+) -> Optional[RawTextRef]:
+    """Reference to the spec file's own contents (None if it cannot be read)."""
+    if not isinstance(parsed, ParsedLLMSpec):
+        return RawTextRef.from_text(source_path, raw_text)
+    # An LLM parse carries whatever text the model echoed back, not the file
+    try:
+        return RawTextRef.from_text(source_path, Path(source_path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def normalize_parsed_spec(parsed: ParsedSpecType, *, lean: bool = False) -> NormalizedSpec:
+    """Normalize any parser output into a unified model.
+
+    With `lean=True` the raw text is not copied; only a `RawTextRef`
+    (source path + content hash) of the spec file is kept and the text is
+    re-read on demand.
+    """
+    raw_text = getattr(parsed, "raw_text", "")
+    source_path = getattr(parsed, "source_path", "")
+
+    raw_text_ref: Optional[RawTextRef] = None
+    if lean and source_path:
+        raw_text_ref = _spec_file_ref(parsed, source_path, raw_text)
+        if raw_text_ref is not None:
+            raw_text = ""
+
     return NormalizedSpec(
         title=getattr(parsed, "title", None),
         sections=getattr(parsed, "sections", {}) or {},
         requirements=getattr(parsed, "requirements", []) or [],
         acceptance_criteria=getattr(parsed, "acceptance_criteria", []) or [],
         examples=getattr(parsed, "examples", []) or [],
-        raw_text=getattr(parsed, "raw_text", ""),
-        source_path=getattr(parsed, "source_path", ""),
+        raw_text=raw_text,
+        raw_text_ref=raw_text_ref,
+        source_path=source_path,
         confidence=getattr(parsed, "confidence", None),
     )
 
@@ -88,13 +125,20 @@ class SpecRouter:
         api_key: Optional[str] = None,
         confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
         llm_fallback: bool = False,
+        lean: bool = False,
+        routing: Optional[ModelRoutingPolicy] = None,
+        structured_output: bool = True,
     ) -> None:
+        # An explicit `model` is the default for stages the routing policy leaves open
+        self.routing = (routing or ModelRoutingPolicy()).with_overrides(default_model=model)
 
         self.send_prompt_fn = send_prompt_fn
         self.model = model
         self.api_key = api_key
         self.confidence_threshold = confidence_threshold
         self.llm_fallback = llm_fallback
+        self.lean = lean
+        self.structured_output = structured_output
 
     # ------------------------------------------------------------------
     # Public API
@@ -130,7 +174,7 @@ class SpecRouter:
         # Markdown
         if suffix == ".md":
             parsed = MarkdownParser().parse(path)
-            return normalize_parsed_spec(parsed)
+            return self._normalize(parsed)
 
         # JSON
         if suffix == ".json":
@@ -154,7 +198,7 @@ class SpecRouter:
         if data is not None and self._looks_like_openapi(data):
             try:
                 parsed = OpenAPIParser().parse(path)
-                return normalize_parsed_spec(parsed)
+                return self._normalize(parsed)
             except Exception as exc:
                 warnings.append(
                     SpecWarning.OPENAPI_PARSE_FAILED.value.format(exc=exc)
@@ -168,7 +212,7 @@ class SpecRouter:
 
         try:
             parsed = JSONParser().parse(path)
-            return normalize_parsed_spec(parsed)
+            return self._normalize(parsed)
         except Exception as exc:
             warnings.append(SpecWarning.JSON_PARSE_FAILED.value.format(exc=exc))
             if self.llm_fallback:
@@ -185,7 +229,7 @@ class SpecRouter:
         if data is not None and self._looks_like_openapi(data):
             try:
                 parsed = OpenAPIParser().parse(path)
-                return normalize_parsed_spec(parsed)
+                return self._normalize(parsed)
             except Exception as exc:
                 warnings.append(
                     SpecWarning.OPENAPI_PARSE_FAILED.value.format(exc=exc)
@@ -199,7 +243,7 @@ class SpecRouter:
 
         try:
             parsed = YAMLParser().parse(path)
-            return normalize_parsed_spec(parsed)
+            return self._normalize(parsed)
         except Exception as exc:
             warnings.append(SpecWarning.YAML_PARSE_FAILED.value.format(exc=exc))
             if self.llm_fallback:
@@ -213,19 +257,51 @@ class SpecRouter:
     # LLM Parser
     # ------------------------------------------------------------------
     def _parse_via_llm(self, path: Path, warnings: List[str]) -> NormalizedSpec:
-        parsed = LLMParser(
+        model = self.routing.select(PipelineStage.PARSE, path.stat().st_size)
+        stronger = self.routing.escalate(model)
+
+        try:
+            parsed = self._run_llm_parser(path, model)
+        except ValueError:
+            if stronger is None:
+                raise
+            warnings.append(
+                SpecWarning.LLM_ESCALATED.value.format(model=stronger, reason="invalid output")
+            )
+            parsed = self._run_llm_parser(path, stronger)
+        else:
+            if stronger is not None and self.routing.should_escalate_confidence(parsed.confidence):
+                warnings.append(
+                    SpecWarning.LLM_ESCALATED.value.format(
+                        model=stronger,
+                        reason=f"confidence {int(parsed.confidence * 100)}%",
+                    )
+                )
+                try:
+                    retry = self._run_llm_parser(path, stronger)
+                except ValueError:
+                    retry = None
+                if retry is not None and retry.confidence >= parsed.confidence:
+                    parsed = retry
+
+        warnings.extend(self._collect_llm_warnings(parsed))
+        return self._normalize(parsed)
+
+    def _run_llm_parser(self, path: Path, model: Optional[str]) -> ParsedLLMSpec:
+        return LLMParser(
             self.send_prompt_fn,
-            model=self.model,
+            model=model,
             api_key=self.api_key,
             confidence_threshold=self.confidence_threshold,
+            structured_output=self.structured_output,
         ).parse(path)
 
-        warnings.extend(self._collect_llm_warnings(parsed))
-        return normalize_parsed_spec(parsed)
-
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _normalize(self, parsed: ParsedSpecType) -> NormalizedSpec:
+        return normalize_parsed_spec(parsed, lean=self.lean)
+
     def _collect_llm_warnings(self, parsed: ParsedLLMSpec) -> List[str]:
         warnings: List[str] = []
 
@@ -271,6 +347,9 @@ def parse_spec(
     confidence_threshold: float = SpecRouter.DEFAULT_CONFIDENCE_THRESHOLD,
     use_llm: bool = False,
     llm_fallback: bool = False,
+    lean: bool = False,
+    routing: Optional[ModelRoutingPolicy] = None,
+    structured_output: bool = True,
 ) -> ParseResult:
 
     router = SpecRouter(
@@ -279,5 +358,8 @@ def parse_spec(
         api_key=api_key,
         confidence_threshold=confidence_threshold,
         llm_fallback=llm_fallback,
+        lean=lean,
+        routing=routing,
+        structured_output=structured_output,
     )
     return router.parse(filepath, use_llm=use_llm)
@@ -8,11 +8,17 @@ extract a structured spec model plus a confidence score.
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 from pathlib import Path
-import json
 from pydantic import BaseModel, ValidationError
 
+from llmtestgen.core.utils_json import extract_json
+from llmtestgen.wrappers.structured_output import (
+    json_schema_response_format,
+    model_schema,
+    supports_structured_output,
+)
+
 
 # ============================================================
 # Model returned by the parser
@@ -30,6 +36,13 @@ class ParsedLLMSpec(BaseModel):
     confidence: float
 
 
+# JSON schema sent as `response_format` to models that support structured output
+PARSED_SPEC_RESPONSE_FORMAT = json_schema_response_format(
+    "parsed_spec",
+    model_schema(ParsedLLMSpec, exclude=("raw_text", "source_path")),
+)
+
+
 # ============================================================
 # Parser
 # ============================================================
@@ -62,6 +75,7 @@ class LLMParser:
         model: Optional[str] = None,
         api_key: Optional[str] = None,
     confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        structured_output: bool = True,
     ) -> None:
         """
         Args:
@@ -70,11 +84,14 @@ class LLMParser:
             model: default LLM model
             api_key: default API key
             confidence_threshold: warn if LLM confidence % < threshold * 100
+            structured_output: request a JSON-schema `response_format` from
+                models known to support it
         """
         self.send_prompt_fn = send_prompt_fn
         self.model = model
         self.api_key = api_key
         self.confidence_threshold = confidence_threshold
+        self.structured_output = structured_output
 
     # ------------------------------------------------------------
     # PUBLIC API
@@ -87,11 +104,16 @@ class LLMParser:
         system_prompt = self._build_system_prompt()
         user_prompt = self._build_user_prompt(text)
 
+        extra: Dict[str, Any] = {}
+        if self.structured_output and supports_structured_output(self.model):
+            extra["response_format"] = PARSED_SPEC_RESPONSE_FORMAT
+
         response = self.send_prompt_fn(
             user_prompt,
             api_key=self.api_key,
             model=self.model,
             system_prompt=system_prompt,
+            **extra,
         )
 
         parsed = self._parse_llm_json(
@@ -145,14 +167,19 @@ class LLMParser:
     def _parse_llm_json(
         self, response_text: str, *, raw_text: str, source_path: str
     ) -> ParsedLLMSpec:
-        """Validate LLM output JSON and return the pydantic model."""
+        """Validate LLM output JSON and return the pydantic model.
+
+        Code fences and surrounding prose are tolerated (see `extract_json`).
+        """
         try:
-            data = json.loads(response_text)
-        except json.JSONDecodeError as err:
+            data = extract_json(response_text)
+        except ValueError as err:
             raise ValueError(
                 "LLM returned invalid JSON. Response was:\n"
                 f"{response_text}"
             ) from err
+        if not isinstance(data, dict):
+            raise ValueError(f"LLM returned JSON that is not an object:\n{response_text}")
 
         try:
             return ParsedLLMSpec(
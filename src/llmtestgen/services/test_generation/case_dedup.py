@@ -0,0 +1,196 @@
+"""Near-duplicate test case elimination with MinHash + LSH.
+
+Each test case is reduced to a set of word unigrams and bigrams taken from its
+description, steps and expected result. A MinHash signature of that set is
+split into bands; cases sharing any band land in the same bucket and become
+candidates, and only candidates are compared with the exact Jaccard
+similarity. This keeps deduplication near-linear in the number of cases.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from llmtestgen.services.test_generation.test_spec_generator import TestCase
+
+DEFAULT_DEDUP_THRESHOLD = 0.8
+
+_WORD = re.compile(r"\w+")
+
+
+class DuplicateReport(BaseModel):
+    """A test case removed as a near-duplicate of an earlier one."""
+    kept_index: int
+    kept_id: Optional[str] = None
+    kept_description: str
+    removed_index: int
+    removed_id: Optional[str] = None
+    removed_description: str
+    similarity: float  # Jaccard similarity of the fingerprinted text, 0..1
+
+
+class DedupResult(BaseModel):
+    """Input positions of the surviving test cases plus the duplicates dropped."""
+    kept: List[int]
+    duplicates: List[DuplicateReport] = []
+
+
+def case_features(test_case: TestCase) -> FrozenSet[str]:
+    """Word unigrams and bigrams of description, steps and expected result."""
+    features: set[str] = set()
+    for text in (test_case.description, *test_case.steps, test_case.expected_result):
+        words = _WORD.findall(text.lower())
+        features.update(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return frozenset(features)
+
+
+_HASHES_PER_DIGEST = 32  # a 64-byte BLAKE2b digest read as 32 16-bit hash values
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hashes(feature: str, num_perm: int, seed: int) -> Tuple[int, ...]:
+    """`num_perm` independent 16-bit hashes of one feature (cached: features repeat a lot)."""
+    data = feature.encode("utf-8")
+    values: List[int] = []
+    for block in range(0, num_perm, _HASHES_PER_DIGEST):
+        salt = seed.to_bytes(8, "little") + block.to_bytes(8, "little")
+        values.extend(
+            struct.unpack("<32H", hashlib.blake2b(data, digest_size=64, salt=salt).digest())
+        )
+    return tuple(values[:num_perm])
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def check_dedup_threshold(threshold: float) -> None:
+    """Raise ValueError unless `threshold` is a similarity in (0, 1]."""
+    if not 0.0 < threshold <= 1.0:
+        raise ValueError("threshold must be in (0, 1].")
+
+
+class TestCaseDeduplicator:
+    """Incremental near-duplicate index over test cases.
+
+    The index keeps only the cases it accepted, so one instance can be fed
+    several specifications (e.g. a batch run) to dedupe across all of them.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(
+        self,
+        *,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        num_perm: int = 32,
+        bands: int = 8,
+        seed: int = 1,
+    ) -> None:
+        """
+        Args:
+            threshold: minimum Jaccard similarity for two cases to be duplicates
+            num_perm: MinHash signature length
+            bands: LSH bands; `num_perm` must be a multiple of it. With the
+                defaults (8 bands of 4 rows) pairs at 0.8 similarity share a
+                bucket ~98% of the time, and above 0.9 almost always.
+            seed: seed for the feature hashes (signatures are deterministic)
+        """
+        check_dedup_threshold(threshold)
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.seed = seed
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._features: List[FrozenSet[str]] = []
+        self._cases: List[TestCase] = []
+        self._positions: List[int] = []  # position of each kept case in the input stream
+        self._seen = 0
+
+    def __len__(self) -> int:
+        return len(self._cases)
+
+    def _signature(self, features: FrozenSet[str]) -> Tuple[int, ...]:
+        if not features:
+            return (0,) * self.num_perm
+        rows = [_feature_hashes(f, self.num_perm, self.seed) for f in features]
+        return tuple(map(min, zip(*rows)))
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+    def add(self, test_case: TestCase) -> Optional[DuplicateReport]:
+        """Index `test_case`, or return a report if it duplicates a kept case."""
+        position = self._seen
+        self._seen += 1
+
+        features = case_features(test_case)
+        keys = self._band_keys(self._signature(features))
+
+        best: Optional[Tuple[float, int]] = None
+        checked: set[int] = set()
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                score = jaccard(features, self._features[candidate])
+                if score >= self.threshold and (best is None or score > best[0]):
+                    best = (score, candidate)
+
+        if best is not None:
+            score, candidate = best
+            kept = self._cases[candidate]
+            return DuplicateReport(
+                kept_index=self._positions[candidate],
+                kept_id=kept.id,
+                kept_description=kept.description,
+                removed_index=position,
+                removed_id=test_case.id,
+                removed_description=test_case.description,
+                similarity=round(score, 4),
+            )
+
+        slot = len(self._cases)
+        self._cases.append(test_case)
+        self._features.append(features)
+        self._positions.append(position)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(slot)
+        return None
+
+    def deduplicate(self, test_cases: Sequence[TestCase]) -> DedupResult:
+        """Keep the first case of each near-duplicate group, in input order."""
+        kept: List[int] = []
+        duplicates: List[DuplicateReport] = []
+        for idx, test_case in enumerate(test_cases):
+            report = self.add(test_case)
+            if report is None:
+                kept.append(idx)
+            else:
+                duplicates.append(report)
+        return DedupResult(kept=kept, duplicates=duplicates)
+
+
+def deduplicate_test_cases(
+    test_cases: Sequence[TestCase],
+    *,
+    threshold: float = DEFAULT_DEDUP_THRESHOLD,
+) -> DedupResult:
+    """Collapse near-duplicate test cases within a single list."""
+    return TestCaseDeduplicator(threshold=threshold).deduplicate(test_cases)
@@ -0,0 +1,132 @@
+"""Session-scoped cache of repository file contents and built code contexts.
+
+In batch runs many specs target the same repository. A `RepoContextCache`
+shared by their generators keeps file contents in an LRU bounded by bytes
+and memoizes finished code-context strings by repository fingerprint and
+context settings, so only the first spec against a repository pays for
+reading and compressing files. It is thread-safe; concurrent requests for
+the same entry wait for a single computation instead of repeating it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Iterable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_BYTES = 256 << 20
+DEFAULT_MAX_CONTEXTS = 64
+
+
+def repo_fingerprint(identity: str, file_keys: Iterable[Tuple[str, str]]) -> str:
+    """Digest of a repository state: its identity plus every (path, change key)."""
+    digest = hashlib.blake2b(identity.encode("utf-8"), digest_size=16)
+    for path, key in sorted(file_keys):
+        digest.update(f"\0{path}\0{key}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RepoContextCache:
+    """Thread-safe LRU of file contents (bounded by bytes) and of context strings."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BYTES,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+    ) -> None:
+        """
+        Args:
+            max_bytes: budget for cached file contents (UTF-8 size of their text)
+            max_contexts: number of built context strings kept
+        """
+        self.max_bytes = max_bytes
+        self.max_contexts = max_contexts
+        self._files: "OrderedDict[Hashable, Tuple[object, int]]" = OrderedDict()
+        self._contexts: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.file_hits = 0
+        self.file_misses = 0
+        self.context_hits = 0
+        self.context_misses = 0
+
+    @property
+    def cached_bytes(self) -> int:
+        return self._bytes
+
+    def _compute(self, key: Hashable, compute: Callable[[], T], store: Callable[[T], None]) -> T:
+        """Run `compute` once per key even when several threads ask at the same time."""
+        with self._lock:
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+        assert pending is not None  # nosec - set above
+        if not owner:
+            return pending.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            pending.set_exception(exc)
+            raise
+        else:
+            store(value)
+            pending.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def file(self, key: Hashable, load: Callable[[], T], size: Callable[[T], int]) -> T:
+        """Cached file content for `key` (which must include a change key)."""
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None:
+                self._files.move_to_end(key)
+                self.file_hits += 1
+                return entry[0]  # type: ignore[return-value]
+            self.file_misses += 1
+
+        def store(value: T) -> None:
+            nbytes = size(value)
+            if nbytes > self.max_bytes:
+                return
+            with self._lock:
+                if key in self._files:
+                    return
+                self._files[key] = (value, nbytes)
+                self._bytes += nbytes
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._files.popitem(last=False)
+                    self._bytes -= evicted
+
+        return self._compute(("file", key), load, store)
+
+    def context(self, key: Hashable, build: Callable[[], str]) -> str:
+        """Cached code context for `key` (repository fingerprint plus settings)."""
+        with self._lock:
+            cached = self._contexts.get(key)
+            if cached is not None:
+                self._contexts.move_to_end(key)
+                self.context_hits += 1
+                return cached
+            self.context_misses += 1
+
+        def store(value: str) -> None:
+            with self._lock:
+                self._contexts[key] = value
+                while len(self._contexts) > self.max_contexts:
+                    self._contexts.popitem(last=False)
+
+        return self._compute(("context", key), build, store)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._files.clear()
+            self._contexts.clear()
+            self._bytes = 0
@@ -0,0 +1,131 @@
+"""Token-saving compression of Python sources for the LLM code context.
+
+Comments, license headers and blank-line runs cost prompt tokens without
+telling the model much about behaviour. `compress_python_source` drops
+comment-only lines (which removes boilerplate headers), trailing whitespace
+and repeated blank lines, and can strip docstrings. Code and inline comments
+are kept as they are. Sources that do not tokenize, such as the truncated
+head of a large file, fall back to a line-based pass.
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import tokenize
+from typing import Dict, Iterable, List, Set
+
+from pydantic import BaseModel
+
+
+class ContextCompression(BaseModel):
+    """Which compression steps `build_python_code_context` applies."""
+    strip_comments: bool = True      # comment-only lines, incl. license headers
+    collapse_blank_lines: bool = True
+    dedupe_files: bool = True        # identical files are shown once, with aliases
+    strip_docstrings: bool = False   # FULL level only: snippets keep their docstrings
+
+    @classmethod
+    def disabled(cls) -> "ContextCompression":
+        return cls(strip_comments=False, collapse_blank_lines=False, dedupe_files=False)
+
+
+def _comment_only_lines(source: str) -> Set[int]:
+    """1-based numbers of lines holding nothing but a comment (tokenize-accurate)."""
+    lines = source.splitlines()
+    found: Set[int] = set()
+    for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+        if tok.type == tokenize.COMMENT:
+            row, col = tok.start
+            if not lines[row - 1][:col].strip():
+                found.add(row)
+    return found
+
+
+def _docstring_edits(source: str) -> Dict[int, str]:
+    """Line edits removing docstrings: line number -> replacement ("" drops the line).
+
+    Only docstrings on lines of their own are removed; one sharing a line
+    with a `def`/`class` header or other statements is left in place.
+    """
+    edits: Dict[int, str] = {}
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        body = node.body
+        if not (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            continue
+        doc = body[0]
+        end = doc.end_lineno or doc.lineno
+        # AST columns are UTF-8 byte offsets
+        before = lines[doc.lineno - 1].encode("utf-8")[: doc.col_offset]
+        after = lines[end - 1].encode("utf-8")[doc.end_col_offset or 0:]
+        if before.strip() or (after.strip() and not after.strip().startswith(b"#")):
+            # Shares a line with a header or other code: keep it rather than lose them
+            continue
+        for row in range(doc.lineno, end + 1):
+            edits[row] = ""
+        if len(body) == 1:
+            # Keep the block syntactically valid
+            edits[doc.lineno] = " " * doc.col_offset + "..."
+    return edits
+
+
+def _is_comment_line(line: str) -> bool:
+    return line.lstrip().startswith("#")
+
+
+def compress_python_source(
+    source: str,
+    *,
+    strip_comments: bool = True,
+    collapse_blank_lines: bool = True,
+    strip_docstrings: bool = False,
+) -> str:
+    """Return `source` without comment-only lines, blank runs or (optionally) docstrings."""
+    edits: Dict[int, str] = {}
+    try:
+        if strip_docstrings:
+            edits.update(_docstring_edits(source))
+        if strip_comments:
+            edits.update({row: "" for row in _comment_only_lines(source) if row not in edits})
+    except (SyntaxError, tokenize.TokenError, IndentationError, ValueError):
+        # Truncated or invalid source: comments by line prefix, docstrings kept
+        edits = {}
+        if strip_comments:
+            edits = {
+                row: "" for row, line in enumerate(source.splitlines(), 1) if _is_comment_line(line)
+            }
+
+    out: List[str] = []
+    for row, line in enumerate(source.splitlines(), 1):
+        if row in edits:
+            line = edits[row]
+            if not line:
+                continue
+        line = line.rstrip()
+        if collapse_blank_lines and not line and (not out or not out[-1]):
+            continue
+        out.append(line)
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out)
+
+
+def alias_groups(keys: Iterable[str]) -> Dict[int, List[int]]:
+    """Group equal keys: index of first occurrence -> indexes of the later copies."""
+    first: Dict[str, int] = {}
+    groups: Dict[int, List[int]] = {}
+    for idx, key in enumerate(keys):
+        if key in first:
+            groups.setdefault(first[key], []).append(idx)
+        else:
+            first[key] = idx
+    return groups
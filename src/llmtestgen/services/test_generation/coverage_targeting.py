@@ -0,0 +1,446 @@
+"""Coverage-guided code context: put untested code first, elide tested code.
+
+`CoverageData` reads what an existing test suite executes, either from a
+coverage.py data file (`.coverage`, a SQLite database read directly, so
+coverage.py itself is not needed) or from a `coverage json` report, or
+by running the repository's suite once under coverage.py
+(`run_suite_with_coverage`). Per file, `CoverageData.analyse` maps it onto
+the source: statements never executed, functions with untested lines and
+branches taken only one way.
+
+`build_python_code_context` uses the result to rank files by untested
+statements, leave fully covered files out of the detailed context, collapse
+the bodies of fully covered functions, and head the context with a list of
+untested areas the model should focus on.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess  # nosec - runs the repository's own test suite on request
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+_SQLITE_MAGIC = b"SQLite format 3\x00"
+# Items listed per file in the untested-areas summary
+_MAX_LISTED = 8
+_NO_COVER = "pragma: no cover"
+
+
+class CoverageError(RuntimeError):
+    """Raised when coverage data cannot be read or produced."""
+
+
+class FileCoverageData(BaseModel):
+    """What coverage.py recorded for one file, before looking at its source."""
+    executed_lines: List[int] = Field(default_factory=list)
+    arcs: Optional[List[Tuple[int, int]]] = None            # branch data files only
+    missing_lines: Optional[List[int]] = None               # JSON reports only
+    missing_branches: Optional[List[Tuple[int, int]]] = None  # JSON reports only
+
+
+class FunctionCoverage(BaseModel):
+    """Statement coverage of one function or method."""
+    qualname: str
+    lineno: int
+    end_lineno: int
+    statements: int
+    missing: int
+
+    @property
+    def covered(self) -> bool:
+        return self.missing == 0
+
+
+class FileCoverage(BaseModel):
+    """Coverage of one repository file, mapped onto its source."""
+    path: str
+    measured: bool = True             # False: the suite never imported the file
+    statements: int = 0
+    missing_lines: List[int] = Field(default_factory=list)
+    partial_branches: List[str] = Field(default_factory=list)  # e.g. "line 12 never false"
+    functions: List[FunctionCoverage] = Field(default_factory=list)
+
+    @property
+    def percent(self) -> float:
+        if not self.statements:
+            return 100.0
+        return 100.0 * (self.statements - len(self.missing_lines)) / self.statements
+
+    @property
+    def fully_covered(self) -> bool:
+        # Unmeasured files have every statement missing, unless they have none
+        return not self.missing_lines and not self.partial_branches
+
+    @property
+    def untested_functions(self) -> List[FunctionCoverage]:
+        return [fn for fn in self.functions if not fn.covered]
+
+    def summary(self) -> str:
+        """One line for the untested-areas section of the context."""
+        if not self.measured:
+            return f"{self.path}: never imported by the test suite"
+        parts = [f"{self.path}: {self.percent:.0f}% of statements tested"]
+        untested = self.untested_functions
+        if untested:
+            names = ", ".join(
+                f"{fn.qualname}{' (untested)' if fn.missing == fn.statements else ''}"
+                for fn in untested[:_MAX_LISTED]
+            )
+            more = f" and {len(untested) - _MAX_LISTED} more" if len(untested) > _MAX_LISTED else ""
+            parts.append(f"functions with untested lines: {names}{more}")
+        if self.partial_branches:
+            branches = "; ".join(self.partial_branches[:_MAX_LISTED])
+            parts.append(f"branches taken one way only: {branches}")
+        return "; ".join(parts)
+
+
+# ==============================================================================
+# Reading coverage data
+# ==============================================================================
+
+
+def _numbits_to_lines(numbits: bytes) -> Iterable[int]:
+    """Decode coverage.py's line bitmap (bit n of the blob set: line n executed)."""
+    for byte_index, byte in enumerate(numbits):
+        for bit in range(8):
+            if byte & (1 << bit):
+                yield byte_index * 8 + bit
+
+
+def _load_sqlite(path: Path) -> Dict[str, FileCoverageData]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        if "file" not in tables:
+            raise CoverageError(f"{path} is not a coverage.py data file.")
+        paths = dict(conn.execute("SELECT id, path FROM file"))
+        files = {p: FileCoverageData() for p in paths.values()}
+
+        lines: Dict[int, Set[int]] = {}
+        for file_id, numbits in conn.execute("SELECT file_id, numbits FROM line_bits"):
+            lines.setdefault(file_id, set()).update(_numbits_to_lines(numbits))
+
+        arcs: Dict[int, Set[Tuple[int, int]]] = {}
+        if "arc" in tables:
+            for file_id, start, end in conn.execute("SELECT file_id, fromno, tono FROM arc"):
+                arcs.setdefault(file_id, set()).add((start, end))
+    except sqlite3.DatabaseError as exc:
+        raise CoverageError(f"Cannot read coverage data {path}: {exc}") from exc
+    finally:
+        conn.close()
+
+    for file_id, file_path in paths.items():
+        data = files[file_path]
+        executed = set(lines.get(file_id, ()))
+        if file_id in arcs:
+            data.arcs = sorted(arcs[file_id])
+            executed |= {line for arc in arcs[file_id] for line in arc if line > 0}
+        data.executed_lines = sorted(executed)
+    return files
+
+
+def _load_json(path: Path) -> Dict[str, FileCoverageData]:
+    try:
+        report = json.loads(path.read_text(encoding="utf-8"))
+        entries = report["files"]
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise CoverageError(f"{path} is not a `coverage json` report: {exc}") from exc
+    files: Dict[str, FileCoverageData] = {}
+    for file_path, entry in entries.items():
+        branches = entry.get("missing_branches")
+        files[file_path] = FileCoverageData(
+            executed_lines=entry.get("executed_lines", []),
+            missing_lines=entry.get("missing_lines", []),
+            missing_branches=[tuple(arc) for arc in branches] if branches is not None else None,
+        )
+    return files
+
+
+class CoverageData:
+    """Executed lines (and branches) per file, from one coverage measurement."""
+
+    def __init__(self, files: Dict[str, FileCoverageData], *, fingerprint: str = "") -> None:
+        """
+        Args:
+            files: recorded data by path as coverage.py stored it (absolute,
+                or relative with `relative_files`)
+            fingerprint: identifies the measurement in context cache keys
+        """
+        self.files = files
+        self.fingerprint = fingerprint or hashlib.blake2b(
+            json.dumps({p: d.model_dump() for p, d in sorted(files.items())}).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        self._by_suffix: Dict[str, str] = {}
+        for recorded in files:
+            parts = Path(recorded).as_posix().split("/")
+            for start in range(len(parts)):
+                self._by_suffix.setdefault("/".join(parts[start:]), recorded)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CoverageData":
+        """Read a `.coverage` data file or a `coverage json` report."""
+        path = Path(path)
+        try:
+            with path.open("rb") as fh:
+                magic = fh.read(len(_SQLITE_MAGIC))
+            digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        except OSError as exc:
+            raise CoverageError(f"Cannot read coverage data {path}: {exc}") from exc
+        files = _load_sqlite(path) if magic == _SQLITE_MAGIC else _load_json(path)
+        return cls(files, fingerprint=digest)
+
+    def lookup(self, repo_path: str) -> Optional[FileCoverageData]:
+        """Data recorded for a repository-relative path, whatever root it was measured in."""
+        return self.files.get(repo_path) or (
+            self.files[self._by_suffix[repo_path]] if repo_path in self._by_suffix else None
+        )
+
+    def analyse(self, repo_path: str, source: str) -> FileCoverage:
+        """Map the recorded data for `repo_path` onto its `source`."""
+        data = self.lookup(repo_path)
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            tree = None
+        excluded = _excluded_lines(tree, source) if tree is not None else set()
+        statements = _statement_lines(tree) - excluded if tree is not None else set()
+
+        if data is None:
+            executed: Set[int] = set()
+            missing = set(statements)
+        else:
+            executed = set(data.executed_lines)
+            if data.missing_lines is not None:
+                statements = (executed | set(data.missing_lines)) - excluded
+                missing = set(data.missing_lines) - excluded
+            else:
+                missing = statements - executed
+
+        functions = _function_coverage(tree, statements, missing) if tree is not None else []
+        branches: List[str] = []
+        if data is not None and tree is not None:
+            if data.missing_branches is not None:
+                branches = _describe_missing_arcs(data.missing_branches, excluded)
+            else:
+                branches = _partial_branches(tree, executed, data.arcs, excluded)
+        return FileCoverage(
+            path=repo_path,
+            measured=data is not None,
+            statements=len(statements),
+            missing_lines=sorted(missing),
+            partial_branches=branches,
+            functions=functions,
+        )
+
+
+def run_suite_with_coverage(
+    root: str | Path,
+    *,
+    command: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = 1800,
+) -> CoverageData:
+    """Run the repository's test suite once under coverage.py (with branch data).
+
+    `command` holds the arguments given to `python -m coverage run --branch`
+    (`-m pytest -q` by default). The current interpreter runs it, so
+    coverage.py and the suite's dependencies must be installed there.
+    Failing tests do not matter: only what ran is recorded.
+    """
+    root = Path(root)
+    runner = list(command) if command else ["-m", "pytest", "-q", "-p", "no:cacheprovider"]
+    with tempfile.TemporaryDirectory(prefix="llmtestgen-coverage-") as tmp:
+        data_file = Path(tmp) / ".coverage"
+        env = {**os.environ, "COVERAGE_FILE": str(data_file)}
+        try:
+            result = subprocess.run(  # nosec - fixed argv, no shell
+                [sys.executable, "-m", "coverage", "run", "--branch", *runner],
+                cwd=root,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            raise CoverageError(f"Running the test suite under coverage failed: {exc}") from exc
+        if not data_file.exists():
+            detail = (result.stderr or result.stdout).strip().splitlines()[-1:] or ["no output"]
+            raise CoverageError(
+                f"No coverage data produced (exit {result.returncode}): {detail[0]}"
+            )
+        return CoverageData.load(data_file)
+
+
+# ==============================================================================
+# Mapping data onto the source
+# ==============================================================================
+
+
+def _is_docstring(node: ast.stmt, parent: ast.AST) -> bool:
+    body = getattr(parent, "body", None)
+    return (
+        bool(body)
+        and body[0] is node
+        and isinstance(parent, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+        and isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
+
+
+def _first_line(node: ast.stmt) -> int:
+    """Line coverage.py records for a statement (the first decorator, if any)."""
+    decorators = getattr(node, "decorator_list", None)
+    return min([node.lineno] + [d.lineno for d in decorators]) if decorators else node.lineno
+
+
+def _statement_lines(tree: ast.AST) -> Set[int]:
+    """First line of every statement, docstrings excluded (as coverage.py counts them)."""
+    lines: Set[int] = set()
+    for parent in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody", "handlers"):
+            for node in getattr(parent, field, None) or []:
+                if isinstance(node, ast.stmt) and not _is_docstring(node, parent):
+                    lines.add(_first_line(node))
+                elif isinstance(node, ast.ExceptHandler):
+                    lines.add(node.lineno)
+    return lines
+
+
+def _excluded_lines(tree: ast.AST, source: str) -> Set[int]:
+    """Lines of statements marked `# pragma: no cover` (the whole block for compound ones)."""
+    source_lines = source.splitlines()
+    excluded: Set[int] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.stmt):
+            continue
+        if _NO_COVER in source_lines[node.lineno - 1]:
+            excluded.update(range(node.lineno, (node.end_lineno or node.lineno) + 1))
+    return excluded
+
+
+def _function_coverage(
+    tree: ast.AST, statements: Set[int], missing: Set[int]
+) -> List[FunctionCoverage]:
+    functions: List[FunctionCoverage] = []
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = f"{prefix}{child.name}"
+                body = range(child.lineno + 1, (child.end_lineno or child.lineno) + 1)
+                inside = [line for line in body if line in statements]
+                if inside:
+                    functions.append(
+                        FunctionCoverage(
+                            qualname=qualname,
+                            lineno=child.lineno,
+                            end_lineno=child.end_lineno or child.lineno,
+                            statements=len(inside),
+                            missing=sum(1 for line in inside if line in missing),
+                        )
+                    )
+                visit(child, f"{qualname}.")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, f"{prefix}{child.name}.")
+
+    visit(tree, "")
+    return functions
+
+
+def _partial_branches(
+    tree: ast.AST,
+    executed: Set[int],
+    arcs: Optional[List[Tuple[int, int]]],
+    excluded: Set[int],
+) -> List[str]:
+    """Describe `if`/`while`/`for` headers that ran but only went one way."""
+    exits: Dict[int, Set[int]] = {}
+    for start, end in arcs or ():
+        exits.setdefault(start, set()).add(end)
+
+    found: List[Tuple[int, str]] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.If, ast.While, ast.For, ast.AsyncFor)):
+            continue
+        line = node.lineno
+        if line not in executed or line in excluded:
+            continue
+        body_lines = set(range(node.body[0].lineno, (node.body[-1].end_lineno or line) + 1))
+        is_loop = not isinstance(node, ast.If)
+        if arcs is not None:
+            targets = exits.get(line, set())
+            entered = bool(targets & body_lines)
+            # Loops jump back to their header, so only an `if` can be "never false"
+            skipped = bool(targets - body_lines) or is_loop
+        else:
+            entered = node.body[0].lineno in executed
+            skipped = not node.orelse or node.orelse[0].lineno in executed or is_loop
+        if not entered:
+            found.append((line, f"line {line} {'never iterated' if is_loop else 'never true'}"))
+        elif not skipped:
+            found.append((line, f"line {line} never false"))
+    return [text for _, text in sorted(found)]
+
+
+def _describe_missing_arcs(arcs: List[Tuple[int, int]], excluded: Set[int]) -> List[str]:
+    described: List[str] = []
+    for start, end in sorted(arcs):
+        if start in excluded:
+            continue
+        target = f"line {end}" if end > 0 else "exit"
+        described.append(f"line {start} never jumped to {target}")
+    return described
+
+
+def focus_uncovered(source: str, coverage: FileCoverage) -> str:
+    """Collapse the bodies of fully covered functions to `...`, keeping signatures.
+
+    Docstrings are kept so the model still knows what the function does.
+    Returns `source` unchanged when it does not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return source
+    covered = {
+        (fn.qualname.rsplit(".", 1)[-1], fn.lineno) for fn in coverage.functions if fn.covered
+    }
+    lines = source.splitlines()
+    elided: Dict[int, int] = {}   # first elided line -> last elided line
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if (node.name, node.lineno) not in covered:
+            continue
+        body = node.body[1:] if _is_docstring(node.body[0], node) else node.body
+        if not body:
+            continue
+        first, last = body[0].lineno, node.end_lineno or body[-1].lineno
+        if any(start <= first <= end for start, end in elided.items()):
+            continue  # inside a function already collapsed
+        elided[first] = last
+
+    out: List[str] = []
+    skip_until = 0
+    for number, line in enumerate(lines, start=1):
+        if number <= skip_until:
+            continue
+        if number in elided:
+            indent = line[: len(line) - len(line.lstrip())]
+            out.append(f"{indent}...  # covered by existing tests")
+            skip_until = elided[number]
+            continue
+        out.append(line)
+    return "\n".join(out)
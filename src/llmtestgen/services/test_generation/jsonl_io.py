@@ -0,0 +1,139 @@
+"""JSON Lines output of test specifications, and a streaming loader.
+
+Each specification is written as a header record followed by one
+`TestCase` per line:
+
+    {"record":"header","format":1,"spec_source_path":"specs/a.md","llm_model":"m","test_case_count":2}
+    {"id":"TC-1","requirement":...,"description":...,...}
+    {"id":"TC-2",...}
+
+A file may hold several specifications one after the other. Writing and
+reading are both streaming: one line is serialized or validated at a time,
+so memory stays flat however large the result set is.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Literal, Optional, Union
+
+from pydantic import BaseModel, ValidationError
+
+from llmtestgen.core.utils_files import write_chunks_atomic
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+JSONL_FORMAT_VERSION = 1
+
+
+class TestSpecHeader(BaseModel):
+    """First record of each specification in a JSONL file."""
+    __test__ = False  # not a pytest test class
+
+    record: Literal["header"] = "header"
+    format: int = JSONL_FORMAT_VERSION
+    spec_source_path: str
+    llm_model: Optional[str] = None
+    test_case_count: int = 0
+
+    @classmethod
+    def of(cls, test_spec: TestSpecification) -> "TestSpecHeader":
+        return cls(
+            spec_source_path=test_spec.spec_source_path,
+            llm_model=test_spec.llm_model,
+            test_case_count=len(test_spec.test_cases),
+        )
+
+
+JsonlRecord = Union[TestSpecHeader, TestCase]
+
+
+def iter_test_spec_jsonl(test_spec: TestSpecification) -> Iterator[str]:
+    """Yield the JSONL lines (newline included) of one specification."""
+    yield TestSpecHeader.of(test_spec).model_dump_json() + "\n"
+    for test_case in test_spec.test_cases:
+        yield test_case.model_dump_json() + "\n"
+
+
+def write_test_specs_jsonl(
+    test_specs: Iterable[TestSpecification],
+    output_path: str | Path,
+    *,
+    skip_unchanged: bool = True,
+) -> bool:
+    """Stream several specifications into one JSONL file, atomically.
+
+    `test_specs` may be a generator: each specification is serialized as it
+    arrives. Returns True if the file was (re)written.
+    """
+    chunks = (line for test_spec in test_specs for line in iter_test_spec_jsonl(test_spec))
+    return write_chunks_atomic(output_path, chunks, skip_unchanged=skip_unchanged)
+
+
+def iter_jsonl_records(path: str | Path) -> Iterator[JsonlRecord]:
+    """Yield headers and test cases from a JSONL file, validating one line at a time.
+
+    Raises ValueError naming the file and line on the first invalid record.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as fh:
+        for lineno, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            record: JsonlRecord
+            try:
+                data = json.loads(line)
+                if isinstance(data, dict) and data.get("record") == "header":
+                    record = TestSpecHeader.model_validate(data)
+                    if record.format > JSONL_FORMAT_VERSION:
+                        raise ValueError(
+                            f"unsupported format {record.format} "
+                            f"(this version reads up to {JSONL_FORMAT_VERSION})"
+                        )
+                else:
+                    record = TestCase.model_validate(data)
+            except (ValidationError, ValueError) as err:
+                raise ValueError(f"{path}:{lineno}: invalid JSONL record: {err}") from err
+            yield record
+
+
+def iter_test_cases_jsonl(path: str | Path) -> Iterator[TestCase]:
+    """Yield only the test cases of a JSONL file, lazily."""
+    for record in iter_jsonl_records(path):
+        if isinstance(record, TestCase):
+            yield record
+
+
+def read_test_specs_jsonl(path: str | Path) -> Iterator[TestSpecification]:
+    """Yield the specifications of a JSONL file one at a time.
+
+    Only one specification's test cases are held in memory at once. Cases
+    before the first header (e.g. a file of bare test cases) are grouped
+    under an empty `spec_source_path`.
+    """
+    current: Optional[TestSpecification] = None
+    for record in iter_jsonl_records(path):
+        if isinstance(record, TestSpecHeader):
+            if current is not None:
+                yield current
+            current = TestSpecification(
+                spec_source_path=record.spec_source_path, llm_model=record.llm_model
+            )
+        else:
+            if current is None:
+                current = TestSpecification(spec_source_path="")
+            current.test_cases.append(record)
+    if current is not None:
+        yield current
+
+
+def load_test_spec_jsonl(path: str | Path) -> TestSpecification:
+    """Load a single-specification JSONL file."""
+    specs = list(read_test_specs_jsonl(path))
+    if len(specs) != 1:
+        raise ValueError(f"{path}: expected one specification, found {len(specs)}.")
+    return specs[0]
+
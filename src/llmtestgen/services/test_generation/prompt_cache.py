@@ -0,0 +1,90 @@
+"""Cache-aware prompt assembly for provider-side prompt caching.
+
+Providers cache prompts by exact prefix. To get hits across runs and shards
+against the same repository, the stable parts of a prompt (system prompt,
+code context) must come first and the volatile parts (the spec) last.
+Some backends (Anthropic and Gemini models, directly or via OpenRouter)
+additionally need an explicit `cache_control` marker on the stable block.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel
+
+# Models that only cache when the prompt carries explicit `cache_control` breakpoints.
+# OpenAI, DeepSeek and most others cache prefixes automatically.
+CACHE_CONTROL_MODEL_PREFIXES = (
+    "anthropic/",
+    "claude-",
+    "google/gemini",
+    "gemini-",
+)
+
+PromptContent = Union[str, List[Dict[str, Any]]]
+
+
+def supports_cache_control(model: Optional[str]) -> bool:
+    """Return True if `model` accepts explicit `cache_control` content hints."""
+    if not model:
+        return False
+    return model.lower().startswith(CACHE_CONTROL_MODEL_PREFIXES)
+
+
+class AssembledPrompt(BaseModel):
+    """A prompt split into its cacheable prefix and volatile suffix."""
+
+    system_prompt: str
+    stable_prefix: str = ""
+    volatile_suffix: str
+    cache_hint: bool = False
+
+    @property
+    def user_text(self) -> str:
+        """The full user prompt as plain text (stable content first)."""
+        if not self.stable_prefix:
+            return self.volatile_suffix
+        return f"{self.stable_prefix}\n\n{self.volatile_suffix}"
+
+    def user_content(self) -> PromptContent:
+        """User message content: plain text, or content parts with a cache breakpoint."""
+        if not (self.cache_hint and self.stable_prefix):
+            return self.user_text
+        return [
+            {
+                "type": "text",
+                "text": self.stable_prefix,
+                "cache_control": {"type": "ephemeral"},
+            },
+            {"type": "text", "text": self.volatile_suffix},
+        ]
+
+
+class CacheAwarePromptAssembler:
+    """Order prompt blocks for prefix caching and attach cache hints when supported."""
+
+    def __init__(self, *, cache_hints: bool = True) -> None:
+        """
+        Args:
+            cache_hints: emit `cache_control` content parts for models that need them
+        """
+        self.cache_hints = cache_hints
+
+    def assemble(
+        self,
+        *,
+        system_prompt: str,
+        stable_blocks: List[str],
+        volatile_blocks: List[str],
+        model: Optional[str] = None,
+    ) -> AssembledPrompt:
+        """Assemble stable blocks (repo-level) ahead of volatile blocks (spec-level)."""
+        stable = "\n\n".join(block for block in stable_blocks if block)
+        volatile = "\n\n".join(block for block in volatile_blocks if block)
+        return AssembledPrompt(
+            system_prompt=system_prompt,
+            stable_prefix=stable,
+            volatile_suffix=volatile,
+            cache_hint=self.cache_hints and supports_cache_control(model),
+        )
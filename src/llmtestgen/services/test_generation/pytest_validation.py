@@ -0,0 +1,377 @@
+"""Validation and targeted repair of generated pytest modules.
+
+Rendered modules are checked with `compile()`/`ast` and a collection-only
+pytest run, in parallel across modules. Failures are attributed to individual
+test cases (by line span for syntax errors, by resolved import for collection
+errors) so only those cases are regenerated.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+import re
+import subprocess  # nosec linter, runs the current interpreter only
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+
+from llmtestgen.core.utils_json import extract_json
+from llmtestgen.services.test_generation.python_test_writer import (
+    RenderedPytestModule,
+    build_pytest_module,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+# (test case, failure message) -> replacement test case
+RegenerateFn = Callable[[TestCase, str], TestCase]
+
+DEFAULT_COLLECT_TIMEOUT_S = 60.0
+
+_NO_MODULE = re.compile(r"No module named '([\w.]+)'")
+_CANNOT_IMPORT = re.compile(r"cannot import name '(\w+)' from '([\w.]+)'")
+
+
+class CaseFailure(BaseModel):
+    """A validation failure attributed to one test case."""
+    index: int          # 0-based position in TestSpecification.test_cases
+    stage: str          # "compile" or "collect"
+    message: str
+    module: Optional[str] = None  # unresolved import module, for collect failures
+
+
+class ModuleValidation(BaseModel):
+    """Outcome of validating one rendered pytest module."""
+    failures: List[CaseFailure] = []
+    module_error: Optional[str] = None  # failure not attributable to a case
+    collected: Optional[int] = None     # tests collected, None if not run
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures and self.module_error is None
+
+
+class PytestEmission(BaseModel):
+    """Final pytest module for a spec, after validation and repair rounds."""
+    test_spec: TestSpecification
+    module: RenderedPytestModule
+    validation: ModuleValidation
+    regenerated: List[int] = []      # indexes of cases that were regenerated
+    skipped_imports: List[str] = []  # modules commented out as a last resort
+
+
+# ==============================================================================
+# Checks
+# ==============================================================================
+
+
+def _case_at_line(module: RenderedPytestModule, lineno: Optional[int]) -> Optional[int]:
+    if lineno is None:
+        return None
+    for idx, (start, end) in enumerate(module.case_spans):
+        if start <= lineno <= end:
+            return idx
+    return None
+
+
+def check_compile(module: RenderedPytestModule) -> ModuleValidation:
+    """Compile the module and each case on its own, attributing syntax errors."""
+    try:
+        tree = compile(module.source, "<generated>", "exec", ast.PyCF_ONLY_AST)
+        compile(tree, "<generated>", "exec")
+        return ModuleValidation()
+    except SyntaxError as err:
+        module_err = err
+
+    failures: List[CaseFailure] = []
+    for idx, case_source in enumerate(module.case_sources):
+        try:
+            compile(case_source, f"<case {idx + 1}>", "exec")
+        except SyntaxError as err:
+            failures.append(CaseFailure(index=idx, stage="compile", message=str(err)))
+
+    if failures:
+        return ModuleValidation(failures=failures)
+
+    idx = _case_at_line(module, module_err.lineno)
+    if idx is not None:
+        return ModuleValidation(
+            failures=[CaseFailure(index=idx, stage="compile", message=str(module_err))]
+        )
+    return ModuleValidation(module_error=str(module_err))
+
+
+def _pythonpath(repo_root: Optional[Path]) -> str:
+    paths: List[str] = []
+    if repo_root is not None:
+        paths.append(str(repo_root))
+        if (repo_root / "src").is_dir():
+            paths.append(str(repo_root / "src"))
+    if os.environ.get("PYTHONPATH"):
+        paths.append(os.environ["PYTHONPATH"])
+    return os.pathsep.join(paths)
+
+
+def _attribute_collect_errors(
+    module: RenderedPytestModule, output: str
+) -> List[CaseFailure]:
+    missing_modules: Set[str] = set(_NO_MODULE.findall(output))
+    missing_names: Set[Tuple[str, str]] = {
+        (mod, name) for name, mod in _CANNOT_IMPORT.findall(output)
+    }
+
+    failures: List[CaseFailure] = []
+    for idx, imports in enumerate(module.case_imports):
+        for imp in imports:
+            broken = (imp.module, imp.name) in missing_names or any(
+                imp.module == missing or imp.module.startswith(missing + ".")
+                for missing in missing_modules
+            )
+            if broken:
+                failures.append(
+                    CaseFailure(
+                        index=idx,
+                        stage="collect",
+                        message=f"Cannot import: {imp.statement()}",
+                        module=imp.module,
+                    )
+                )
+                break
+    return failures
+
+
+def check_collect(
+    module: RenderedPytestModule,
+    *,
+    repo_root: Optional[Path] = None,
+    timeout: float = DEFAULT_COLLECT_TIMEOUT_S,
+) -> ModuleValidation:
+    """Run `pytest --collect-only` on the module in an isolated temp directory."""
+    with tempfile.TemporaryDirectory(prefix="llmtestgen-collect-") as tmp:
+        test_file = Path(tmp) / "test_generated.py"
+        test_file.write_text(module.source, encoding="utf-8")
+
+        env = dict(os.environ, PYTHONPATH=_pythonpath(repo_root), PYTHONDONTWRITEBYTECODE="1")
+        cmd = [
+            sys.executable, "-m", "pytest", "--collect-only", "-q",
+            "-p", "no:cacheprovider", "--rootdir", tmp, str(test_file),
+        ]
+        try:
+            proc = subprocess.run(  # nosec linter, fixed argv
+                cmd, cwd=tmp, env=env, capture_output=True, text=True, timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return ModuleValidation(module_error=f"pytest collection timed out after {timeout}s")
+
+    output = proc.stdout + proc.stderr
+    collected = sum(1 for line in proc.stdout.splitlines() if "::test_" in line)
+    # 5 = no tests collected, which is fine for an empty spec
+    if proc.returncode in (0, 5):
+        return ModuleValidation(collected=collected)
+
+    failures = _attribute_collect_errors(module, output)
+    if failures:
+        return ModuleValidation(failures=failures, collected=collected)
+    return ModuleValidation(module_error=output.strip()[-2000:], collected=collected)
+
+
+def validate_pytest_module(
+    module: RenderedPytestModule,
+    *,
+    repo_root: Optional[Path] = None,
+    collect: bool = True,
+    timeout: float = DEFAULT_COLLECT_TIMEOUT_S,
+) -> ModuleValidation:
+    """Compile-check the module, then collection-check it if it compiles."""
+    result = check_compile(module)
+    if not result.ok or not collect:
+        return result
+    return check_collect(module, repo_root=repo_root, timeout=timeout)
+
+
+def _validate_worker(
+    payload: str, repo_root: Optional[str], collect: bool, timeout: float
+) -> str:
+    # Models travel as JSON so the worker does not depend on pickling pydantic objects
+    module = RenderedPytestModule.model_validate_json(payload)
+    result = validate_pytest_module(
+        module,
+        repo_root=Path(repo_root) if repo_root else None,
+        collect=collect,
+        timeout=timeout,
+    )
+    return result.model_dump_json()
+
+
+def validate_pytest_modules(
+    modules: Sequence[RenderedPytestModule],
+    *,
+    repo_root: Optional[str | Path] = None,
+    collect: bool = True,
+    timeout: float = DEFAULT_COLLECT_TIMEOUT_S,
+    max_workers: Optional[int] = None,
+) -> List[ModuleValidation]:
+    """Validate several modules in a process pool, preserving input order.
+
+    A single module is validated in-process to avoid pool start-up cost.
+    """
+    root = str(repo_root) if repo_root is not None else None
+    if len(modules) <= 1 or max_workers == 1:
+        return [
+            ModuleValidation.model_validate_json(
+                _validate_worker(m.model_dump_json(), root, collect, timeout)
+            )
+            for m in modules
+        ]
+
+    workers = min(len(modules), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            _validate_worker,
+            [m.model_dump_json() for m in modules],
+            [root] * len(modules),
+            [collect] * len(modules),
+            [timeout] * len(modules),
+        )
+        return [ModuleValidation.model_validate_json(r) for r in results]
+
+
+# ==============================================================================
+# Repair loop
+# ==============================================================================
+
+
+def emit_validated_pytest(
+    test_specs: Sequence[TestSpecification],
+    *,
+    repo_root: Optional[str | Path] = None,
+    regenerate_fn: Optional[RegenerateFn] = None,
+    max_rounds: int = 2,
+    collect: bool = True,
+    timeout: float = DEFAULT_COLLECT_TIMEOUT_S,
+    max_workers: Optional[int] = None,
+    skip_placeholders: bool = False,
+) -> List[PytestEmission]:
+    """Render, validate and repair pytest modules for several specs.
+
+    Each round validates every still-failing module in parallel and passes
+    only the failing cases to `regenerate_fn`. Once rounds are exhausted,
+    imports that still fail collection are commented out so the module can
+    at least be collected. `skip_placeholders` is passed to
+    `build_pytest_module`.
+    """
+    specs = [spec.model_copy(deep=True) for spec in test_specs]
+    skipped: List[Set[str]] = [set() for _ in specs]
+    regenerated: List[Set[int]] = [set() for _ in specs]
+    modules = [build_pytest_module(spec, skip_placeholders=skip_placeholders) for spec in specs]
+    results: List[Optional[ModuleValidation]] = [None] * len(specs)
+
+    rounds = max_rounds if regenerate_fn is not None else 0
+    pending = list(range(len(specs)))
+    for round_no in range(rounds + 1):
+        if not pending:
+            break
+        checked = validate_pytest_modules(
+            [modules[i] for i in pending],
+            repo_root=repo_root,
+            collect=collect,
+            timeout=timeout,
+            max_workers=max_workers,
+        )
+        still_failing: List[int] = []
+        for i, result in zip(pending, checked):
+            results[i] = result
+            if result.ok or not result.failures:
+                continue
+            if regenerate_fn is not None and round_no < rounds:
+                for failure in result.failures:
+                    case = specs[i].test_cases[failure.index]
+                    specs[i].test_cases[failure.index] = regenerate_fn(case, failure.message)
+                    regenerated[i].add(failure.index)
+            else:
+                skipped[i].update(f.module for f in result.failures if f.module)
+            modules[i] = build_pytest_module(
+                specs[i], skip_imports=skipped[i], skip_placeholders=skip_placeholders
+            )
+            still_failing.append(i)
+        pending = still_failing
+
+    # Last-resort rebuilds (skipped imports) get one final check
+    if pending:
+        for i, result in zip(
+            pending,
+            validate_pytest_modules(
+                [modules[i] for i in pending],
+                repo_root=repo_root,
+                collect=collect,
+                timeout=timeout,
+                max_workers=max_workers,
+            ),
+        ):
+            results[i] = result
+
+    return [
+        PytestEmission(
+            test_spec=specs[i],
+            module=modules[i],
+            validation=results[i] or ModuleValidation(),
+            regenerated=sorted(regenerated[i]),
+            skipped_imports=sorted(skipped[i]),
+        )
+        for i in range(len(specs))
+    ]
+
+
+# ==============================================================================
+# LLM-backed regeneration
+# ==============================================================================
+
+
+_REGENERATE_SYSTEM_PROMPT = (
+    "You repair software test case designs. Given one test case as JSON and "
+    "the error raised when its generated pytest code was validated, return the "
+    "corrected test case as a single JSON object with the same keys. Only "
+    "reference code elements that exist (e.g. 'package/module.py::function'). "
+    "Return JSON only."
+)
+
+
+def build_llm_case_regenerator(
+    send_prompt_fn,
+    *,
+    model: Optional[str] = None,
+    api_key: Optional[str] = None,
+    code_context: str = "",
+) -> RegenerateFn:
+    """Return a RegenerateFn that asks the LLM to fix a single failing case.
+
+    The original case is kept when the LLM answer is not a valid test case.
+    """
+    def regenerate(case: TestCase, error: str) -> TestCase:
+        parts = []
+        if code_context:
+            parts.append("Code context (Python project):\n\n" + code_context)
+        parts.append("Test case:\n" + case.model_dump_json(indent=2))
+        parts.append("Validation error:\n" + error)
+        response_text = send_prompt_fn(
+            "\n\n".join(parts),
+            api_key=api_key,
+            model=model,
+            system_prompt=_REGENERATE_SYSTEM_PROMPT,
+        )
+        try:
+            data = extract_json(response_text)
+            if isinstance(data, dict) and isinstance(data.get("test_cases"), list):
+                data = data["test_cases"][0]
+            return TestCase.model_validate({**case.model_dump(), **data})
+        except (ValueError, TypeError, IndexError):
+            return case
+
+    return regenerate
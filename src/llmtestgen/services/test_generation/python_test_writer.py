@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator, List, Optional, Tuple
 from pydantic import BaseModel
 
+from llmtestgen.core.utils_files import write_chunks_atomic
+from llmtestgen.services.code_index import module_name_for_path
+from llmtestgen.services.test_generation.jsonl_io import iter_test_spec_jsonl
+
 from llmtestgen.services.test_generation.test_spec_generator import (
     TestCase,
     TestSpecification,
@@ -12,8 +18,6 @@ from llmtestgen.services.test_generation.test_spec_generator import (
 
 def _slugify(text: str, max_length: int = 60) -> str:
     """Convert a free-form description into a safe fragment usable in filenames."""
-    import re
-
     text = text.lower()
     text = re.sub(r"[^a-z0-9]+", "_", text)
     text = re.sub(r"_+", "_", text).strip("_")
@@ -73,15 +77,20 @@ def render_test_case_markdown(test_case: TestCase, index: int) -> str:
     return "\n".join(lines)
 
 
-def render_test_spec_file_markdown(
+def iter_test_spec_file_markdown(
     test_spec: TestSpecification,
     *,
     include_header: bool = True,
-) -> str:
-    """Render a whole TestSpecification into a Markdown document."""
-    lines: list[str] = []
+) -> Iterator[str]:
+    """Yield the Markdown document for a TestSpecification chunk by chunk.
+
+    Concatenating the chunks gives exactly `render_test_spec_file_markdown`,
+    but only one test case is rendered in memory at a time.
+    """
+    started = False
 
     if include_header:
+        lines: list[str] = []
         lines.append("# Auto-Generated Test Specification")
         lines.append("")
         lines.append(f"**Source spec:** `{test_spec.spec_source_path}`")
@@ -90,15 +99,303 @@ def render_test_spec_file_markdown(
         lines.append("")
         lines.append("---")
         lines.append("")
+        yield "\n".join(lines)
+        started = True
 
     if not test_spec.test_cases:
-        lines.append("_No test cases were generated._")
-        return "\n".join(lines)
+        yield ("\n" if started else "") + "_No test cases were generated._"
+        return
 
+    last = len(test_spec.test_cases)
     for idx, tc in enumerate(test_spec.test_cases, start=1):
-        lines.append(render_test_case_markdown(tc, idx))
+        block = render_test_case_markdown(tc, idx)
+        if idx == last:
+            block = block.rstrip() + "\n"
+        yield ("\n" if started else "") + block
+        started = True
+
+
+def render_test_spec_file_markdown(
+    test_spec: TestSpecification,
+    *,
+    include_header: bool = True,
+) -> str:
+    """Render a whole TestSpecification into a Markdown document."""
+    return "".join(iter_test_spec_file_markdown(test_spec, include_header=include_header))
+
+
+# ==============================================================================
+# Pytest rendering
+# ==============================================================================
+
+
+class TargetImport(BaseModel):
+    """Import statement resolved from a `target_code_elements` entry."""
+    module: str
+    name: Optional[str] = None
+
+    def statement(self) -> str:
+        if self.name:
+            return f"from {self.module} import {self.name}"
+        return f"import {self.module}"
+
+
+class RenderedPytestModule(BaseModel):
+    """A rendered pytest module plus the per-case layout needed for validation."""
+    source: str
+    case_sources: List[str]
+    case_spans: List[Tuple[int, int]]         # 1-based inclusive line range per case
+    case_imports: List[List[TargetImport]]    # imports each case relies on
+    skipped_imports: List[TargetImport]       # imports rendered as comments only
+
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
-    return "\n".join(lines).rstrip() + "\n"
+
+def resolve_target_import(element: str) -> Optional[TargetImport]:
+    """Best-effort mapping of a target code element to an import.
+
+    Understands file paths (`pkg/mod.py`, `pkg/mod.py::Class.method`, with a
+    leading `src/` layout folder dropped as the validation PYTHONPATH has it) and
+    dotted names (`pkg.mod.Class.method`, `pkg.mod.func`). Returns None for
+    anything that does not look like importable code (free text, globs...).
+    """
+    element = element.strip().strip("`").removesuffix("()")
+    if not element or " " in element:
+        return None
+
+    path_part, _, symbol = element.partition("::")
+    if path_part.endswith(".py"):
+        module = module_name_for_path(path_part.replace("\\", "/").strip("/"))
+        parts = module.split(".") if module else []
+        name = symbol.split(".")[0] if symbol else None
+    else:
+        dotted = element.replace("::", ".").split(".")
+        split_at = next(
+            (i for i, part in enumerate(dotted) if part[:1].isupper()),
+            len(dotted) - 1,
+        )
+        parts, name = dotted[:split_at], dotted[split_at] if split_at < len(dotted) else None
+
+    if not parts or not all(_IDENTIFIER.match(part) for part in parts):
+        return None
+    if name is not None and not _IDENTIFIER.match(name):
+        name = None
+    return TargetImport(module=".".join(parts), name=name)
+
+
+def _comment(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _docstring(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _fixture_name(precondition: str) -> str:
+    return f"precondition_{_slugify(precondition, max_length=50)}"
+
+
+def render_test_case_pytest(
+    test_case: TestCase,
+    index: int,
+    *,
+    fixture_names: Iterable[str] = (),
+    skip_placeholders: bool = False,
+) -> str:
+    """Render a single TestCase as a pytest test function skeleton.
+
+    The body fails with "Not implemented yet" until the test is written;
+    with `skip_placeholders` it is skipped instead.
+    """
+    title = test_case.id or test_case.description or f"Test {index}"
+    params = ", ".join(fixture_names)
+
+    lines: list[str] = []
+    lines.append(f"def test_{index:03d}_{_slugify(title)}({params}):")
+
+    lines.append('    """' + (
+        _docstring(f"Requirement: {test_case.requirement}")
+        if test_case.requirement
+        else _docstring(f"Description: {test_case.description}")
+    ))
+    if test_case.requirement and test_case.description:
+        lines.append("")
+        lines.append("    " + _docstring(f"Description: {test_case.description}"))
+    lines.append('    """')
+
+    if test_case.preconditions:
+        lines.append("    # Preconditions")
+        for pre in test_case.preconditions:
+            lines.append(f"    # - {_comment(pre)}")
+
+    if test_case.target_code_elements:
+        lines.append("    # Target code elements")
+        for elem in test_case.target_code_elements:
+            lines.append(f"    # - {_comment(elem)}")
+
+    if test_case.steps:
+        lines.append("    # Steps")
+        for i, step in enumerate(test_case.steps, start=1):
+            lines.append(f"    # {i}. {_comment(step)}")
+
+    if test_case.expected_result:
+        lines.append("    # Expected result")
+        for line in test_case.expected_result.splitlines():
+            lines.append(f"    # - {_comment(line)}")
+
+    if skip_placeholders:
+        lines.append('    pytest.skip("Not implemented yet")')
+    else:
+        lines.append('    assert False, "Not implemented yet"')
+    return "\n".join(lines) + "\n"
+
+
+def build_pytest_module(
+    test_spec: TestSpecification,
+    *,
+    skip_imports: Iterable[str] = (),
+    skip_placeholders: bool = False,
+) -> RenderedPytestModule:
+    """Render a TestSpecification as a pytest module.
+
+    Each distinct precondition becomes a fixture requested by the cases that
+    need it, and imports are resolved from `target_code_elements`. Imports
+    whose module is listed in `skip_imports` are emitted as comments only.
+    With `skip_placeholders`, unwritten tests and fixtures skip instead of
+    failing or doing nothing.
+    """
+    skipped_modules = set(skip_imports)
+    header: list[str] = []
+    header.append('"""Auto-generated test module from LLMTestGen.')
+    header.append("")
+    header.append(_docstring(f"Source spec: {test_spec.spec_source_path}"))
+    if test_spec.llm_model:
+        header.append(_docstring(f"Generated by model: {test_spec.llm_model}"))
+    header.append('"""')
+    header.append("")
+
+    if not test_spec.test_cases:
+        header.append("# No test cases were generated.")
+        source = "\n".join(header) + "\n"
+        return RenderedPytestModule(
+            source=source, case_sources=[], case_spans=[], case_imports=[], skipped_imports=[]
+        )
+
+    # Fixtures, one per distinct precondition (in order of first use)
+    fixtures: dict[str, str] = {}
+    used_names: set[str] = set()
+    for tc in test_spec.test_cases:
+        for pre in tc.preconditions:
+            if pre in fixtures:
+                continue
+            name = base = _fixture_name(pre)
+            suffix = 2
+            while name in used_names:
+                name = f"{base}_{suffix}"
+                suffix += 1
+            fixtures[pre] = name
+            used_names.add(name)
+
+    # Imports, de-duplicated across cases
+    case_imports: List[List[TargetImport]] = []
+    imports: list[TargetImport] = []
+    for tc in test_spec.test_cases:
+        resolved = []
+        for elem in tc.target_code_elements:
+            target = resolve_target_import(elem)
+            if target is not None and target not in resolved:
+                resolved.append(target)
+                if target not in imports:
+                    imports.append(target)
+        case_imports.append(resolved)
+
+    header.append("import pytest")
+    active = [imp for imp in imports if imp.module not in skipped_modules]
+    skipped = [imp for imp in imports if imp.module in skipped_modules]
+    if active:
+        header.append("")
+        for imp in active:
+            header.append(f"{imp.statement()}  # noqa: F401")
+    for imp in skipped:
+        header.append(f"# unresolved import: {imp.statement()}")
+
+    for pre, name in fixtures.items():
+        header.append("")
+        header.append("")
+        header.append("@pytest.fixture")
+        header.append(f"def {name}():")
+        header.append('    """' + _docstring(f"Precondition: {_comment(pre)}") + '"""')
+        if skip_placeholders:
+            header.append('    pytest.skip("Precondition not implemented yet")')
+        else:
+            header.append("    # TODO: establish this precondition.")
+        header.append("    yield")
+
+    lines = header
+    case_sources: List[str] = []
+    case_spans: List[Tuple[int, int]] = []
+    for idx, tc in enumerate(test_spec.test_cases, start=1):
+        case_source = render_test_case_pytest(
+            tc,
+            idx,
+            fixture_names=[fixtures[pre] for pre in dict.fromkeys(tc.preconditions)],
+            skip_placeholders=skip_placeholders,
+        )
+        lines.append("")
+        lines.append("")
+        start = len(lines) + 1
+        lines.extend(case_source.rstrip("\n").split("\n"))
+        case_spans.append((start, len(lines)))
+        case_sources.append(case_source)
+
+    return RenderedPytestModule(
+        source="\n".join(lines) + "\n",
+        case_sources=case_sources,
+        case_spans=case_spans,
+        case_imports=case_imports,
+        skipped_imports=skipped,
+    )
+
+
+def render_test_spec_file(
+    test_spec: TestSpecification, *, skip_placeholders: bool = False
+) -> str:
+    """Render a whole TestSpecification into a pytest module."""
+    return build_pytest_module(test_spec, skip_placeholders=skip_placeholders).source
+
+
+class WriteOutcome(BaseModel):
+    """Result of writing one output file."""
+    path: Path
+    written: bool  # False when the existing file already had identical content
+
+
+def write_test_spec_file_outcome(
+    test_spec: TestSpecification,
+    output_path: str | Path,
+    *,
+    include_header: bool = True,
+    skip_unchanged: bool = True,
+    skip_placeholders: bool = False,
+) -> WriteOutcome:
+    """Stream the specification to disk atomically, skipping unchanged files.
+
+    `.py` outputs get a pytest module (see `build_pytest_module` for
+    `skip_placeholders`), `.jsonl` ones JSON Lines (see `jsonl_io`),
+    anything else the Markdown document.
+    """
+    output_path = Path(output_path)
+    if output_path.suffix == ".py":
+        chunks: Iterable[str] = [
+            render_test_spec_file(test_spec, skip_placeholders=skip_placeholders)
+        ]
+    elif output_path.suffix == ".jsonl":
+        chunks = iter_test_spec_jsonl(test_spec)
+    else:
+        chunks = iter_test_spec_file_markdown(test_spec, include_header=include_header)
+    written = write_chunks_atomic(output_path, chunks, skip_unchanged=skip_unchanged)
+    return WriteOutcome(path=output_path, written=written)
 
 
 def write_test_spec_file(
@@ -106,14 +403,47 @@ def write_test_spec_file(
     output_path: str | Path,
     *,
     include_header: bool = True,
+    skip_unchanged: bool = True,
 ) -> Path:
-    """Render and write the Markdown specification to disk."""
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    """Render and write the specification (Markdown, pytest for `.py`, JSONL for `.jsonl`).
 
-    content = render_test_spec_file_markdown(
+    The file is replaced atomically and left untouched (mtime included) when its
+    content would not change, so downstream build caches stay valid.
+    """
+    return write_test_spec_file_outcome(
         test_spec,
+        output_path,
         include_header=include_header,
-    )
-    output_path.write_text(content, encoding="utf-8")
-    return output_path
+        skip_unchanged=skip_unchanged,
+    ).path
+
+
+def write_test_spec_files(
+    items: Iterable[Tuple[TestSpecification, str | Path]],
+    *,
+    include_header: bool = True,
+    skip_unchanged: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[WriteOutcome]:
+    """Write many (test_spec, output_path) pairs concurrently, in input order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [
+            write_test_spec_file_outcome(
+                spec, path, include_header=include_header, skip_unchanged=skip_unchanged
+            )
+            for spec, path in items
+        ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(
+            pool.map(
+                lambda item: write_test_spec_file_outcome(
+                    item[0],
+                    item[1],
+                    include_header=include_header,
+                    skip_unchanged=skip_unchanged,
+                ),
+                items,
+            )
+        )
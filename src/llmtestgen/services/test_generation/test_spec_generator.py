@@ -1,18 +1,54 @@
 from __future__ import annotations
 
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
 
-import json
 from pydantic import BaseModel, Field, ValidationError
 
 from llmtestgen.services.spec_analyser.parse_router_normalizer import (
     NormalizedSpec,
     parse_spec,
 )
-from llmtestgen.wrappers.git_repository import GitRepository
+from llmtestgen.services.code_index import CodeIndex
+from llmtestgen.services.model_routing import ModelRoutingPolicy, PipelineStage
+from llmtestgen.services.test_generation.prompt_cache import (
+    AssembledPrompt,
+    CacheAwarePromptAssembler,
+)
+from llmtestgen.services.test_generation.context_cache import RepoContextCache, repo_fingerprint
+from llmtestgen.services.test_generation.context_compression import (
+    ContextCompression,
+    alias_groups,
+    compress_python_source,
+)
+from llmtestgen.services.test_generation.coverage_targeting import (
+    CoverageData,
+    FileCoverage,
+    focus_uncovered,
+)
+from llmtestgen.services.test_generation.case_dedup import (
+    DEFAULT_DEDUP_THRESHOLD,
+    DuplicateReport,
+    TestCaseDeduplicator,
+    check_dedup_threshold,
+)
+from llmtestgen.wrappers.git_repository import GitRepository, GitRepositoryError
+from llmtestgen.wrappers.llm_usage import LLMUsage, finish_reason
+from llmtestgen.wrappers.structured_output import (
+    json_schema_response_format,
+    model_schema,
+    supports_structured_output,
+)
 from llmtestgen.core.utils_errors import SpecParsingError
+from llmtestgen.core.utils_files import TextHead
+from llmtestgen.core.utils_json import extract_json, salvage_json_array
+from llmtestgen.core.utils_memory import MemoryProfiler, profile_stage
+from llmtestgen.core.utils_raw_text import RawTextRef
 
 
 # ==============================================================================
@@ -37,6 +73,28 @@ class TestSpecification(BaseModel):
     test_cases: List[TestCase] = Field(default_factory=list)
     llm_model: Optional[str] = None
     llm_raw_response: Optional[str] = None
+    llm_raw_response_ref: Optional[RawTextRef] = None  # side file used in lean mode
+    usage: Optional[LLMUsage] = None  # token usage incl. prompt-cache hits, when reported
+    duplicates: List[DuplicateReport] = Field(default_factory=list)  # near-duplicates removed
+    continuations: int = 0  # follow-up requests made after a truncated answer
+    truncated: bool = False  # still cut off once the continuations were used up
+
+    def get_llm_raw_response(self) -> Optional[str]:
+        """Return the raw LLM response, loading it from its side file if it was spilled."""
+        if self.llm_raw_response is None and self.llm_raw_response_ref is not None:
+            return self.llm_raw_response_ref.load()
+        return self.llm_raw_response
+
+
+# JSON schema sent as `response_format` to models that support structured output
+TEST_SPECIFICATION_RESPONSE_FORMAT = json_schema_response_format(
+    "test_specification",
+    {
+        "type": "object",
+        "properties": {"test_cases": {"type": "array", "items": model_schema(TestCase)}},
+        "required": ["test_cases"],
+    },
+)
 
 
 # ==============================================================================
@@ -49,21 +107,111 @@ class CodeContextLevel(str, Enum):
     NONE = "none"
     FILE_LIST = "file_list"           # only list of Python files
     FILE_SNIPPETS = "file_snippets"   # list + truncated contents
+    OUTLINE = "outline"               # list + signatures/docstrings from the symbol index
     FULL = "full"                     # full contents of all Python files (careful on big repos)
 
 
+# Files above this size are listed but not read, even at the FULL level
+DEFAULT_MAX_FILE_BYTES = 1_000_000
+# UTF-8 needs at most 4 bytes per character
+_MAX_BYTES_PER_CHAR = 4
+
+
+def _load_file_heads(
+    repo: GitRepository,
+    paths: List[str],
+    *,
+    max_bytes: Optional[int],
+    max_file_bytes: Optional[int],
+    max_workers: Optional[int] = None,
+    cache: Optional[RepoContextCache] = None,
+    file_keys: Optional[Dict[str, str]] = None,
+) -> List[TextHead | str]:
+    """Read `paths` concurrently, in order; a string explains a skipped file.
+
+    Each file is stat'ed first: oversized files are skipped and the others
+    are read only up to `max_bytes`, so huge generated files are never
+    loaded in full just to be truncated. With a `cache`, unchanged files
+    (same `file_keys` entry) are served from it.
+    """
+
+    def load(path: str) -> TextHead | str:
+        try:
+            size = repo.file_size(path)
+            if max_file_bytes is not None and size > max_file_bytes:
+                return f"Skipped: {size} bytes"
+            head = repo.read_text_head(path, max_bytes)
+        except GitRepositoryError as exc:
+            return f"Unreadable: {exc}"
+        except OSError as exc:
+            return f"Unreadable: {exc.strerror or exc}"
+        if head is None:
+            return "Skipped: binary or not UTF-8"
+        return head
+
+    def cached_load(path: str) -> TextHead | str:
+        assert cache is not None  # nosec - only used with a cache
+        key = (repo.source, path, (file_keys or {}).get(path), max_bytes, max_file_bytes)
+        return cache.file(
+            key,
+            lambda: load(path),
+            lambda head: len(head) if isinstance(head, str) else len(head.text),
+        )
+
+    reader = load if cache is None else cached_load
+    if len(paths) <= 1:
+        return [reader(path) for path in paths]
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="context-io") as pool:
+        return list(pool.map(reader, paths))
+
+
+def _file_keys(repo: GitRepository, paths: List[str]) -> Dict[str, str]:
+    keys: Dict[str, str] = {}
+    for path in paths:
+        try:
+            keys[path] = repo.file_key(path)
+        except (GitRepositoryError, OSError):
+            keys[path] = "unreadable"
+    return keys
+
+
 def build_python_code_context(
     repo: GitRepository,
     *,
     level: CodeContextLevel = CodeContextLevel.FILE_SNIPPETS,
     max_files: int = 20,
     max_chars_per_file: int = 4000,
+    code_index: Optional[CodeIndex] = None,
+    max_file_bytes: Optional[int] = DEFAULT_MAX_FILE_BYTES,
+    max_workers: Optional[int] = None,
+    compression: Optional[ContextCompression] = None,
+    cache: Optional[RepoContextCache] = None,
+    coverage: Optional[CoverageData] = None,
 ) -> str:
     """Build a textual context of Python files for the LLM.
 
     - Filters files to .py
     - Depending on `level`, includes only filenames or also contents.
     - Truncates per-file content to avoid huge prompts.
+    - `OUTLINE` covers every file with the signatures and docstrings from
+      `code_index` (an in-memory index when none is given) instead of source.
+
+    File contents are read by a thread pool (`max_workers`) in a bounded way:
+    snippets only read the head of each file, and files larger than
+    `max_file_bytes`, binary or undecodable files are noted and skipped.
+
+    Contents are compressed before truncation (see `ContextCompression`;
+    enabled by default, `ContextCompression.disabled()` ships files verbatim)
+    and identical files are shown once with the paths of their copies.
+
+    A shared `cache` memoizes the result by repository fingerprint (every
+    file's change key) and settings, and keeps file contents across calls.
+
+    With `coverage` from the existing test suite, every file is read and
+    analysed: a summary of untested functions and branches heads the
+    context, detailed files are ordered by untested statements, fully
+    covered files are left out and fully covered function bodies collapsed
+    (see `coverage_targeting`).
     """
     repo.open()
     all_files = repo.list_files()
@@ -72,41 +220,192 @@ def build_python_code_context(
     if level == CodeContextLevel.NONE or not py_files:
         return ""
 
+    compression = compression or ContextCompression()
+    render = partial(
+        _render_code_context,
+        repo,
+        py_files,
+        level=level,
+        max_files=max_files,
+        max_chars_per_file=max_chars_per_file,
+        code_index=code_index,
+        max_file_bytes=max_file_bytes,
+        max_workers=max_workers,
+        compression=compression,
+        coverage=coverage,
+    )
+    if cache is None:
+        return render()
+
+    file_keys = _file_keys(repo, py_files)
+    identity = f"{repo.source}|{repo.branch or repo.ref or ''}"
+    key = (
+        repo_fingerprint(identity, file_keys.items()),
+        level,
+        max_files,
+        max_chars_per_file,
+        max_file_bytes,
+        compression.model_dump_json(),
+        coverage.fingerprint if coverage is not None else None,
+    )
+    return cache.context(key, partial(render, cache=cache, file_keys=file_keys))
+
+
+def _render_code_context(
+    repo: GitRepository,
+    py_files: List[str],
+    *,
+    level: CodeContextLevel,
+    max_files: int,
+    max_chars_per_file: int,
+    code_index: Optional[CodeIndex],
+    max_file_bytes: Optional[int],
+    max_workers: Optional[int],
+    compression: ContextCompression,
+    coverage: Optional[CoverageData] = None,
+    cache: Optional[RepoContextCache] = None,
+    file_keys: Optional[Dict[str, str]] = None,
+) -> str:
+    """Render the context for `py_files` (see `build_python_code_context`)."""
     lines: List[str] = []
     lines.append("Project code overview (Python only):")
 
-    if level in (CodeContextLevel.FILE_LIST, CodeContextLevel.FILE_SNIPPETS, CodeContextLevel.FULL):
+    if level != CodeContextLevel.NONE:
         lines.append("\nPython files:")
         for path in py_files:
             lines.append(f"- {path}")
 
+    sources: Dict[str, TextHead | str] = {}
+    file_coverage: Dict[str, FileCoverage] = {}
+    if coverage is not None:
+        loaded = _load_file_heads(
+            repo,
+            py_files,
+            max_bytes=None,
+            max_file_bytes=max_file_bytes,
+            max_workers=max_workers,
+            cache=cache,
+            file_keys=file_keys,
+        )
+        sources = dict(zip(py_files, loaded))
+        for path, head in sources.items():
+            if not isinstance(head, str):
+                file_coverage[path] = coverage.analyse(path, head.text)
+        lines.extend(_untested_areas(py_files, file_coverage, max_files))
+
+    if level == CodeContextLevel.OUTLINE:
+        index = code_index or CodeIndex()
+        index.update_repository(repo)
+        lines.append("\nCode outline (signatures and docstrings):")
+        for path in py_files:
+            outline = index.outline(path)
+            if not outline:
+                continue
+            if len(outline) > max_chars_per_file:
+                outline = outline[:max_chars_per_file] + "\n# [Truncated outline...]"
+            lines.append(f"\n# FILE: {path}")
+            lines.append(outline)
+        if code_index is None:
+            index.close()
+
     if level in (CodeContextLevel.FILE_SNIPPETS, CodeContextLevel.FULL):
         lines.append("\nDetailed code context:")
         limit = None if level == CodeContextLevel.FULL else max_files
+        candidates = py_files
+        if coverage is not None:
+            # Most untested code first; fully covered files are left out
+            covered_files = {p for p, cov in file_coverage.items() if cov.fully_covered}
+            candidates = sorted(
+                (p for p in py_files if p not in covered_files),
+                key=lambda p: (
+                    p not in file_coverage,
+                    -len(file_coverage[p].missing_lines) if p in file_coverage else 0,
+                ),
+            )
+        selected = candidates if limit is None else candidates[:limit]
+        snippets = level == CodeContextLevel.FILE_SNIPPETS
 
-        for idx, path in enumerate(py_files):
-            if limit is not None and idx >= limit:
-                lines.append(
-                    f"\n[Truncated: only first {limit} Python files included in detailed context.]"
-                )
-                break
-
-            try:
-                content = repo.get_file_contents(path)
-            except Exception:
+        if coverage is not None:
+            heads = [sources[path] for path in selected]
+        else:
+            heads = _load_file_heads(
+                repo,
+                selected,
+                max_bytes=max_chars_per_file * _MAX_BYTES_PER_CHAR if snippets else None,
+                max_file_bytes=max_file_bytes,
+                max_workers=max_workers,
+                cache=cache,
+                file_keys=file_keys,
+            )
+        strip_docstrings = compression.strip_docstrings and level == CodeContextLevel.FULL
+        contents: List[str] = []
+        for path, head in zip(selected, heads):
+            if isinstance(head, str):
+                contents.append(f"# [{head}]")
                 continue
-
-            if level == CodeContextLevel.FILE_SNIPPETS and len(content) > max_chars_per_file:
+            content = head.text
+            if path in file_coverage:
+                content = focus_uncovered(content, file_coverage[path])
+            if compression.strip_comments or compression.collapse_blank_lines or strip_docstrings:
+                content = compress_python_source(
+                    content,
+                    strip_comments=compression.strip_comments,
+                    collapse_blank_lines=compression.collapse_blank_lines,
+                    strip_docstrings=strip_docstrings,
+                )
+            if snippets and (len(content) > max_chars_per_file or head.truncated):
                 content = content[:max_chars_per_file] + "\n\n# [Truncated content...]"
+            contents.append(content)
+
+        copies: Dict[int, List[int]] = {}
+        if compression.dedupe_files:
+            copies = alias_groups(
+                hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+                for content in contents
+            )
+        duplicates = {idx for group in copies.values() for idx in group}
 
+        for idx, (path, content) in enumerate(zip(selected, contents)):
+            if idx in duplicates:
+                continue
             lines.append("\n" + "=" * 80)
             lines.append(f"# FILE: {path}")
+            if idx in copies:
+                aliases = ", ".join(selected[copy] for copy in copies[idx])
+                lines.append(f"# Identical copies: {aliases}")
             lines.append("=" * 80)
             lines.append(content)
 
+        if limit is not None and len(candidates) > limit:
+            lines.append(
+                f"\n[Truncated: only first {limit} Python files included in detailed context.]"
+            )
+        covered = [p for p in py_files if p in file_coverage and file_coverage[p].fully_covered]
+        if covered:
+            lines.append(
+                "\n[Fully covered by existing tests, not detailed: " + ", ".join(covered) + "]"
+            )
+
     return "\n".join(lines).strip()
 
 
+def _untested_areas(
+    py_files: List[str], file_coverage: Dict[str, FileCoverage], limit: int
+) -> List[str]:
+    """Context section listing what the existing test suite does not exercise."""
+    untested = sorted(
+        (cov for path in py_files if (cov := file_coverage.get(path)) and not cov.fully_covered),
+        key=lambda cov: -len(cov.missing_lines),
+    )
+    if not untested:
+        return ["\nCoverage: the existing test suite executes every statement and branch."]
+    lines = ["\nUntested areas according to the existing test suite (focus new tests here):"]
+    lines.extend(f"- {cov.summary()}" for cov in untested[:limit])
+    if len(untested) > limit:
+        lines.append(f"- ... and {len(untested) - limit} more file(s) with untested code")
+    return lines
+
+
 # ==============================================================================
 # Test specification generator (LLM-based)
 # ==============================================================================
@@ -124,57 +423,267 @@ class TestSpecGenerator:
         code_context_level: CodeContextLevel = CodeContextLevel.FILE_SNIPPETS,
         max_files: int = 20,
         max_chars_per_file: int = 4000,
+        raw_response_dir: Optional[str | Path] = None,
+        prompt_cache_hints: bool = True,
+        dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+        routing: Optional[ModelRoutingPolicy] = None,
+        structured_output: bool = True,
+        max_continuations: int = 2,
+        code_index: Optional[CodeIndex] = None,
+        memory_profiler: Optional[MemoryProfiler] = None,
+        context_compression: Optional[ContextCompression] = None,
+        context_cache: Optional[RepoContextCache] = None,
+        coverage: Optional[CoverageData] = None,
     ) -> None:
         """
         Args:
             send_prompt_fn: function with signature:
                 send_prompt(prompt: str, *, api_key, model, system_prompt, **kwargs) -> str
+                `prompt` may be a list of content parts when cache hints apply, and an
+                `on_response` callback receiving the raw JSON response is passed along.
             model: default LLM model name
             api_key: API key for the LLM backend
             code_context_level: how much code to expose (none, file list, snippets, full)
             max_files: limit the number of Python files included in the context
             max_chars_per_file: truncate large files when using FILE_SNIPPETS
+            raw_response_dir: if set, raw LLM responses are spilled to side files in
+                this directory instead of being kept on the TestSpecification
+            prompt_cache_hints: send `cache_control` hints for models that need them
+                to use the provider prompt cache (see `prompt_cache`)
+            dedup_threshold: Jaccard similarity above which generated test cases
+                are collapsed as near-duplicates (None disables deduplication)
+            routing: per-stage/prompt-size model policy; `model`, when given, is
+                its default. Invalid or empty LLM output is retried once with
+                the policy's escalation model.
+            structured_output: request a JSON-schema `response_format` from
+                models known to support it
+            max_continuations: when an answer is cut off by the output token
+                limit, keep its complete test cases and ask up to this many
+                times for the remaining ones only
+            code_index: persistent symbol index reused by the `OUTLINE`
+                code context level
+            memory_profiler: records memory per stage (context, prompt,
+                request, response parsing, dedup) when set
+            context_compression: how file contents are compressed in the
+                code context (comments, blank lines, duplicates, docstrings)
+            context_cache: session cache shared by generators of a batch run,
+                so specs against the same repository reuse its code context
+            coverage: what the existing test suite executes; the code context
+                then favours untested code and the prompt asks to target it
         """
+        if dedup_threshold is not None:
+            # Checked up front: the deduplicator is only built after the paid LLM call
+            check_dedup_threshold(dedup_threshold)
         self.send_prompt_fn = send_prompt_fn
         self.model = model
         self.api_key = api_key
         self.code_context_level = code_context_level
         self.max_files = max_files
         self.max_chars_per_file = max_chars_per_file
+        self.raw_response_dir = Path(raw_response_dir) if raw_response_dir else None
+        self.prompt_assembler = CacheAwarePromptAssembler(cache_hints=prompt_cache_hints)
+        self.dedup_threshold = dedup_threshold
+        self.routing = (routing or ModelRoutingPolicy()).with_overrides(default_model=model)
+        self.structured_output = structured_output
+        self.max_continuations = max_continuations
+        self.code_index = code_index
+        self.memory_profiler = memory_profiler
+        self.context_compression = context_compression
+        self.context_cache = context_cache
+        self.coverage = coverage
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    def build_code_context(self, repo: Optional[GitRepository]) -> str:
+        """Open `repo` and build the code context for this generator's settings."""
+        if repo is None or self.code_context_level == CodeContextLevel.NONE:
+            return ""
+        return build_python_code_context(
+            repo,
+            level=self.code_context_level,
+            max_files=self.max_files,
+            max_chars_per_file=self.max_chars_per_file,
+            code_index=self.code_index,
+            compression=self.context_compression,
+            cache=self.context_cache,
+            coverage=self.coverage,
+        )
+
     def generate(
         self,
         spec: NormalizedSpec,
         repo: Optional[GitRepository] = None,
+        *,
+        code_context: Optional[str] = None,
     ) -> TestSpecification:
-        """Generate a test specification from a spec + optional code repository."""
-        code_context = ""
-        if repo is not None and self.code_context_level != CodeContextLevel.NONE:
-            code_context = build_python_code_context(
-                repo,
-                level=self.code_context_level,
-                max_files=self.max_files,
-                max_chars_per_file=self.max_chars_per_file,
-            )
+        """Generate a test specification from a spec + optional code repository.
 
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(spec, code_context)
+        A `code_context` built ahead of time (see `build_code_context`) is used
+        as is instead of reading `repo` again.
+        """
+        if code_context is None:
+            with profile_stage(self.memory_profiler, "context"):
+                code_context = self.build_code_context(repo)
 
-        response_text = self.send_prompt_fn(
-            user_prompt,
-            api_key=self.api_key,
-            model=self.model,
-            system_prompt=system_prompt,
-        )
+        with profile_stage(self.memory_profiler, "prompt"):
+            prompt = self._assemble_prompt(spec, code_context)
+        model = self.routing.select(PipelineStage.GENERATE, len(prompt.user_text))
+        stronger = self.routing.escalate(model)
 
-        return self._parse_llm_response(
-            response_text=response_text,
-            spec=spec,
+        try:
+            test_spec = self._request(spec, code_context, model, prompt)
+        except ValueError:
+            if stronger is None:
+                raise
+            test_spec = self._request(spec, code_context, stronger)
+        else:
+            if not test_spec.test_cases and stronger is not None:
+                try:
+                    retry = self._request(spec, code_context, stronger)
+                except ValueError:
+                    retry = None
+                if retry is not None and retry.test_cases:
+                    test_spec = retry
+
+        if self.dedup_threshold is not None:
+            with profile_stage(self.memory_profiler, "dedup"):
+                self._deduplicate(test_spec)
+        return test_spec
+
+    def _request(
+        self,
+        spec: NormalizedSpec,
+        code_context: str,
+        model: Optional[str],
+        prompt: Optional[AssembledPrompt] = None,
+    ) -> TestSpecification:
+        """Send one generation request to `model` and parse the answer.
+
+        A truncated answer keeps its complete test cases and is followed by
+        continuation requests for the remaining ones (see `max_continuations`).
+        If the answer is still cut off after them, `truncated` is set.
+        """
+        if prompt is None or model != self.model:
+            prompt = self._assemble_prompt(spec, code_context, model=model)
+        extra: Dict[str, Any] = {}
+        if self.structured_output and supports_structured_output(model):
+            extra["response_format"] = TEST_SPECIFICATION_RESPONSE_FORMAT
+
+        user_content = prompt.user_content()
+        texts: List[str] = []
+        test_cases: List[TestCase] = []
+        usage: Optional[LLMUsage] = None
+        continuations = 0
+
+        while True:
+            responses: List[Mapping[str, Any]] = []
+            with profile_stage(self.memory_profiler, "request"):
+                response_text = self.send_prompt_fn(
+                    user_content,
+                    api_key=self.api_key,
+                    model=model,
+                    system_prompt=prompt.system_prompt,
+                    on_response=responses.append,
+                    **extra,
+                )
+            texts.append(response_text)
+            if responses:
+                call_usage = LLMUsage.from_response(responses[-1])
+                if call_usage is not None:
+                    usage = call_usage if usage is None else usage + call_usage
+
+            truncated = bool(responses) and finish_reason(responses[-1]) == "length"
+            with profile_stage(self.memory_profiler, "response_parse"):
+                new_cases, complete = self._extract_test_cases(response_text, truncated=truncated)
+                added = self._merge_test_cases(test_cases, new_cases)
+
+            if complete or not added or continuations >= self.max_continuations:
+                break
+            continuations += 1
+            user_content = self._continuation_content(prompt, test_cases)
+
+        test_spec = self._build_test_specification(
+            test_cases, "\n".join(texts), spec=spec, model=model
+        )
+        test_spec.usage = usage
+        test_spec.continuations = continuations
+        test_spec.truncated = not complete
+        return test_spec
+
+    def _extract_test_cases(
+        self, response_text: str, *, truncated: bool
+    ) -> tuple[List[TestCase], bool]:
+        """Return the test cases of an answer and whether the answer was complete.
+
+        Unless the provider reported truncation, the answer is parsed as a
+        whole first. Otherwise, or if that fails, complete cases are salvaged
+        from the cut-off `test_cases` array; an array found without the
+        `test_cases` key only counts if it yields at least one item. Raises
+        ValueError if nothing can be recovered.
+        """
+        if not truncated:
+            try:
+                return self._test_cases_from_json(response_text), True
+            except ValueError as err:
+                parse_error = err
+        else:
+            parse_error = None
+
+        items, closed = salvage_json_array(response_text, "test_cases")
+        if not items and not closed:
+            items, closed = salvage_json_array(response_text)
+            # Without the key, a bare `[]` or bracketed prose is not an answer
+            closed = closed and bool(items)
+        if not items and not closed:
+            if parse_error is not None:
+                raise parse_error
+            test_cases = self._test_cases_from_json(response_text)
+            if not test_cases:
+                raise ValueError(
+                    "LLM answer was cut off before any test case.\n"
+                    f"Raw response:\n{response_text}"
+                )
+            return test_cases, True
+        return self._build_test_cases(items), closed
+
+    def _merge_test_cases(self, test_cases: List[TestCase], new_cases: List[TestCase]) -> int:
+        """Append cases not generated yet (by ID or description); return how many."""
+        seen = {tc.id or tc.description for tc in test_cases}
+        added = 0
+        for test_case in new_cases:
+            key = test_case.id or test_case.description
+            if key in seen:
+                continue
+            seen.add(key)
+            test_cases.append(test_case)
+            added += 1
+        return added
+
+    def _continuation_content(self, prompt: AssembledPrompt, test_cases: List[TestCase]):
+        """The original prompt plus a request for the remaining test cases only."""
+        done = "\n".join(f"- {tc.id or tc.description[:80]}" for tc in test_cases)
+        note = (
+            f"Your previous answer was cut off by the output length limit after "
+            f"{len(test_cases)} complete test cases. They are already recorded:\n"
+            f"{done}\n\n"
+            "Continue with the REMAINING test cases only; do not repeat the ones above "
+            "and use new IDs. Return ONLY a JSON object "
+            '{"test_cases": [...]}, with an empty array if nothing remains.'
         )
+        content = prompt.user_content()
+        if isinstance(content, str):
+            return f"{content}\n\n{note}"
+        # Keep the cached prefix intact and append the note as its own part
+        return [*content, {"type": "text", "text": note}]
+
+    def _deduplicate(self, test_spec: TestSpecification) -> None:
+        """Drop near-duplicate test cases in place, recording what was removed."""
+        deduplicator = TestCaseDeduplicator(threshold=self.dedup_threshold)
+        result = deduplicator.deduplicate(test_spec.test_cases)
+        test_spec.test_cases = [test_spec.test_cases[idx] for idx in result.kept]
+        test_spec.duplicates = result.duplicates
 
     # ------------------------------------------------------------------
     # Prompt construction
@@ -207,6 +716,40 @@ class TestSpecGenerator:
         )
 
     def _build_user_prompt(self, spec: NormalizedSpec, code_context: str) -> str:
+        return self._assemble_prompt(spec, code_context).user_text
+
+    def _assemble_prompt(
+        self,
+        spec: NormalizedSpec,
+        code_context: str,
+        *,
+        model: Optional[str] = None,
+    ) -> AssembledPrompt:
+        """Lay out the prompt for prefix caching: code context first, spec last."""
+        instruction = (
+            "Using the information above, generate a comprehensive list of test cases "
+            "that validate the expected behavior of the system."
+        )
+        if self.coverage is not None and code_context:
+            instruction += (
+                " Existing tests already cover part of the code: prioritize the untested "
+                "functions and branches listed in the code context, and do not repeat "
+                "tests for code marked as covered."
+            )
+        return self.prompt_assembler.assemble(
+            system_prompt=self._build_system_prompt(),
+            stable_blocks=[self._build_code_context_block(code_context)],
+            volatile_blocks=[self._build_spec_block(spec), instruction],
+            model=model or self.model,
+        )
+
+    def _build_code_context_block(self, code_context: str) -> str:
+        if code_context:
+            return "Code context (Python project):\n\n" + code_context
+        return ("No code context provided. "
+                "Design tests only from the specification below.")
+
+    def _build_spec_block(self, spec: NormalizedSpec) -> str:
         parts: List[str] = []
 
         parts.append("Project specification (normalized):")
@@ -238,18 +781,6 @@ class TestSpecGenerator:
         # parts.append("\n\nRaw specification text:\n")
         # parts.append(spec.raw_text)
 
-        if code_context:
-            parts.append("\n\nCode context (Python project):\n")
-            parts.append(code_context)
-        else:
-            parts.append("\n\nNo code context provided. "
-                         "Design tests only from the specification above.")
-
-        parts.append(
-            "\n\nUsing the information above, generate a comprehensive list of test cases "
-            "that validate the expected behavior of the system."
-        )
-
         return "\n".join(parts)
 
     # ------------------------------------------------------------------
@@ -261,22 +792,37 @@ class TestSpecGenerator:
         *,
         response_text: str,
         spec: NormalizedSpec,
+        model: Optional[str] = None,
     ) -> TestSpecification:
-        """Parse the JSON returned by the LLM into a TestSpecification."""
+        """Parse the JSON returned by the LLM into a TestSpecification.
+
+        Code fences and surrounding prose are tolerated (see `extract_json`),
+        as is a bare array of test cases.
+        """
+        test_cases = self._test_cases_from_json(response_text)
+        return self._build_test_specification(test_cases, response_text, spec=spec, model=model)
+
+    def _test_cases_from_json(self, response_text: str) -> List[TestCase]:
         try:
-            data = json.loads(response_text)
-        except json.JSONDecodeError as err:
+            data = extract_json(response_text)
+        except ValueError as err:
             raise ValueError(
                 "LLM returned invalid JSON when generating test specification.\n"
                 f"Raw response:\n{response_text}"
             ) from err
 
-        raw_cases = data.get("test_cases") or []
-        test_cases: List[TestCase] = []
+        if isinstance(data, list):
+            data = {"test_cases": data}
+        if not isinstance(data, dict) or "test_cases" not in data:
+            raise ValueError("LLM JSON must be an object with a 'test_cases' array.")
 
+        raw_cases = data.get("test_cases") or []
         if not isinstance(raw_cases, list):
             raise ValueError("LLM JSON must contain a 'test_cases' array.")
+        return self._build_test_cases(raw_cases)
 
+    def _build_test_cases(self, raw_cases: List[Any]) -> List[TestCase]:
+        test_cases: List[TestCase] = []
         for idx, tc in enumerate(raw_cases):
             if not isinstance(tc, dict):
                 continue
@@ -294,12 +840,30 @@ class TestSpecGenerator:
             except ValidationError:
                 # Skip invalid entries rather than failing the whole generation
                 continue
+        return test_cases
+
+    def _build_test_specification(
+        self,
+        test_cases: List[TestCase],
+        response_text: str,
+        *,
+        spec: NormalizedSpec,
+        model: Optional[str] = None,
+    ) -> TestSpecification:
+        raw_response: Optional[str] = response_text
+        raw_response_ref: Optional[RawTextRef] = None
+        if self.raw_response_dir is not None:
+            raw_response_ref = RawTextRef.spill(
+                response_text, self.raw_response_dir, suffix=".json"
+            )
+            raw_response = None
 
         return TestSpecification(
             spec_source_path=spec.source_path,
             test_cases=test_cases,
-            llm_model=self.model,
-            llm_raw_response=response_text,
+            llm_model=model or self.model,
+            llm_raw_response=raw_response,
+            llm_raw_response_ref=raw_response_ref,
         )
 
 
@@ -308,6 +872,9 @@ class TestSpecGenerator:
 # ==============================================================================
 
 
+DEFAULT_RAW_RESPONSE_DIR = Path(tempfile.gettempdir()) / "llmtestgen-responses"
+
+
 def generate_test_spec_from_paths(
     spec_path: str | Path,
     repo_source: Optional[str],
@@ -320,6 +887,20 @@ def generate_test_spec_from_paths(
     max_chars_per_file: int = 4000,
     use_llm_for_spec: bool = False,
     llm_fallback_for_spec: bool = False,
+    lean: bool = False,
+    raw_response_dir: Optional[str | Path] = None,
+    prompt_cache_hints: bool = True,
+    dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+    routing: Optional[ModelRoutingPolicy] = None,
+    structured_output: bool = True,
+    max_continuations: int = 2,
+    code_index_path: Optional[str | Path] = None,
+    repo_ref: Optional[str] = None,
+    warm_up: Optional[Callable[[], Any]] = None,
+    memory_profiler: Optional[MemoryProfiler] = None,
+    context_compression: Optional[ContextCompression] = None,
+    context_cache: Optional[RepoContextCache] = None,
+    coverage: Optional[CoverageData] = None,
 ) -> TestSpecification:
     """End-to-end helper: parse spec file, optionally open repo, and generate tests.
 
@@ -327,25 +908,44 @@ def generate_test_spec_from_paths(
     - Spec parsing via `parse_spec`
     - Git repository context via `GitRepository`
     - LLM-based test spec generation via `TestSpecGenerator`
-    """
 
-    # 1) Parse the specification into NormalizedSpec
-    parse_result = parse_spec(
-        spec_path,
-        send_prompt_fn=send_prompt_fn,
-        model=model,
-        api_key=api_key,
-        use_llm=use_llm_for_spec,
-        llm_fallback=llm_fallback_for_spec,
-    )
-    spec = parse_result.spec
+    With `lean=True` the spec raw text is kept by reference and the raw LLM
+    response is spilled to `raw_response_dir` (a temp directory by default).
+
+    `routing` picks the model per stage (spec parsing vs. generation) and
+    prompt size; `model` is its default for stages without a route.
 
-    # 2) Optionally open the repository
+    Pass one `context_cache` to every call of a batch run so specs against the
+    same repository share its code context and file contents.
+
+    `coverage` (see `coverage_targeting`) steers the code context and the
+    prompt towards code the existing test suite does not exercise.
+
+    `code_index_path` keeps the symbol index used by the `OUTLINE` context
+    level on disk, so later runs only re-parse changed files.
+
+    With `repo_ref`, the repository is read at that branch/tag/commit from
+    the git object database, without checking anything out.
+
+    Spec parsing (possibly an LLM call), repository open/clone plus code
+    context and indexing, and the optional `warm_up` callable (e.g. provider
+    health checks) are independent, so they run concurrently and are joined
+    before the generation prompt is assembled. With a `memory_profiler` they
+    run one after the other instead, so each stage's allocations are
+    attributed to it.
+    """
+    if lean and raw_response_dir is None:
+        raw_response_dir = DEFAULT_RAW_RESPONSE_DIR
+
+    # 1) Set up the repository and generator (cheap, nothing is opened yet)
     repo: Optional[GitRepository] = None
     if repo_source is not None:
-        repo = GitRepository(repo_source)
+        if repo_ref is not None:
+            repo = GitRepository(repo_source, ref=repo_ref, checkout=False)
+        else:
+            repo = GitRepository(repo_source)
 
-    # 3) Generate test specification
+    code_index = CodeIndex(code_index_path) if code_index_path is not None else None
     generator = TestSpecGenerator(
         send_prompt_fn,
         model=model,
@@ -353,6 +953,58 @@ def generate_test_spec_from_paths(
         code_context_level=code_context_level,
         max_files=max_files,
         max_chars_per_file=max_chars_per_file,
+        raw_response_dir=raw_response_dir,
+        prompt_cache_hints=prompt_cache_hints,
+        dedup_threshold=dedup_threshold,
+        routing=routing,
+        structured_output=structured_output,
+        max_continuations=max_continuations,
+        code_index=code_index,
+        memory_profiler=memory_profiler,
+        context_compression=context_compression,
+        context_cache=context_cache,
+        coverage=coverage,
     )
 
-    return generator.generate(spec, repo)
+    def parse() -> NormalizedSpec:
+        with profile_stage(memory_profiler, "parse"):
+            return parse_spec(
+                spec_path,
+                send_prompt_fn=send_prompt_fn,
+                model=model,
+                api_key=api_key,
+                use_llm=use_llm_for_spec,
+                llm_fallback=llm_fallback_for_spec,
+                lean=lean,
+                routing=routing,
+                structured_output=structured_output,
+            ).spec
+
+    def build_context() -> str:
+        with profile_stage(memory_profiler, "context"):
+            return generator.build_code_context(repo)
+
+    try:
+        if memory_profiler is not None:
+            spec = parse()
+            code_context = build_context()
+            if warm_up is not None:
+                warm_up()
+        else:
+            # 2) Parse the spec, open/clone the repo and build its context, and
+            #    warm up the LLM providers, all at once
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="pipeline") as pool:
+                parse_future = pool.submit(parse)
+                context_future = pool.submit(build_context)
+                warm_up_future = pool.submit(warm_up) if warm_up is not None else None
+
+                spec = parse_future.result()
+                code_context = context_future.result()
+                if warm_up_future is not None:
+                    warm_up_future.result()
+
+        # 3) Generate test specification
+        return generator.generate(spec, repo, code_context=code_context)
+    finally:
+        if code_index is not None:
+            code_index.close()
@@ -0,0 +1,348 @@
+"""Incremental regeneration for `--watch`: redo only the stages an edit affects.
+
+A `WatchSession` keeps the last parsed spec, code context and generated test
+specification. On a batch of file changes it re-parses the spec only if the
+spec file changed, and rebuilds the code context only if a source file
+changed (through a `RepoContextCache`, so only the changed files are read
+again). The LLM is then asked only about what actually differs:
+
+- nothing, when the new spec and context equal the previous ones (for
+  instance an edit to a comment that context compression drops anyway);
+- only the added or edited sections, requirements, acceptance criteria and
+  examples, when just the spec changed. Previous test cases tied (by their
+  `requirement` field) to edited or removed parts are dropped, the others
+  are kept;
+- everything, when the code context or the spec title changed.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from llmtestgen.services.code_index import CodeIndex
+from llmtestgen.services.model_routing import ModelRoutingPolicy
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec, parse_spec
+from llmtestgen.services.test_generation.case_dedup import (
+    DEFAULT_DEDUP_THRESHOLD,
+    TestCaseDeduplicator,
+)
+from llmtestgen.services.test_generation.context_cache import RepoContextCache
+from llmtestgen.services.test_generation.context_compression import ContextCompression
+from llmtestgen.services.test_generation.test_spec_generator import (
+    DEFAULT_RAW_RESPONSE_DIR,
+    CodeContextLevel,
+    TestCase,
+    TestSpecGenerator,
+    TestSpecification,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+# Spec list fields diffed entry by entry
+_LIST_FIELDS = ("requirements", "acceptance_criteria", "examples")
+# Shortest `requirement` reference matched by containment (avoids "a" matching everything)
+_MIN_REFERENCE_CHARS = 3
+
+
+class SpecDelta(BaseModel):
+    """What changed between two parses of the same spec."""
+    title_changed: bool = False
+    changed_sections: List[str] = Field(default_factory=list)   # added or edited
+    removed_sections: List[str] = Field(default_factory=list)
+    added: Dict[str, List[str]] = Field(default_factory=dict)   # list field -> new entries
+    removed: Dict[str, List[str]] = Field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.title_changed
+            or self.changed_sections
+            or self.removed_sections
+            or any(self.added.values())
+            or any(self.removed.values())
+        )
+
+    def stale_references(self, old: NormalizedSpec) -> List[str]:
+        """Texts of the parts whose previous test cases are out of date."""
+        refs = list(self.changed_sections) + list(self.removed_sections)
+        refs += [old.sections[name] for name in self.changed_sections if name in old.sections]
+        refs += [old.sections[name] for name in self.removed_sections]
+        for entries in self.removed.values():
+            refs += entries
+        return refs
+
+
+def spec_delta(old: NormalizedSpec, new: NormalizedSpec) -> SpecDelta:
+    """Compare two parses of a spec section by section and entry by entry."""
+    delta = SpecDelta(
+        title_changed=old.title != new.title,
+        changed_sections=[
+            name for name, content in new.sections.items() if old.sections.get(name) != content
+        ],
+        removed_sections=[name for name in old.sections if name not in new.sections],
+    )
+    for field in _LIST_FIELDS:
+        before, after = getattr(old, field), getattr(new, field)
+        delta.added[field] = [entry for entry in after if entry not in set(before)]
+        delta.removed[field] = [entry for entry in before if entry not in set(after)]
+    return delta
+
+
+def partial_spec(spec: NormalizedSpec, delta: SpecDelta) -> NormalizedSpec:
+    """`spec` restricted to the parts `delta` added or edited."""
+    return NormalizedSpec(
+        title=spec.title,
+        sections={name: spec.sections[name] for name in delta.changed_sections},
+        requirements=delta.added.get("requirements", []),
+        acceptance_criteria=delta.added.get("acceptance_criteria", []),
+        examples=delta.added.get("examples", []),
+        source_path=spec.source_path,
+        confidence=spec.confidence,
+    )
+
+
+def _refers_to(test_case: TestCase, references: Iterable[str]) -> bool:
+    """True if the case's `requirement` names or quotes one of `references`."""
+    ref = (test_case.requirement or "").strip().lower()
+    if not ref:
+        return False
+    for text in references:
+        text = text.strip().lower()
+        if not text:
+            continue
+        if ref == text:
+            return True
+        if len(ref) >= _MIN_REFERENCE_CHARS and ref in text:
+            return True
+        if len(text) >= _MIN_REFERENCE_CHARS and text in ref:
+            return True
+    return False
+
+
+class WatchRun(BaseModel):
+    """Outcome of one `WatchSession.refresh`."""
+    test_spec: TestSpecification
+    reparsed: bool = False
+    context_rebuilt: bool = False
+    regenerated: str = "all"          # "all", "partial" or "none"
+    kept_cases: int = 0               # previous test cases carried over
+    new_cases: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        stages = [
+            name
+            for name, ran in (("spec re-parsed", self.reparsed), ("context rebuilt", self.context_rebuilt))
+            if ran
+        ]
+        if self.regenerated == "none":
+            stages.append("no regeneration needed")
+        elif self.regenerated == "partial":
+            stages.append(f"{self.new_cases} case(s) regenerated, {self.kept_cases} kept")
+        else:
+            stages.append(f"{self.new_cases} case(s) generated")
+        return f"{', '.join(stages)} in {self.seconds:.1f}s"
+
+
+class WatchSession:
+    """Keep pipeline state between refreshes of a watched spec and repository."""
+
+    def __init__(
+        self,
+        spec_path: str | Path,
+        generator: TestSpecGenerator,
+        parse_fn: Callable[[], NormalizedSpec],
+        repo: Optional[GitRepository] = None,
+    ) -> None:
+        """
+        Args:
+            spec_path: the watched spec file
+            generator: generates the tests; it is given a `RepoContextCache`
+                if it has none, so rebuilding the context only re-reads
+                changed files
+            parse_fn: parses `spec_path`
+            repo: the repository the code context is built from
+        """
+        self.spec_path = Path(spec_path).resolve()
+        self.generator = generator
+        if generator.context_cache is None:
+            generator.context_cache = RepoContextCache()
+        self.parse_fn = parse_fn
+        self.repo = repo
+        self.spec: Optional[NormalizedSpec] = None
+        self.code_context: Optional[str] = None
+        self.test_spec: Optional[TestSpecification] = None
+
+    @classmethod
+    def from_paths(
+        cls,
+        spec_path: str | Path,
+        repo_source: Optional[str],
+        *,
+        send_prompt_fn,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        code_context_level: CodeContextLevel = CodeContextLevel.FILE_SNIPPETS,
+        max_files: int = 20,
+        max_chars_per_file: int = 4000,
+        use_llm_for_spec: bool = False,
+        llm_fallback_for_spec: bool = False,
+        raw_response_dir: Optional[str | Path] = None,
+        prompt_cache_hints: bool = True,
+        dedup_threshold: Optional[float] = DEFAULT_DEDUP_THRESHOLD,
+        routing: Optional[ModelRoutingPolicy] = None,
+        structured_output: bool = True,
+        max_continuations: int = 2,
+        code_index_path: Optional[str | Path] = None,
+        repo_ref: Optional[str] = None,
+        context_compression: Optional[ContextCompression] = None,
+        lean: bool = False,
+    ) -> "WatchSession":
+        """Session with the same options as `generate_test_spec_from_paths`.
+
+        An in-memory code index is used when `code_index_path` is not given,
+        so the `OUTLINE` level also re-parses only changed files.
+        """
+        if lean and raw_response_dir is None:
+            raw_response_dir = DEFAULT_RAW_RESPONSE_DIR
+
+        repo: Optional[GitRepository] = None
+        if repo_source is not None:
+            if repo_ref is not None:
+                repo = GitRepository(repo_source, ref=repo_ref, checkout=False)
+            else:
+                repo = GitRepository(repo_source)
+
+        generator = TestSpecGenerator(
+            send_prompt_fn,
+            model=model,
+            api_key=api_key,
+            code_context_level=code_context_level,
+            max_files=max_files,
+            max_chars_per_file=max_chars_per_file,
+            raw_response_dir=raw_response_dir,
+            prompt_cache_hints=prompt_cache_hints,
+            dedup_threshold=dedup_threshold,
+            routing=routing,
+            structured_output=structured_output,
+            max_continuations=max_continuations,
+            code_index=CodeIndex(code_index_path or ":memory:"),
+            context_compression=context_compression,
+        )
+
+        def parse() -> NormalizedSpec:
+            return parse_spec(
+                spec_path,
+                send_prompt_fn=send_prompt_fn,
+                model=model,
+                api_key=api_key,
+                use_llm=use_llm_for_spec,
+                llm_fallback=llm_fallback_for_spec,
+                routing=routing,
+                structured_output=structured_output,
+                lean=lean,
+            ).spec
+
+        return cls(spec_path, generator, parse, repo)
+
+    @property
+    def repo_root(self) -> Optional[Path]:
+        """Local working tree to watch (None for remote or ref-pinned repositories)."""
+        if self.repo is None or self.repo.reads_objects:
+            return None
+        root = Path(self.repo.source)
+        return root.resolve() if root.is_dir() else None
+
+    def close(self) -> None:
+        if self.generator.code_index is not None:
+            self.generator.code_index.close()
+        if self.repo is not None:
+            self.repo.close()
+
+    def refresh(self, changed: Optional[Set[str]] = None) -> WatchRun:
+        """Bring the tests up to date with the `changed` paths (None: first run).
+
+        A failure (e.g. the spec does not parse mid-edit) leaves the previous
+        state in place, so the next refresh compares against it.
+        """
+        started = time.perf_counter()
+        first = self.test_spec is None
+        spec_changed = first or changed is None or str(self.spec_path) in changed
+        code_changed = first or changed is None or bool(changed - {str(self.spec_path)})
+
+        spec = self.parse_fn() if spec_changed else self.spec
+        code_context = (
+            self.generator.build_code_context(self.repo) if code_changed else self.code_context
+        )
+        assert spec is not None and code_context is not None  # nosec - set on the first run
+
+        run = self._regenerate(spec, code_context)
+        run.reparsed = spec_changed
+        run.context_rebuilt = code_changed
+        self.spec, self.code_context, self.test_spec = spec, code_context, run.test_spec
+        run.seconds = time.perf_counter() - started
+        return run
+
+    def _regenerate(self, spec: NormalizedSpec, code_context: str) -> WatchRun:
+        previous = self.test_spec
+        if previous is None or self.spec is None or code_context != self.code_context:
+            test_spec = self.generator.generate(spec, code_context=code_context)
+            return WatchRun(test_spec=test_spec, new_cases=len(test_spec.test_cases))
+
+        delta = spec_delta(self.spec, spec)
+        if delta.empty:
+            return WatchRun(
+                test_spec=previous, regenerated="none", kept_cases=len(previous.test_cases)
+            )
+        if delta.title_changed:
+            test_spec = self.generator.generate(spec, code_context=code_context)
+            return WatchRun(test_spec=test_spec, new_cases=len(test_spec.test_cases))
+
+        stale = delta.stale_references(self.spec)
+        kept = [tc for tc in previous.test_cases if not _refers_to(tc, stale)]
+        fresh: List[TestCase] = []
+        update = partial_spec(spec, delta)
+        usage = None
+        truncated = False
+        if update.sections or update.requirements or update.acceptance_criteria or update.examples:
+            generated = self.generator.generate(update, code_context=code_context)
+            fresh, usage = generated.test_cases, generated.usage
+            truncated = generated.truncated
+        test_cases = self._merge(kept, fresh)
+        test_spec = previous.model_copy(
+            update={
+                "test_cases": test_cases,
+                "usage": usage,
+                "duplicates": [],
+                "truncated": truncated,
+            }
+        )
+        return WatchRun(
+            test_spec=test_spec,
+            regenerated="partial",
+            kept_cases=len(kept),
+            new_cases=len(test_cases) - len(kept),
+        )
+
+    def _merge(self, kept: List[TestCase], fresh: List[TestCase]) -> List[TestCase]:
+        """Kept cases first, then new ones; colliding IDs renamed, near-duplicates dropped."""
+        ids = {tc.id for tc in kept if tc.id}
+        renamed: List[TestCase] = []
+        for test_case in fresh:
+            if test_case.id and test_case.id in ids:
+                suffix = 2
+                while f"{test_case.id}-{suffix}" in ids:
+                    suffix += 1
+                test_case = test_case.model_copy(update={"id": f"{test_case.id}-{suffix}"})
+            if test_case.id:
+                ids.add(test_case.id)
+            renamed.append(test_case)
+
+        merged = kept + renamed
+        if self.generator.dedup_threshold is None:
+            return merged
+        result = TestCaseDeduplicator(threshold=self.generator.dedup_threshold).deduplicate(merged)
+        return [merged[idx] for idx in result.kept]
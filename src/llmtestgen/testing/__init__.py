@@ -0,0 +1 @@
+"""Offline test doubles (fake LLM server, synthetic corpora) for load and scale testing."""
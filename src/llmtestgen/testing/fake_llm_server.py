@@ -0,0 +1,422 @@
+"""Local OpenAI-compatible stand-in server for offline load and latency testing.
+
+The server answers `POST /v1/chat/completions` (and `/chat/completions`) with
+schema-valid payloads: spec-parser prompts get a `ParsedLLMSpec`-shaped JSON
+object, every other prompt gets a `{"test_cases": [...]}` object. Latency,
+token throughput, error injection and streaming are configurable, and every
+random choice comes from a seeded RNG so runs are reproducible.
+
+Point the wrappers at it through their `base_url` (or the
+`OPENROUTER_BASE_URL` / `OPENAI_BASE_URL` environment variables):
+
+    with FakeLLMServer(FakeLLMConfig(rate_429=0.05, seed=1)) as server:
+        client = OpenRouterClient(api_key="fake", base_url=server.base_url)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Literal, Mapping, Optional
+
+from pydantic import BaseModel, Field
+
+SPEC_PARSER_MARKER = "specification parser"
+
+
+# ==============================================================================
+# Configuration
+# ==============================================================================
+
+
+class LatencyProfile(BaseModel):
+    """Distribution of the delay before the first byte of a response."""
+
+    distribution: Literal["fixed", "uniform", "normal", "lognormal", "exponential"] = "fixed"
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0  # spread for uniform/normal/lognormal
+    min_ms: float = 0.0
+    max_ms: Optional[float] = None
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay, in seconds."""
+        mean = self.mean_ms
+        if self.distribution == "fixed":
+            value = mean
+        elif self.distribution == "uniform":
+            value = rng.uniform(mean - self.stddev_ms, mean + self.stddev_ms)
+        elif self.distribution == "normal":
+            value = rng.gauss(mean, self.stddev_ms)
+        elif self.distribution == "lognormal":
+            value = _lognormal(rng, mean, self.stddev_ms)
+        else:  # exponential
+            value = rng.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+        value = max(self.min_ms, value)
+        if self.max_ms is not None:
+            value = min(self.max_ms, value)
+        return value / 1000.0
+
+
+class FakeLLMConfig(BaseModel):
+    """Behaviour of the fake server."""
+
+    latency: LatencyProfile = Field(default_factory=LatencyProfile)
+    tokens_per_second: float = 0.0  # completion throughput; 0 means instant
+    rate_429: float = 0.0           # probability of answering 429 Too Many Requests
+    rate_5xx: float = 0.0           # probability of answering a random 5xx
+    retry_after_s: int = 1          # Retry-After header sent with 429s
+    test_cases_per_response: int = 5
+    model: str = "fake/llm"
+    seed: Optional[int] = None
+
+
+def _lognormal(rng: random.Random, mean: float, stddev: float) -> float:
+    """Sample a lognormal with the given arithmetic mean and standard deviation."""
+    if mean <= 0:
+        return 0.0
+    if stddev <= 0:
+        return mean
+    sigma2 = math.log(1 + (stddev / mean) ** 2)
+    mu = math.log(mean) - sigma2 / 2
+    return rng.lognormvariate(mu, math.sqrt(sigma2))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+# ==============================================================================
+# Canned responses
+# ==============================================================================
+
+
+def build_test_cases_payload(prompt: str, count: int, rng: random.Random) -> Dict[str, Any]:
+    """Return a `test_cases` object whose cases reference requirements found in `prompt`."""
+    requirements = [
+        line[2:].strip()
+        for line in prompt.splitlines()
+        if line.startswith("- ") and len(line) > 2
+    ] or ["The system behaves as specified."]
+
+    cases: List[Dict[str, Any]] = []
+    for idx in range(count):
+        requirement = requirements[idx % len(requirements)]
+        cases.append(
+            {
+                "id": f"TC-{idx + 1:03d}",
+                "requirement": requirement,
+                "description": f"Verify: {requirement}",
+                "preconditions": ["The service is initialised."],
+                "steps": [
+                    "Prepare input data for the requirement.",
+                    f"Exercise the behaviour (variant {rng.randint(1, 9)}).",
+                ],
+                "expected_result": "The observed behaviour matches the requirement.",
+                "target_code_elements": [],
+            }
+        )
+    return {"test_cases": cases}
+
+
+def build_spec_payload(prompt: str) -> Dict[str, Any]:
+    """Return a `ParsedLLMSpec`-shaped object extracted naively from `prompt`."""
+    lines = [line.strip() for line in prompt.splitlines() if line.strip()]
+    keywords = ("must", "shall", "should")
+    return {
+        "title": None,
+        "sections": {},
+        "requirements": [line for line in lines if any(k in line.lower() for k in keywords)],
+        "acceptance_criteria": [line for line in lines if line.lower().startswith("given")],
+        "examples": [],
+        "confidence": 90,
+    }
+
+
+# ==============================================================================
+# Server
+# ==============================================================================
+
+
+class FakeLLMServer:
+    """Threaded HTTP server speaking the OpenAI chat completions protocol."""
+
+    def __init__(
+        self,
+        config: Optional[FakeLLMConfig] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or FakeLLMConfig()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "ok": 0, "429": 0, "5xx": 0}
+
+        handler = type("_BoundHandler", (_FakeLLMHandler,), {"server_ref": self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLMServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread (used by the CLI entry point)."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *_args: object) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Helpers used by the request handler
+    # ------------------------------------------------------------------
+
+    def random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def draw(self, func, *args):
+        """Call `func(*args, rng=...)` with the shared seeded RNG."""
+        with self._rng_lock:
+            return func(*args, rng=self._rng)
+
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+
+class _FakeLLMHandler(BaseHTTPRequestHandler):
+    server_ref: FakeLLMServer
+
+    def log_message(self, *_args: Any) -> None:  # keep test output quiet
+        pass
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.rstrip("/").endswith("/models"):
+            model = self.server_ref.config.model
+            self._send_json(200, {"object": "list", "data": [{"id": model, "object": "model"}]})
+            return
+        self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        server = self.server_ref
+        config = server.config
+        server.count("requests")
+
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Request body is not valid JSON."}})
+            return
+
+        time.sleep(server.draw(config.latency.sample))
+
+        roll = server.random()
+        if roll < config.rate_429:
+            server.count("429")
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit exceeded (injected).", "code": 429}},
+                headers={"Retry-After": str(config.retry_after_s)},
+            )
+            return
+        if roll < config.rate_429 + config.rate_5xx:
+            server.count("5xx")
+            status = server.draw(lambda rng: rng.choice((500, 502, 503)))
+            self._send_json(status, {"error": {"message": "Upstream failure (injected)."}})
+            return
+
+        system_prompt, user_prompt = _split_messages(payload.get("messages") or [])
+        if SPEC_PARSER_MARKER in system_prompt.lower():
+            body = build_spec_payload(user_prompt)
+        else:
+            body = server.draw(
+                build_test_cases_payload, user_prompt, config.test_cases_per_response
+            )
+        content = json.dumps(body)
+        model = payload.get("model") or config.model
+        usage = {
+            "prompt_tokens": estimate_tokens(system_prompt + user_prompt),
+            "completion_tokens": estimate_tokens(content),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if payload.get("stream"):
+            self._stream(content, model, usage)
+        else:
+            if config.tokens_per_second > 0:
+                time.sleep(usage["completion_tokens"] / config.tokens_per_second)
+            self._send_json(
+                200,
+                {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+        server.count("ok")
+
+    # ------------------------------------------------------------------
+    # Response writers
+    # ------------------------------------------------------------------
+
+    def _send_json(
+        self,
+        status: int,
+        body: Mapping[str, Any],
+        *,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, content: str, model: str, usage: Mapping[str, int]) -> None:
+        """Send `content` as server-sent events, pacing chunks by token throughput."""
+        config = self.server_ref.config
+        chunk_chars = 16  # ~4 tokens per event
+        delay = (chunk_chars / 4) / config.tokens_per_second if config.tokens_per_second else 0.0
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def emit(delta: Mapping[str, Any], finish_reason: Optional[str], **extra: Any) -> None:
+            event = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        emit({"role": "assistant"}, None)
+        for start in range(0, len(content), chunk_chars):
+            if delay:
+                time.sleep(delay)
+            emit({"content": content[start:start + chunk_chars]}, None)
+        emit({}, "stop", usage=dict(usage))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def _split_messages(messages: List[Mapping[str, Any]]) -> tuple[str, str]:
+    """Return (system text, user text), flattening content-part lists."""
+    system: List[str] = []
+    user: List[str] = []
+    for message in messages:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            content = "\n\n".join(
+                str(part.get("text", "")) for part in content if isinstance(part, Mapping)
+            )
+        (system if message.get("role") == "system" else user).append(str(content))
+    return "\n".join(system), "\n".join(user)
+
+
+# ==============================================================================
+# CLI entry point
+# ==============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for `llmtestgen-fake-llm`."""
+    parser = argparse.ArgumentParser(description="Run a local fake OpenAI-compatible LLM server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency-dist",
+        choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+        default="fixed",
+    )
+    parser.add_argument("--latency-mean-ms", type=float, default=0.0)
+    parser.add_argument("--latency-stddev-ms", type=float, default=0.0)
+    parser.add_argument("--latency-max-ms", type=float, default=None)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--cases", type=int, default=5, help="Test cases per response.")
+    parser.add_argument("--seed", type=int, default=None)
+    ns = parser.parse_args(argv)
+
+    config = FakeLLMConfig(
+        latency=LatencyProfile(
+            distribution=ns.latency_dist,
+            mean_ms=ns.latency_mean_ms,
+            stddev_ms=ns.latency_stddev_ms,
+            max_ms=ns.latency_max_ms,
+        ),
+        tokens_per_second=ns.tokens_per_second,
+        rate_429=ns.rate_429,
+        rate_5xx=ns.rate_5xx,
+        test_cases_per_response=ns.cases,
+        seed=ns.seed,
+    )
+    server = FakeLLMServer(config, host=ns.host, port=ns.port)
+    print(f"Fake LLM server listening on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
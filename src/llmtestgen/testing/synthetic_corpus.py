@@ -0,0 +1,518 @@
+"""Deterministic synthetic spec + repository corpora for scale testing.
+
+`generate_corpus()` writes, from a seed:
+
+- `specs/spec.md`, `specs/spec.yaml`, `specs/openapi.yaml` with N requirements
+  and M endpoints,
+- `repo/` a Python project with K modules in nested packages (optionally
+  with vendored duplicate modules and a `.git` history),
+- `responses/` canned LLM answers matching the spec (`test_cases.json` and
+  `spec_parse.json`), usable through `canned_send_prompt()`.
+
+Scale presets are multiples of the `fake_repo/` workload:
+
+    manifest = generate_corpus(tmp_path, scaled_config(100, seed=1))
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+from pydantic import BaseModel, Field
+
+NOUNS = [
+    "task", "user", "order", "invoice", "report", "session", "account", "payment",
+    "project", "comment", "ticket", "product", "shipment", "review", "document",
+    "team", "message", "schedule", "budget", "asset",
+]
+VERBS = ["create", "update", "delete", "list", "get", "archive", "validate", "export"]
+QUALIFIERS = [
+    "with a non-empty name",
+    "only for authenticated users",
+    "within 2 seconds under normal load",
+    "and record an audit entry",
+    "and reject duplicate identifiers",
+    "without losing existing data",
+    "and return a machine-readable error on failure",
+    "using the configured time zone",
+]
+MODALS = ["must", "shall", "should"]
+HTTP_METHODS = ["get", "post", "put", "delete", "patch"]
+
+LICENSE_HEADER = (
+    "# Copyright (c) Example Corp.\n"
+    "# Licensed under the Apache License, Version 2.0 (the \"License\");\n"
+    "# you may not use this file except in compliance with the License.\n"
+)
+
+# Size of the real `fake_repo/` workload the scale factors are relative to.
+BASE_REQUIREMENTS = 10
+BASE_ENDPOINTS = 5
+BASE_MODULES = 3
+
+
+# ==============================================================================
+# Models
+# ==============================================================================
+
+
+class CorpusConfig(BaseModel):
+    """Shape of a synthetic corpus."""
+
+    seed: int = 0
+    requirements: int = BASE_REQUIREMENTS
+    endpoints: int = BASE_ENDPOINTS
+    modules: int = BASE_MODULES
+    max_depth: int = 3               # package nesting depth under the root package
+    duplicate_ratio: float = 0.0     # fraction of modules also copied under vendor/
+    git_history: bool = False
+    commits: int = 3
+    package_name: str = "app"
+
+
+class CorpusManifest(BaseModel):
+    """Paths and expected contents of a generated corpus."""
+
+    root: str
+    spec_markdown: str
+    spec_yaml: str
+    spec_openapi: str
+    repo_path: str
+    modules: List[str] = Field(default_factory=list)
+    requirements: List[str] = Field(default_factory=list)
+    endpoints: List[str] = Field(default_factory=list)
+    responses: Dict[str, str] = Field(default_factory=dict)
+    content_hash: str = ""
+
+
+def scaled_config(factor: int, *, seed: int = 0, **overrides: Any) -> CorpusConfig:
+    """Config for `factor` times the size of the `fake_repo/` workload."""
+    values: Dict[str, Any] = {
+        "seed": seed,
+        "requirements": BASE_REQUIREMENTS * factor,
+        "endpoints": BASE_ENDPOINTS * factor,
+        "modules": BASE_MODULES * factor,
+    }
+    values.update(overrides)
+    return CorpusConfig(**values)
+
+
+SCALE_PRESETS: Dict[str, int] = {"1x": 1, "10x": 10, "100x": 100, "1000x": 1000}
+
+
+# ==============================================================================
+# Generation
+# ==============================================================================
+
+
+def generate_corpus(root: str | Path, config: Optional[CorpusConfig] = None) -> CorpusManifest:
+    """Write a deterministic corpus under `root` and return its manifest."""
+    config = config or CorpusConfig()
+    rng = random.Random(config.seed)
+    root = Path(root)
+    specs_dir = root / "specs"
+    repo_dir = root / "repo"
+    responses_dir = root / "responses"
+    for directory in (specs_dir, repo_dir, responses_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    modules = _write_repo(repo_dir, config, rng)
+    requirements = _make_requirements(config.requirements, modules, rng)
+    endpoints = _make_endpoints(config.endpoints, rng)
+
+    md_path = specs_dir / "spec.md"
+    md_path.write_text(_render_markdown(requirements, endpoints), encoding="utf-8")
+    yaml_path = specs_dir / "spec.yaml"
+    yaml_path.write_text(_render_yaml(requirements), encoding="utf-8")
+    openapi_path = specs_dir / "openapi.yaml"
+    openapi_path.write_text(_render_openapi(endpoints), encoding="utf-8")
+
+    responses = {
+        "test_cases": responses_dir / "test_cases.json",
+        "spec_parse": responses_dir / "spec_parse.json",
+    }
+    responses["test_cases"].write_text(
+        json.dumps(_canned_test_cases(requirements), indent=2), encoding="utf-8"
+    )
+    responses["spec_parse"].write_text(
+        json.dumps(_canned_spec_parse(requirements), indent=2), encoding="utf-8"
+    )
+
+    if config.git_history:
+        _commit_history(repo_dir, config)
+
+    return CorpusManifest(
+        root=str(root),
+        spec_markdown=str(md_path),
+        spec_yaml=str(yaml_path),
+        spec_openapi=str(openapi_path),
+        repo_path=str(repo_dir),
+        modules=[m["path"] for m in modules],
+        requirements=[r["text"] for r in requirements],
+        endpoints=[f"{e['method'].upper()} {e['path']}" for e in endpoints],
+        responses={name: str(path) for name, path in responses.items()},
+        content_hash=corpus_content_hash(root),
+    )
+
+
+def corpus_content_hash(root: str | Path) -> str:
+    """SHA-256 over all corpus files (relative path + bytes), ignoring `.git`."""
+    root = Path(root)
+    digest = hashlib.sha256()
+    for path in sorted(p for p in root.rglob("*") if p.is_file() and ".git" not in p.parts):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def canned_send_prompt(manifest: CorpusManifest) -> Callable[..., str]:
+    """Return a `send_prompt_fn` answering from the corpus' canned responses."""
+    test_cases = Path(manifest.responses["test_cases"]).read_text(encoding="utf-8")
+    spec_parse = Path(manifest.responses["spec_parse"]).read_text(encoding="utf-8")
+
+    def _send(prompt: Any, *, system_prompt: Optional[str] = None, **_kwargs: Any) -> str:
+        if system_prompt and "specification parser" in system_prompt.lower():
+            return spec_parse
+        return test_cases
+
+    return _send
+
+
+# ==============================================================================
+# Repository
+# ==============================================================================
+
+
+def _write_repo(repo_dir: Path, config: CorpusConfig, rng: random.Random) -> List[Dict[str, Any]]:
+    package_root = repo_dir / "src" / config.package_name
+    package_root.mkdir(parents=True, exist_ok=True)
+    (package_root / "__init__.py").write_text(
+        f'"""{config.package_name} package."""\n', encoding="utf-8"
+    )
+
+    modules: List[Dict[str, Any]] = []
+    for idx in range(config.modules):
+        noun = NOUNS[idx % len(NOUNS)]
+        depth = rng.randint(0, config.max_depth)
+        parts = [f"{NOUNS[(idx + level) % len(NOUNS)]}s" for level in range(depth)]
+        package_dir = package_root.joinpath(*parts)
+        _ensure_packages(package_root, parts)
+
+        name = f"{noun}_{idx}"
+        file_path = package_dir / f"{name}.py"
+        dotted = ".".join([config.package_name, *parts, name])
+        class_name = f"{noun.capitalize()}{idx}Service"
+        methods = rng.sample(VERBS, k=rng.randint(2, len(VERBS)))
+        imports = [modules[rng.randrange(len(modules))]["dotted"]] if modules else []
+
+        file_path.write_text(
+            _render_module(dotted, class_name, noun, methods, imports, rng), encoding="utf-8"
+        )
+        modules.append(
+            {
+                "path": file_path.relative_to(repo_dir).as_posix(),
+                "dotted": dotted,
+                "class_name": class_name,
+                "noun": noun,
+                "methods": methods,
+            }
+        )
+
+    vendor_count = int(config.modules * config.duplicate_ratio)
+    if vendor_count:
+        vendor_dir = repo_dir / "vendor"
+        vendor_dir.mkdir(exist_ok=True)
+        for module in modules[:vendor_count]:
+            source = repo_dir / module["path"]
+            (vendor_dir / source.name).write_text(source.read_text(encoding="utf-8"), encoding="utf-8")
+
+    (repo_dir / "README.md").write_text(
+        f"# {config.package_name}\n\nSynthetic project with {config.modules} modules.\n",
+        encoding="utf-8",
+    )
+    return modules
+
+
+def _ensure_packages(package_root: Path, parts: List[str]) -> None:
+    current = package_root
+    for part in parts:
+        current = current / part
+        current.mkdir(exist_ok=True)
+        init = current / "__init__.py"
+        if not init.exists():
+            init.write_text("", encoding="utf-8")
+
+
+def _render_module(
+    dotted: str,
+    class_name: str,
+    noun: str,
+    methods: List[str],
+    imports: List[str],
+    rng: random.Random,
+) -> str:
+    lines = [LICENSE_HEADER, f'"""{dotted}: {noun} management."""', ""]
+    lines += ["from __future__ import annotations", "", "from typing import Dict, List, Optional"]
+    for module in imports:
+        lines.append(f"import {module}  # noqa: F401")
+    lines += ["", "", f"class {class_name}:", f'    """In-memory service managing {noun}s."""', ""]
+    lines += [
+        "    def __init__(self) -> None:",
+        f"        self._{noun}s: Dict[int, dict] = {{}}",
+        "        self._next_id = 1",
+    ]
+    for verb in methods:
+        lines.append("")
+        lines += _render_method(noun, verb, rng)
+    lines += [
+        "",
+        "",
+        f"def count_{noun}s(service: {class_name}) -> int:",
+        f'    """Return how many {noun}s the service holds."""',
+        f"    return len(service._{noun}s)",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _render_method(noun: str, verb: str, rng: random.Random) -> List[str]:
+    store = f"self._{noun}s"
+    if verb == "create":
+        return [
+            "    def create(self, name: str) -> dict:",
+            f'        """Create a {noun} with a non-empty name."""',
+            "        if not name or not name.strip():",
+            f'            raise ValueError("{noun} name must not be empty")',
+            "        item = {'id': self._next_id, 'name': name.strip()}",
+            f"        {store}[self._next_id] = item",
+            "        self._next_id += 1",
+            "        return item",
+        ]
+    if verb == "list":
+        return [
+            "    def list(self) -> List[dict]:",
+            f'        """Return all {noun}s."""',
+            f"        return list({store}.values())",
+        ]
+    if verb == "get":
+        return [
+            "    def get(self, item_id: int) -> dict:",
+            f'        """Return a {noun} or raise KeyError."""',
+            f"        return {store}[item_id]",
+        ]
+    if verb == "delete":
+        return [
+            "    def delete(self, item_id: int) -> None:",
+            f'        """Delete a {noun}; raise KeyError if missing."""',
+            f"        del {store}[item_id]",
+        ]
+    limit = rng.randint(1, 100)
+    return [
+        f"    def {verb}(self, item_id: int, note: Optional[str] = None) -> dict:",
+        f'        """{verb.capitalize()} a {noun}."""',
+        f"        item = {store}[item_id]",
+        "        # keep the note short",
+        f"        item['{verb}'] = (note or '')[:{limit}]",
+        "        return item",
+    ]
+
+
+def _commit_history(repo_dir: Path, config: CorpusConfig) -> None:
+    from git import Actor, Repo
+
+    repo = Repo.init(repo_dir)
+    actor = Actor("Synthetic Author", "synthetic@example.com")
+    files = sorted(p.relative_to(repo_dir).as_posix() for p in repo_dir.rglob("*")
+                   if p.is_file() and ".git" not in p.parts)
+    commits = max(1, min(config.commits, len(files)))
+    chunk = -(-len(files) // commits)  # ceil division
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    for idx in range(commits):
+        batch = files[idx * chunk:(idx + 1) * chunk]
+        if not batch:
+            break
+        repo.index.add(batch)
+        date = f"{int((start + timedelta(days=idx)).timestamp())} +0000"  # git raw format
+        repo.index.commit(
+            f"Synthetic commit {idx + 1}",
+            author=actor,
+            committer=actor,
+            author_date=date,
+            commit_date=date,
+        )
+
+
+# ==============================================================================
+# Specs
+# ==============================================================================
+
+
+def _make_requirements(
+    count: int, modules: List[Dict[str, Any]], rng: random.Random
+) -> List[Dict[str, Any]]:
+    requirements = []
+    for idx in range(count):
+        module = modules[idx % len(modules)] if modules else None
+        noun = module["noun"] if module else NOUNS[idx % len(NOUNS)]
+        verb = rng.choice(module["methods"]) if module else rng.choice(VERBS)
+        text = (
+            f"REQ-{idx + 1:04d}: The system {rng.choice(MODALS)} {verb} a {noun} "
+            f"{rng.choice(QUALIFIERS)}."
+        )
+        target = f"{module['path']}::{module['class_name']}.{verb}" if module else None
+        requirements.append({"id": f"REQ-{idx + 1:04d}", "text": text, "noun": noun,
+                             "verb": verb, "target": target})
+    return requirements
+
+
+def _make_endpoints(count: int, rng: random.Random) -> List[Dict[str, str]]:
+    endpoints = []
+    for idx in range(count):
+        noun = NOUNS[idx % len(NOUNS)]
+        suffix = "" if idx < len(NOUNS) else f"/v{idx // len(NOUNS) + 1}"
+        path = f"/{noun}s{suffix}/{{id}}" if rng.random() < 0.5 else f"/{noun}s{suffix}"
+        endpoints.append({"path": path, "method": rng.choice(HTTP_METHODS), "noun": noun,
+                          "operation_id": f"{noun}_op_{idx}"})
+    return endpoints
+
+
+def _render_markdown(requirements: List[Dict[str, Any]], endpoints: List[Dict[str, str]]) -> str:
+    lines = ["# Synthetic Service Specification", "", "## Overview", "",
+             "The service manages several resources and must expose them over HTTP.", ""]
+    by_noun: Dict[str, List[Dict[str, Any]]] = {}
+    for req in requirements:
+        by_noun.setdefault(req["noun"], []).append(req)
+
+    lines += ["## Functional Requirements", ""]
+    for noun, reqs in by_noun.items():
+        lines += [f"### {noun.capitalize()} management", ""]
+        lines += [f"- {req['text']}" for req in reqs]
+        lines.append("")
+
+    lines += ["## Acceptance Criteria", ""]
+    for req in requirements:
+        lines.append(
+            f"- Given a valid {req['noun']}, when the client calls {req['verb']}, "
+            f"then {req['id']} is satisfied."
+        )
+    lines += ["", "## Endpoints", ""]
+    lines += [f"1. {e['method'].upper()} {e['path']}" for e in endpoints]
+    lines += ["", "## Examples", "", "- Example: create a task named `write docs`.", ""]
+    return "\n".join(lines)
+
+
+def _render_yaml(requirements: List[Dict[str, Any]]) -> str:
+    data = {
+        "title": "Synthetic Service Specification",
+        "requirements": [req["text"] for req in requirements],
+        "acceptance_criteria": [
+            f"Given a {req['noun']}, when {req['verb']} is called, then {req['id']} holds."
+            for req in requirements
+        ],
+        "examples": ["Example: list all tasks."],
+    }
+    return yaml.safe_dump(data, sort_keys=False)
+
+
+def _render_openapi(endpoints: List[Dict[str, str]]) -> str:
+    paths: Dict[str, Dict[str, Any]] = {}
+    for endpoint in endpoints:
+        paths.setdefault(endpoint["path"], {})[endpoint["method"]] = {
+            "operationId": endpoint["operation_id"],
+            "summary": f"{endpoint['method'].upper()} {endpoint['noun']}",
+            "description": f"The endpoint must return 404 when the {endpoint['noun']} is missing.",
+            "responses": {"200": {"description": "OK"}, "404": {"description": "Not found"}},
+        }
+    data = {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "paths": paths,
+    }
+    return yaml.safe_dump(data, sort_keys=False)
+
+
+# ==============================================================================
+# Canned LLM responses
+# ==============================================================================
+
+
+def _canned_test_cases(requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "test_cases": [
+            {
+                "id": f"TC-{idx + 1:04d}",
+                "requirement": req["text"],
+                "description": f"{req['verb'].capitalize()} a {req['noun']} ({req['id']})",
+                "preconditions": [f"A {req['noun']} service is initialised."],
+                "steps": [
+                    f"Prepare a valid {req['noun']}.",
+                    f"Call {req['verb']} on the service.",
+                ],
+                "expected_result": f"{req['id']} is satisfied.",
+                "target_code_elements": [req["target"]] if req["target"] else [],
+            }
+            for idx, req in enumerate(requirements)
+        ]
+    }
+
+
+def _canned_spec_parse(requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "title": "Synthetic Service Specification",
+        "sections": {},
+        "requirements": [req["text"] for req in requirements],
+        "acceptance_criteria": [],
+        "examples": [],
+        "confidence": 95,
+    }
+
+
+# ==============================================================================
+# CLI entry point
+# ==============================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point for `llmtestgen-corpus`."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic spec + repo corpus.")
+    parser.add_argument("output_dir", metavar="output-dir")
+    parser.add_argument("--scale", choices=list(SCALE_PRESETS), default="1x")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requirements", type=int, default=None)
+    parser.add_argument("--endpoints", type=int, default=None)
+    parser.add_argument("--modules", type=int, default=None)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0)
+    parser.add_argument("--git", action="store_true", help="Create a .git history in repo/.")
+    ns = parser.parse_args(argv)
+
+    overrides = {
+        key: value
+        for key, value in {
+            "requirements": ns.requirements,
+            "endpoints": ns.endpoints,
+            "modules": ns.modules,
+        }.items()
+        if value is not None
+    }
+    config = scaled_config(
+        SCALE_PRESETS[ns.scale],
+        seed=ns.seed,
+        duplicate_ratio=ns.duplicate_ratio,
+        git_history=ns.git,
+        **overrides,
+    )
+    manifest = generate_corpus(ns.output_dir, config)
+    print(json.dumps(manifest.model_dump(exclude={"modules", "requirements", "endpoints"}), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,15 @@ from __future__ import annotations
 
 import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from git import Repo
-from git.exc import GitCommandError, InvalidGitRepositoryError, NoSuchPathError
+from git.exc import BadName, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
+from git.objects import Blob, Tree
+
+from llmtestgen.core.utils_files import TextHead, decode_text_head, read_text_head
 
 
 class GitRepositoryError(RuntimeError):
@@ -15,7 +19,13 @@ class GitRepositoryError(RuntimeError):
 
 
 class GitRepository:
-    """Wrapper that opens a repo (local or remote) and exposes file helpers."""
+    """Wrapper that opens a repo (local or remote) and exposes file helpers.
+
+    By default a requested branch/ref is checked out in the working tree.
+    With `checkout=False` the ref is resolved to a tree and files are served
+    straight from the git object database instead: the working tree is never
+    touched, and several refs of one repository can be read concurrently.
+    """
 
     def __init__(
         self,
@@ -23,6 +33,7 @@ class GitRepository:
         *,
         branch: Optional[str] = None,
         ref: Optional[str] = None,
+        checkout: bool = True,
     ) -> None:
         if Repo is None:
             raise GitRepositoryError(
@@ -34,10 +45,15 @@ class GitRepository:
         self.source = source
         self.branch = branch
         self.ref = ref
+        self.checkout = checkout
 
         self._tempdir: Optional[Path] = None
         self._repo: Optional[Repo] = None
         self._path: Optional[Path] = None
+        self._tree: Optional[Tree] = None
+        self._blobs: Optional[Dict[str, Blob]] = None  # path -> blob of `_tree`
+        # GitPython's object database talks to one `git cat-file` process
+        self._object_lock = threading.Lock()
 
     @property
     def path(self) -> Path:
@@ -51,11 +67,18 @@ class GitRepository:
             raise GitRepositoryError("Repository not initialized. Call open() first.")
         return self._repo
 
+    @property
+    def reads_objects(self) -> bool:
+        """True when files are served from the object database, not the working tree."""
+        return self._tree is not None
+
     def open(self) -> Optional[Repo]:
         """Open or clone the repository and checkout the requested ref.
 
         This supports both Git repositories and plain directories so the helpers can
-        operate on simple file trees without requiring `git init`.
+        operate on simple file trees without requiring `git init`. Without
+        `checkout`, git sources are read from the tree of the ref (HEAD by
+        default) and remote clones skip the checkout entirely.
         """
 
         if self._repo is not None or self._path is not None:
@@ -73,7 +96,7 @@ class GitRepository:
             else:
                 tempdir = Path(tempfile.mkdtemp(prefix="llmtestgen-repo-"))
                 self._tempdir = tempdir
-                self._repo = Repo.clone_from(self.source, tempdir)
+                self._repo = Repo.clone_from(self.source, tempdir, no_checkout=not self.checkout)
                 self._path = tempdir
         except (GitCommandError, NoSuchPathError) as exc:
             raise GitRepositoryError(f"Unable to open repository '{self.source}': {exc}") from exc
@@ -85,6 +108,10 @@ class GitRepository:
                 )
             return None
 
+        if not self.checkout:
+            self._tree = self._resolve_tree(self.branch or self.ref or "HEAD")
+            return self.repo
+
         try:
             if self.branch:
                 self.repo.git.checkout(self.branch)
@@ -98,6 +125,16 @@ class GitRepository:
 
         return self.repo
 
+    def _resolve_tree(self, rev: str) -> Tree:
+        # A fresh clone only has the default branch locally
+        for candidate in (rev, f"origin/{rev}"):
+            try:
+                return self.repo.commit(candidate).tree
+            except (BadName, ValueError, GitCommandError):
+                continue
+        self.close()
+        raise GitRepositoryError(f"Unable to resolve ref '{rev}' in '{self.source}'.")
+
     def close(self) -> None:
         """Clean up any temporary clone created for this repository."""
 
@@ -105,7 +142,11 @@ class GitRepository:
             shutil.rmtree(self._tempdir, ignore_errors=True)
         self._tempdir = None
         self._path = None
+        if self._repo is not None:
+            self._repo.close()
         self._repo = None
+        self._tree = None
+        self._blobs = None
 
     def __enter__(self) -> "GitRepository":
         self.open()
@@ -114,19 +155,90 @@ class GitRepository:
     def __exit__(self, *_args: object) -> None:
         self.close()
 
-    def get_file_contents(self, file_path: str, encoding: str = "utf-8") -> str:
-        """Return the content of `file_path` from the repository."""
+    def _blob_index(self) -> Dict[str, Blob]:
+        """Every blob of the tree by path, walked once under the object lock.
 
-        self.open()
+        Looking up nested paths reads child trees through the shared `git
+        cat-file` process, so doing it per file from worker threads deadlocks.
+        """
+        assert self._tree is not None  # nosec - only called in object mode
+        with self._object_lock:
+            if self._blobs is None:
+                self._blobs = {
+                    item.path: item for item in self._tree.traverse() if isinstance(item, Blob)
+                }
+            return self._blobs
+
+    def _blob(self, file_path: str) -> Blob:
+        item = self._blob_index().get(file_path.replace("\\", "/"))
+        if item is None:
+            raise GitRepositoryError(
+                f"File '{file_path}' not found at '{self.branch or self.ref or 'HEAD'}' "
+                f"in repository '{self.source}'."
+            )
+        return item
+
+    def _worktree_file(self, file_path: str) -> Path:
         target = self.path / file_path
         if not target.is_file():
             raise GitRepositoryError(f"File '{file_path}' not found in repository '{self.path}'.")
-        return target.read_text(encoding=encoding)
+        return target
+
+    def read_bytes(self, file_path: str) -> bytes:
+        """Return the raw content of `file_path` from the repository."""
+
+        self.open()
+        if self._tree is None:
+            return self._worktree_file(file_path).read_bytes()
+        blob = self._blob(file_path)
+        with self._object_lock:
+            return blob.data_stream.read()
+
+    def file_size(self, file_path: str) -> int:
+        """Size of `file_path` in bytes, without reading it."""
+
+        self.open()
+        if self._tree is None:
+            return self._worktree_file(file_path).stat().st_size
+        blob = self._blob(file_path)
+        with self._object_lock:
+            return blob.size
+
+    def file_key(self, file_path: str) -> str:
+        """Cheap change key for `file_path`: its blob SHA, or mtime and size on disk."""
+
+        self.open()
+        if self._tree is None:
+            stat = self._worktree_file(file_path).stat()
+            return f"{stat.st_mtime_ns}:{stat.st_size}"
+        return self._blob(file_path).hexsha
+
+    def read_text_head(
+        self, file_path: str, max_bytes: Optional[int] = None, encoding: str = "utf-8"
+    ) -> Optional[TextHead]:
+        """Read at most `max_bytes` of a text file; None if binary or undecodable."""
+
+        self.open()
+        if self._tree is None:
+            return read_text_head(self._worktree_file(file_path), max_bytes, encoding=encoding)
+        data = self.read_bytes(file_path)
+        head = data if max_bytes is None else data[:max_bytes]
+        return decode_text_head(head, len(data), encoding=encoding)
+
+    def get_file_contents(self, file_path: str, encoding: str = "utf-8") -> str:
+        """Return the content of `file_path` from the repository."""
+
+        self.open()
+        if self._tree is None:
+            return self._worktree_file(file_path).read_text(encoding=encoding)
+        return self.read_bytes(file_path).decode(encoding)
 
     def list_files(self) -> list[str]:
-        """Return relative paths to all files tracked in the working tree."""
+        """Return relative paths to all files tracked in the working tree (or ref)."""
 
         self.open()
+        if self._tree is not None:
+            return list(self._blob_index())
         files: list[str] = []
         for path in self.path.rglob("*"):
             if path.is_file():
@@ -141,10 +253,11 @@ def get_file_from_repo(
     branch: Optional[str] = None,
     ref: Optional[str] = None,
     encoding: str = "utf-8",
+    checkout: bool = True,
 ) -> str:
     """Convenience helper to fetch file content from a repo in a single call."""
 
-    with GitRepository(repo_source, branch=branch, ref=ref) as repo:
+    with GitRepository(repo_source, branch=branch, ref=ref, checkout=checkout) as repo:
         return repo.get_file_contents(file_path, encoding=encoding)
 
 
@@ -153,8 +266,9 @@ def list_repo_files(
     *,
     branch: Optional[str] = None,
     ref: Optional[str] = None,
+    checkout: bool = True,
 ) -> list[str]:
     """Convenience helper to list files for a repository without manual class usage."""
 
-    with GitRepository(repo_source, branch=branch, ref=ref) as repo:
+    with GitRepository(repo_source, branch=branch, ref=ref, checkout=checkout) as repo:
         return repo.list_files()
@@ -0,0 +1,238 @@
+"""Hedged LLM requests for tail-latency control.
+
+A `HedgedSender` behaves like a `send_prompt` function. It sends the request
+to a primary backend; if no valid answer arrived after a hedge delay (a
+percentile of the primary's observed latency), it fires the same request at
+the next backend and returns whichever valid answer comes first. Losing
+requests are abandoned: they run to completion on daemon threads so they
+never block the caller or interpreter exit, and their latency is still
+recorded.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Sequence
+
+from pydantic import BaseModel
+
+from llmtestgen.wrappers.llm_backend import LLMBackend
+
+
+# ==============================================================================
+# Latency tracking
+# ==============================================================================
+
+
+class LatencyStats(BaseModel):
+    """Summary of recent request latencies for one backend, in seconds."""
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    errors: int = 0
+
+
+class LatencyTracker:
+    """Thread-safe sliding window of request latencies per backend."""
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, *, ok: bool = True) -> None:
+        """Record one call; only successful calls enter the latency window."""
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+            if ok:
+                samples.append(seconds)
+            else:
+                # Fast failures (or timeouts) would skew the hedge delay
+                self._errors[name] = self._errors.get(name, 0) + 1
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return len(self._samples.get(name, ()))
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """Nearest-rank percentile (`q` in 0..1) of recent latencies, None if no data."""
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))
+        return samples[rank]
+
+    def stats(self) -> Dict[str, LatencyStats]:
+        with self._lock:
+            names = list(self._samples)
+            errors = dict(self._errors)
+        return {
+            name: LatencyStats(
+                count=self.count(name),
+                p50=self.percentile(name, 0.50) or 0.0,
+                p95=self.percentile(name, 0.95) or 0.0,
+                p99=self.percentile(name, 0.99) or 0.0,
+                errors=errors.get(name, 0),
+            )
+            for name in names
+        }
+
+
+# ==============================================================================
+# Hedged sender
+# ==============================================================================
+
+
+class _Attempt:
+    def __init__(self, backend: LLMBackend) -> None:
+        self.backend = backend
+        self.future: Future = Future()
+        self.responses: List[Mapping[str, Any]] = []
+
+
+class HedgedSender:
+    """`send_prompt`-compatible callable that hedges slow requests across backends."""
+
+    def __init__(
+        self,
+        primary: LLMBackend,
+        hedges: Sequence[LLMBackend],
+        *,
+        hedge_percentile: float = 0.95,
+        initial_delay: float = 10.0,
+        min_delay: float = 0.5,
+        max_delay: float = 60.0,
+        min_samples: int = 10,
+        tracker: Optional[LatencyTracker] = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        """
+        Args:
+            primary: backend every request goes to first
+            hedges: backends tried in order, one per elapsed hedge delay; they
+                use their own model and key (provider defaults when unset)
+            hedge_percentile: latency percentile (0..1) of the primary after
+                which a hedge is fired
+            initial_delay: hedge delay used until `min_samples` latencies are known
+            min_delay, max_delay: bounds for the adaptive delay
+            tracker: shared latency tracker (a private one by default)
+            validate: predicate on the answer text; invalid answers count as
+                failures (default: non-empty text)
+        """
+        if not 0.0 < hedge_percentile < 1.0:
+            raise ValueError("hedge_percentile must be in (0, 1).")
+        self.primary = primary
+        self.hedges = list(hedges)
+        self.hedge_percentile = hedge_percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.tracker = tracker or LatencyTracker()
+        self.validate = validate or (lambda text: bool(text and text.strip()))
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def hedge_delay(self) -> float:
+        """Current hedge delay, tuned from the primary's observed latency."""
+        if self.tracker.count(self.primary.name) < self.min_samples:
+            return self.initial_delay
+        observed = self.tracker.percentile(self.primary.name, self.hedge_percentile)
+        return min(self.max_delay, max(self.min_delay, observed or self.initial_delay))
+
+    def _start(
+        self,
+        backend: LLMBackend,
+        prompt: Any,
+        model: Optional[str],
+        api_key: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> _Attempt:
+        attempt = _Attempt(backend)
+        if backend is not self.primary:
+            # The caller's model/key belong to the primary's provider
+            model = api_key = None
+
+        def run() -> None:
+            started = time.perf_counter()
+            try:
+                text = backend.send(
+                    prompt,
+                    api_key=api_key,
+                    model=model,
+                    on_response=attempt.responses.append,
+                    **kwargs,
+                )
+                if not self.validate(text):
+                    raise ValueError(f"Invalid answer from {backend.name}.")
+            except BaseException as exc:  # delivered to the caller via the future
+                self.tracker.record(backend.name, time.perf_counter() - started, ok=False)
+                attempt.future.set_exception(exc)
+            else:
+                self.tracker.record(backend.name, time.perf_counter() - started)
+                attempt.future.set_result(text)
+
+        # Daemon threads: an abandoned request never blocks the caller or exit
+        threading.Thread(target=run, name=f"hedge-{backend.name}", daemon=True).start()
+        return attempt
+
+    def __call__(
+        self,
+        prompt: Any,
+        *,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        on_response: Optional[Callable[[Mapping[str, Any]], None]] = None,
+        **kwargs: Any,
+    ) -> str:
+        pending_backends = list(self.hedges)
+        attempts = [self._start(self.primary, prompt, model, api_key, kwargs)]
+        first_error: Optional[BaseException] = None
+        delay = self.hedge_delay()
+        # Hedge n fires n delays after the request started, whatever happens in between
+        next_hedge_at = time.perf_counter() + delay
+
+        while True:
+            running = {a.future: a for a in attempts if not a.future.done()}
+            finished = [a for a in attempts if a.future.done()]
+            for attempt in finished:
+                attempts.remove(attempt)
+                if attempt.future.exception() is None:
+                    if attempt.backend is not self.primary:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    if on_response is not None and attempt.responses:
+                        on_response(attempt.responses[-1])
+                    return attempt.future.result()
+                first_error = first_error or attempt.future.exception()
+
+            if not running and not pending_backends:
+                assert first_error is not None  # nosec - only reachable after a failure
+                raise first_error
+
+            if not running:
+                # Everything in flight failed: fail over now (not a hedge)
+                attempts.append(
+                    self._start(pending_backends.pop(0), prompt, model, api_key, kwargs)
+                )
+                continue
+            if not pending_backends:
+                wait(running, return_when=FIRST_COMPLETED)
+                continue
+
+            timeout = max(0.0, next_hedge_at - time.perf_counter())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                with self._lock:
+                    self.hedges_fired += 1
+                attempts.append(
+                    self._start(pending_backends.pop(0), prompt, model, api_key, kwargs)
+                )
+                next_hedge_at += delay
@@ -0,0 +1,107 @@
+"""Named LLM backends shared by the hedging and provider-pool wrappers."""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from llmtestgen.wrappers import openai_client, openrouter_client
+
+SendPromptFn = Callable[..., str]
+TestConnectionFn = Callable[..., bool]
+
+# Providers that can be named on the CLI, with their health check
+PROVIDERS: Dict[str, SendPromptFn] = {
+    "openrouter": openrouter_client.send_prompt,
+    "openai": openai_client.send_prompt,
+}
+HEALTH_CHECKS: Dict[str, TestConnectionFn] = {
+    "openrouter": openrouter_client.test_connection,
+    "openai": openai_client.test_connection,
+}
+# Environment variable each provider's client reads its API key from
+API_KEY_ENV: Dict[str, str] = {
+    "openrouter": "OPENROUTER_API_KEY",
+    "openai": "OPENAI_API_KEY",
+}
+
+
+class LLMBackend:
+    """A named `send_prompt` function, optionally pinned to a model, key and endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        send_prompt_fn: SendPromptFn,
+        *,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        weight: int = 1,
+        test_connection_fn: Optional[TestConnectionFn] = None,
+        provider: Optional[str] = None,
+    ) -> None:
+        if weight < 1:
+            raise ValueError("Backend weight must be a positive integer.")
+        self.name = name
+        self.send_prompt_fn = send_prompt_fn
+        self.model = model
+        self.api_key = api_key
+        self.base_url = base_url
+        self.weight = weight
+        self.test_connection_fn = test_connection_fn
+        self.provider = provider  # None: a custom function, not a named provider
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "LLMBackend":
+        """Build a backend from `PROVIDER[:MODEL][@BASE_URL][*WEIGHT]`.
+
+        Examples: `openai:gpt-4o-mini`, `openrouter:anthropic/claude-3.5-haiku*3`,
+        `openai:llama3@http://localhost:8000/v1` (any OpenAI-compatible server).
+        """
+        body, star, weight = spec.rpartition("*")
+        if not star or not weight.isdigit():
+            body, weight = spec, "1"
+        body, _, base_url = body.partition("@")
+        provider, _, model = body.partition(":")
+        if provider not in PROVIDERS:
+            raise ValueError(
+                f"Unknown provider {provider!r}; expected one of {sorted(PROVIDERS)}."
+            )
+        return cls(
+            body if not base_url else f"{body}@{base_url}",
+            PROVIDERS[provider],
+            model=model or None,
+            base_url=base_url or None,
+            weight=int(weight),
+            test_connection_fn=HEALTH_CHECKS[provider],
+            provider=provider,
+        )
+
+    def has_api_key(self) -> bool:
+        """True if a key is pinned or the provider's key is set in the environment."""
+        if self.api_key:
+            return True
+        env_var = API_KEY_ENV.get(self.provider or "")
+        return env_var is None or bool(os.getenv(env_var))
+
+    def send(self, prompt: Any, **kwargs: Any) -> str:
+        """Call the backend; its pinned model/key/endpoint override the caller's."""
+        if self.model:
+            kwargs["model"] = self.model
+        if self.api_key:
+            kwargs["api_key"] = self.api_key
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return self.send_prompt_fn(prompt, **kwargs)
+
+    def test_connection(self) -> Optional[bool]:
+        """Run the backend health check; None if it has none."""
+        if self.test_connection_fn is None:
+            return None
+        kwargs: Dict[str, Any] = {"api_key": self.api_key}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return self.test_connection_fn(**kwargs)
+
+    def __repr__(self) -> str:
+        return f"LLMBackend({self.name!r})"
@@ -0,0 +1,78 @@
+"""Token usage and response metadata shared by the OpenAI-compatible LLM wrappers."""
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from pydantic import BaseModel
+
+
+class LLMUsage(BaseModel):
+    """Token accounting extracted from a chat completion `usage` block."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cached_tokens: int = 0        # prompt tokens served from the provider prompt cache
+    cache_write_tokens: int = 0   # prompt tokens written to the cache (Anthropic-style)
+
+    @classmethod
+    def from_response(cls, response: Mapping[str, Any]) -> Optional["LLMUsage"]:
+        """Parse the `usage` block of a chat completion response, if any.
+
+        Understands the OpenAI/OpenRouter shape (`prompt_tokens_details.cached_tokens`)
+        and the Anthropic-style `cache_read_input_tokens`/`cache_creation_input_tokens`.
+        """
+        usage = response.get("usage")
+        if not isinstance(usage, Mapping):
+            return None
+
+        details = usage.get("prompt_tokens_details") or {}
+        cached = details.get("cached_tokens") if isinstance(details, Mapping) else None
+        if cached is None:
+            cached = usage.get("cache_read_input_tokens")
+
+        prompt_tokens = _as_int(usage.get("prompt_tokens"))
+        completion_tokens = _as_int(usage.get("completion_tokens"))
+        return cls(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=_as_int(usage.get("total_tokens")) or prompt_tokens + completion_tokens,
+            cached_tokens=_as_int(cached),
+            cache_write_tokens=_as_int(usage.get("cache_creation_input_tokens")),
+        )
+
+    def __add__(self, other: "LLMUsage") -> "LLMUsage":
+        """Sum the usage of several calls (e.g. a request and its continuations)."""
+        return LLMUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            completion_tokens=self.completion_tokens + other.completion_tokens,
+            total_tokens=self.total_tokens + other.total_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+            cache_write_tokens=self.cache_write_tokens + other.cache_write_tokens,
+        )
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fraction of prompt tokens that were served from cache."""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
+
+
+def finish_reason(response: Mapping[str, Any]) -> Optional[str]:
+    """`finish_reason` of the first choice of a chat completion response, if any.
+
+    "length" means the output was cut off by the token limit.
+    """
+    choices = response.get("choices")
+    if not isinstance(choices, list) or not choices or not isinstance(choices[0], Mapping):
+        return None
+    reason = choices[0].get("finish_reason")
+    return str(reason) if reason is not None else None
+
+
+def _as_int(value: object) -> int:
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0
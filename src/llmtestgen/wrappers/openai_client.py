@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence
+from typing import (
+    Any, Callable, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence, Union
+)
 
 import httpx
 
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
 
 class OpenAIError(RuntimeError):
     """Raised when the OpenAI API returns an error response."""
@@ -18,7 +22,7 @@ class OpenAIClient:
         self,
         api_key: Optional[str] = None,
         *,
-        base_url: str = "https://api.openai.com/v1",
+        base_url: Optional[str] = None,
         default_model: Optional[str] = None,
         timeout: float = 30.0,
         organization: Optional[str] = None,
@@ -27,6 +31,7 @@ class OpenAIClient:
         if not self.api_key:
             raise ValueError("An OpenAI API key is required.")
 
+        base_url = base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL
         self.base_url = base_url.rstrip("/")
         self.default_model = default_model or os.getenv("OPENAI_DEFAULT_MODEL")
         self.organization = organization or os.getenv("OPENAI_ORG")
@@ -60,7 +65,7 @@ class OpenAIClient:
 
     def chat_completion(
         self,
-        messages: Sequence[Mapping[str, str]],
+        messages: Sequence[Mapping[str, Any]],
         *,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
@@ -103,11 +108,13 @@ class OpenAIClient:
 
 
 def send_prompt(
-    prompt: str,
+    prompt: Union[str, Sequence[Mapping[str, Any]]],
     *,
     api_key: Optional[str] = None,
     model: Optional[str] = None,
     system_prompt: Optional[str] = None,
+    on_response: Optional[Callable[[Mapping[str, Any]], None]] = None,
+    base_url: Optional[str] = None,
     **kwargs: Any,
 ) -> str:
     messages = []
@@ -115,9 +122,12 @@ def send_prompt(
         messages.append({"role": "system", "content": system_prompt})
     messages.append({"role": "user", "content": prompt})
 
-    with OpenAIClient(api_key=api_key, default_model=model) as client:
+    with OpenAIClient(api_key=api_key, base_url=base_url, default_model=model) as client:
         result = client.chat_completion(messages, extra_body=kwargs)
 
+    if on_response is not None:
+        on_response(result)
+
     choices: Iterable[Mapping[str, Any]] = result.get("choices", [])
     for choice in choices:
         message = choice.get("message")
@@ -127,6 +137,6 @@ def send_prompt(
     raise OpenAIError("No message content returned from OpenAI response.")
 
 
-def test_connection(api_key: Optional[str] = None) -> bool:
-    with OpenAIClient(api_key=api_key) as client:
+def test_connection(api_key: Optional[str] = None, base_url: Optional[str] = None) -> bool:
+    with OpenAIClient(api_key=api_key, base_url=base_url) as client:
         return client.test_connection()
@@ -2,10 +2,14 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence
+from typing import (
+    Any, Callable, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence, Union
+)
 
 import httpx
 
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
 
 class OpenRouterError(RuntimeError):
     """Raised when the OpenRouter API returns an error response."""
@@ -17,7 +21,7 @@ class OpenRouterClient:
     def __init__(
         self,
         api_key: Optional[str] = None,
-        base_url: str = "https://openrouter.ai/api/v1",
+        base_url: Optional[str] = None,
         default_model: Optional[str] = None,
         timeout: float = 30.0,
         site_url: Optional[str] = None,
@@ -27,6 +31,7 @@ class OpenRouterClient:
         if not self.api_key:
             raise ValueError("An OpenRouter API key is required.")
 
+        base_url = base_url or os.getenv("OPENROUTER_BASE_URL") or DEFAULT_BASE_URL
         self.base_url = base_url.rstrip("/")
         self.default_model = default_model or os.getenv("OPENROUTER_DEFAULT_MODEL")
         self.site_url = site_url or os.getenv("OPENROUTER_SITE_URL")
@@ -64,7 +69,7 @@ class OpenRouterClient:
 
     def chat_completion(
         self,
-        messages: Sequence[Mapping[str, str]],
+        messages: Sequence[Mapping[str, Any]],
         *,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
@@ -112,16 +117,21 @@ class OpenRouterClient:
 
 
 def send_prompt(
-    prompt: str,
+    prompt: Union[str, Sequence[Mapping[str, Any]]],
     *,
     api_key: Optional[str] = None,
     model: Optional[str] = None,
     system_prompt: Optional[str] = None,
+    on_response: Optional[Callable[[Mapping[str, Any]], None]] = None,
+    base_url: Optional[str] = None,
     **kwargs: Any,
 ) -> str:
     """Convenience helper for single-turn prompts.
 
     Returns just the assistant's text output which is the most common need for the app.
+    `prompt` may also be a list of content parts (e.g. carrying `cache_control` hints).
+    If `on_response` is given it receives the full JSON response (usage, finish_reason, ...).
+    `base_url` targets another OpenAI-compatible endpoint than OPENROUTER_BASE_URL.
     """
 
     messages = []
@@ -129,9 +139,16 @@ def send_prompt(
         messages.append({"role": "system", "content": system_prompt})
     messages.append({"role": "user", "content": prompt})
 
-    with OpenRouterClient(api_key=api_key, default_model=model) as client:
+    if on_response is not None:
+        # Ask OpenRouter for detailed usage accounting (includes cached tokens).
+        kwargs.setdefault("usage", {"include": True})
+
+    with OpenRouterClient(api_key=api_key, base_url=base_url, default_model=model) as client:
         result = client.chat_completion(messages, extra_body=kwargs)
 
+    if on_response is not None:
+        on_response(result)
+
     choices: Iterable[Mapping[str, Any]] = result.get("choices", [])
     for choice in choices:
         message = choice.get("message")
@@ -141,8 +158,8 @@ def send_prompt(
     raise OpenRouterError("No message content returned from OpenRouter response.")
 
 
-def test_connection(api_key: Optional[str] = None) -> bool:
+def test_connection(api_key: Optional[str] = None, base_url: Optional[str] = None) -> bool:
     """Convenience helper mirroring `OpenRouterClient.test_connection`."""
 
-    with OpenRouterClient(api_key=api_key) as client:
+    with OpenRouterClient(api_key=api_key, base_url=base_url) as client:
         return client.test_connection()
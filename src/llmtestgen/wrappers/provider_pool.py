@@ -0,0 +1,290 @@
+"""Failover and weighted load balancing over several LLM backends.
+
+A `ProviderPool` implements the `send_prompt_fn` contract. Requests are
+spread over healthy backends with smooth weighted round-robin; a backend
+that keeps failing (or reports quota/auth errors) is ejected and the request
+moves on to the next one. After a cool-down an ejected backend is
+health-checked with its `test_connection` and readmitted if it passes;
+otherwise its cool-down doubles, up to a limit.
+
+The caller's `model` and `api_key` belong to one provider (`caller_provider`,
+OpenRouter for the CLI); they are only passed to that provider's backends
+and to custom functions. Backends of any other provider must pin their own
+model and have their own API key. A backend pinned to another model than
+the caller's also loses the `response_format` and `cache_control` content
+parts chosen for the caller's model, unless its own model supports them.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from llmtestgen.services.test_generation.prompt_cache import supports_cache_control
+from llmtestgen.wrappers.llm_backend import API_KEY_ENV, LLMBackend
+from llmtestgen.wrappers.structured_output import supports_structured_output
+
+# Caller arguments that only make sense for the caller's own provider
+_CALLER_CREDENTIALS = ("model", "api_key")
+# Status codes in client error messages that mean "stop sending here for a while"
+_EJECT_NOW = re.compile(r"\((401|403|429)\)")
+
+
+def _plain_text(content: Any) -> Any:
+    """Content parts joined back into one text (what `cache_control` parts wrap)."""
+    if isinstance(content, str):
+        return content
+    return "\n\n".join(part["text"] for part in content if "text" in part)
+
+
+def _adapt_request(
+    backend: LLMBackend, prompt: Any, kwargs: Dict[str, Any]
+) -> Tuple[Any, Dict[str, Any]]:
+    """Drop request options chosen for the caller's model that `backend`'s model may reject."""
+    if not backend.model or backend.model == kwargs.get("model"):
+        return prompt, kwargs
+    if "response_format" in kwargs and not supports_structured_output(backend.model):
+        kwargs = {k: v for k, v in kwargs.items() if k != "response_format"}
+    if not isinstance(prompt, str) and not supports_cache_control(backend.model):
+        prompt = _plain_text(prompt)
+    return prompt, kwargs
+
+
+class ProviderPoolError(RuntimeError):
+    """Raised when every backend in the pool failed a request."""
+
+
+class BackendStatus(BaseModel):
+    """Health and traffic counters for one backend."""
+    name: str
+    weight: int
+    healthy: bool
+    calls: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_for: float = 0.0  # seconds until a readmission attempt, 0 if healthy
+
+
+class _BackendState:
+    def __init__(self, backend: LLMBackend, cooldown: float, foreign: bool) -> None:
+        self.backend = backend
+        self.foreign = foreign  # another provider than the caller's: drop its model/key
+        self.current_weight = 0
+        self.calls = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until: Optional[float] = None
+        self.cooldown = cooldown
+
+
+class ProviderPool:
+    """`send_prompt`-compatible pool of backends with failover."""
+
+    def __init__(
+        self,
+        backends: Sequence[LLMBackend],
+        *,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+        health_check: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        caller_provider: Optional[str] = "openrouter",
+    ) -> None:
+        """
+        Args:
+            backends: backends to balance over, with their weights
+            failure_threshold: consecutive failures before a backend is ejected
+            cooldown: seconds before an ejected backend is reconsidered
+            max_cooldown: cap for the cool-down, which doubles on each failed readmission
+            health_check: call `test_connection` before readmitting a backend
+            clock: monotonic time source (injectable for tests)
+            caller_provider: provider the caller's `model` and `api_key` are for
+
+        Raises:
+            ValueError: if a backend of another provider has no pinned model
+                or no API key
+        """
+        if not backends:
+            raise ValueError("A provider pool needs at least one backend.")
+        foreign = [
+            b.provider is not None and b.provider != caller_provider for b in backends
+        ]
+        for backend, is_foreign in zip(backends, foreign):
+            if not is_foreign:
+                continue
+            if not backend.model:
+                raise ValueError(
+                    f"Backend {backend.name!r} needs its own model: use "
+                    f"{backend.provider}:MODEL (the requested model is for {caller_provider})."
+                )
+            if not backend.has_api_key():
+                raise ValueError(
+                    f"Backend {backend.name!r} needs an API key: set "
+                    f"{API_KEY_ENV[backend.provider or '']}."
+                )
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.health_check = health_check
+        self.clock = clock
+        self._states = [
+            _BackendState(b, cooldown, is_foreign) for b, is_foreign in zip(backends, foreign)
+        ]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_specs(cls, specs: Sequence[str], **kwargs: Any) -> "ProviderPool":
+        """Build a pool from `PROVIDER[:MODEL][@BASE_URL][*WEIGHT]` strings."""
+        return cls([LLMBackend.from_spec(spec) for spec in specs], **kwargs)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def _readmit_due(self) -> None:
+        """Health-check ejected backends whose cool-down has elapsed."""
+        now = self.clock()
+        due = [
+            s for s in self._states
+            if s.ejected_until is not None and s.ejected_until <= now
+        ]
+        for state in due:
+            healthy = True
+            if self.health_check:
+                try:
+                    healthy = state.backend.test_connection() is not False
+                except Exception:
+                    healthy = False
+            with self._lock:
+                if healthy:
+                    state.ejected_until = None
+                    state.consecutive_failures = 0
+                    state.cooldown = self.cooldown
+                else:
+                    state.cooldown = min(self.max_cooldown, state.cooldown * 2)
+                    state.ejected_until = self.clock() + state.cooldown
+
+    def _next(self, exclude: List[_BackendState]) -> Optional[_BackendState]:
+        """Smooth weighted round-robin over healthy backends not yet tried."""
+        with self._lock:
+            candidates = [
+                s for s in self._states if s.ejected_until is None and s not in exclude
+            ]
+            if not candidates:
+                return None
+            total = 0
+            for state in candidates:
+                state.current_weight += state.backend.weight
+                total += state.backend.weight
+            chosen = max(candidates, key=lambda s: s.current_weight)
+            chosen.current_weight -= total
+            return chosen
+
+    def _last_resort(self, exclude: List[_BackendState]) -> Optional[_BackendState]:
+        """With everything ejected, try the backend due back soonest."""
+        with self._lock:
+            ejected = [s for s in self._states if s not in exclude]
+            if not ejected:
+                return None
+            return min(ejected, key=lambda s: s.ejected_until or 0.0)
+
+    # ------------------------------------------------------------------
+    # Outcomes
+    # ------------------------------------------------------------------
+
+    def _record_success(self, state: _BackendState) -> None:
+        with self._lock:
+            state.calls += 1
+            state.consecutive_failures = 0
+            if state.ejected_until is not None:  # a last-resort call succeeded
+                state.ejected_until = None
+                state.cooldown = self.cooldown
+
+    def _record_failure(self, state: _BackendState, exc: BaseException) -> None:
+        with self._lock:
+            state.calls += 1
+            state.failures += 1
+            state.consecutive_failures += 1
+            eject = (
+                state.consecutive_failures >= self.failure_threshold
+                or bool(_EJECT_NOW.search(str(exc)))
+            )
+            if eject and state.ejected_until is None:
+                state.ejections += 1
+                state.ejected_until = self.clock() + state.cooldown
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def __call__(self, prompt: Any, **kwargs: Any) -> str:
+        """Send `prompt` to the next backend, failing over until one succeeds."""
+        self._readmit_due()
+        tried: List[_BackendState] = []
+        errors: List[str] = []
+        last_exc: Optional[BaseException] = None
+
+        while True:
+            state = self._next(tried) or self._last_resort(tried)
+            if state is None:
+                break
+            tried.append(state)
+            send_prompt, send_kwargs = _adapt_request(state.backend, prompt, kwargs)
+            if state.foreign:
+                send_kwargs = {
+                    k: v for k, v in send_kwargs.items() if k not in _CALLER_CREDENTIALS
+                }
+            try:
+                text = state.backend.send(send_prompt, **send_kwargs)
+            except Exception as exc:
+                self._record_failure(state, exc)
+                errors.append(f"{state.backend.name}: {exc}")
+                last_exc = exc
+                continue
+            self._record_success(state)
+            return text
+
+        raise ProviderPoolError(
+            "All LLM backends failed:\n" + "\n".join(errors)
+        ) from last_exc
+
+    def check_health(self) -> Dict[str, bool]:
+        """Health-check every backend now, ejecting the ones that fail."""
+        results: Dict[str, bool] = {}
+        for state in self._states:
+            try:
+                healthy = state.backend.test_connection() is not False
+            except Exception:
+                healthy = False
+            results[state.backend.name] = healthy
+            with self._lock:
+                if healthy:
+                    state.ejected_until = None
+                    state.consecutive_failures = 0
+                elif state.ejected_until is None:
+                    state.ejections += 1
+                    state.ejected_until = self.clock() + state.cooldown
+        return results
+
+    def status(self) -> List[BackendStatus]:
+        now = self.clock()
+        with self._lock:
+            return [
+                BackendStatus(
+                    name=s.backend.name,
+                    weight=s.backend.weight,
+                    healthy=s.ejected_until is None,
+                    calls=s.calls,
+                    failures=s.failures,
+                    consecutive_failures=s.consecutive_failures,
+                    ejections=s.ejections,
+                    ejected_for=max(0.0, (s.ejected_until or now) - now),
+                )
+                for s in self._states
+            ]
@@ -0,0 +1,50 @@
+"""Structured-output (`response_format` JSON schema) support for chat completions."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+# Models known to accept `response_format: {"type": "json_schema", ...}`, directly
+# or through OpenRouter. Others get plain prompting plus tolerant JSON extraction.
+STRUCTURED_OUTPUT_MODEL_PREFIXES = (
+    "gpt-4o",
+    "gpt-4.1",
+    "gpt-5",
+    "o1",
+    "o3",
+    "o4",
+    "openai/",
+    "google/gemini",
+    "gemini-",
+)
+
+
+def supports_structured_output(model: Optional[str]) -> bool:
+    """Return True if `model` is known to honour a JSON-schema `response_format`."""
+    if not model:
+        return False
+    return model.lower().startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES)
+
+
+def model_schema(model_cls: Type[BaseModel], *, exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """JSON schema of a pydantic model, without the fields in `exclude`."""
+    schema = model_cls.model_json_schema()
+    excluded = set(exclude)
+    schema["properties"] = {
+        name: prop for name, prop in schema.get("properties", {}).items() if name not in excluded
+    }
+    if "required" in schema:
+        schema["required"] = [name for name in schema["required"] if name not in excluded]
+    return schema
+
+
+def json_schema_response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an OpenAI-compatible `response_format` payload for `schema`.
+
+    Non-strict, so optional fields and pydantic defaults are accepted as-is.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": False},
+    }
@@ -0,0 +1,89 @@
+"""Benchmark harness: timing percentiles, throughput and peak memory as JSON records."""
+from __future__ import annotations
+
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+_RESULTS: List[Dict[str, Any]] = []
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def measure(
+    name: str,
+    func: Callable[[], Any],
+    *,
+    size: int,
+    min_time: float = 0.2,
+    max_iterations: int = 1000,
+    min_iterations: int = 5,
+) -> Dict[str, Any]:
+    """Time `func` repeatedly, then run it once under tracemalloc for peak memory."""
+    func()  # warm-up (imports, caches)
+
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < max_iterations:
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= min_iterations and time.perf_counter() - started >= min_time:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        "name": name,
+        "size": size,
+        "iterations": len(timings),
+        "ops_per_sec": round(1.0 / mean, 3) if mean else None,
+        "mean_ms": round(mean * 1000, 4),
+        "p50_ms": round(_percentile(timings, 50) * 1000, 4),
+        "p99_ms": round(_percentile(timings, 99) * 1000, 4),
+        "peak_memory_bytes": peak,
+    }
+
+
+@pytest.fixture
+def bench(run_benchmarks) -> Callable[..., Dict[str, Any]]:
+    """Measure a callable and record the result for the JSON report."""
+
+    def _bench(name: str, func: Callable[[], Any], *, size: int, **kwargs: Any) -> Dict[str, Any]:
+        result = measure(name, func, size=size, **kwargs)
+        _RESULTS.append(result)
+        print(json.dumps(result))
+        return result
+
+    return _bench
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    output: Optional[str] = session.config.getoption("--benchmark-json")
+    if not output or not _RESULTS:
+        return
+    Path(output).write_text(
+        json.dumps({"benchmarks": sorted(_RESULTS, key=lambda r: (r["name"], r["size"]))}, indent=2),
+        encoding="utf-8",
+    )
@@ -0,0 +1,39 @@
+"""End-to-end pipeline benchmark over synthetic corpora at multiples of the real workload."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.test_generation.python_test_writer import write_test_spec_file
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    generate_test_spec_from_paths,
+)
+from llmtestgen.testing.synthetic_corpus import canned_send_prompt, generate_corpus, scaled_config
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.mark.parametrize("scale", [1, 10, 100, 1000])
+def test_end_to_end_pipeline(bench, tmp_path: Path, scale: int) -> None:
+    manifest = generate_corpus(tmp_path / "corpus", scaled_config(scale, seed=scale))
+    send = canned_send_prompt(manifest)
+    output = tmp_path / "out.md"
+
+    def run() -> None:
+        test_spec = generate_test_spec_from_paths(
+            manifest.spec_markdown,
+            manifest.repo_path,
+            send_prompt_fn=send,
+            code_context_level=CodeContextLevel.FILE_SNIPPETS,
+        )
+        write_test_spec_file(test_spec, output)
+
+    # The 1000x corpus takes close to a minute per run: time it once after the warm-up
+    bench(
+        "pipeline.end_to_end[canned]",
+        run,
+        size=scale,
+        min_iterations=1 if scale >= 1000 else 3,
+    )
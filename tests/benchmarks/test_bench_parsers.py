@@ -0,0 +1,110 @@
+"""Scaling benchmarks for the spec parsers and the SpecRouter."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import parse_spec
+from llmtestgen.services.spec_analyser.parsers.parser_json import JSONParser
+from llmtestgen.services.spec_analyser.parsers.parser_md import MarkdownParser
+from llmtestgen.services.spec_analyser.parsers.parser_openapi import OpenAPIParser
+from llmtestgen.services.spec_analyser.parsers.parser_yaml import YAMLParser
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10, 100, 1000]
+
+
+def _requirements(count: int) -> list[str]:
+    return [
+        f"The service must process item {idx} and should record an audit entry."
+        for idx in range(count)
+    ]
+
+
+def _write_markdown(root: Path, count: int) -> Path:
+    lines = ["# Service", "", "## Requirements", ""]
+    lines += [f"- {req}" for req in _requirements(count)]
+    lines += ["", "## Acceptance Criteria", ""]
+    lines += [f"- Given item {i}, when processed, then it is stored." for i in range(count // 2)]
+    path = root / "spec.md"
+    path.write_text("\n".join(lines), encoding="utf-8")
+    return path
+
+
+def _spec_mapping(count: int) -> dict:
+    return {
+        "title": "Service",
+        "requirements": _requirements(count),
+        "acceptance": [f"Given item {i}, then it is stored." for i in range(count // 2)],
+    }
+
+
+def _write_json(root: Path, count: int) -> Path:
+    path = root / "spec.json"
+    path.write_text(json.dumps(_spec_mapping(count), indent=2), encoding="utf-8")
+    return path
+
+
+def _write_yaml(root: Path, count: int) -> Path:
+    path = root / "spec.yaml"
+    path.write_text(yaml.safe_dump(_spec_mapping(count), sort_keys=False), encoding="utf-8")
+    return path
+
+
+def _write_openapi(root: Path, count: int) -> Path:
+    paths = {
+        f"/items/{idx}": {
+            "get": {"summary": f"Fetch item {idx}", "description": "Must return 404 if missing."},
+            "post": {"operationId": f"create_{idx}", "description": "Should validate input."},
+        }
+        for idx in range(count)
+    }
+    data = {"openapi": "3.0.0", "info": {"title": "Items", "version": "1"}, "paths": paths}
+    path = root / "openapi.yaml"
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_markdown_parser(bench, tmp_path: Path, size: int) -> None:
+    path = _write_markdown(tmp_path, size)
+    bench("MarkdownParser.parse", lambda: MarkdownParser().parse(path), size=size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_json_parser(bench, tmp_path: Path, size: int) -> None:
+    path = _write_json(tmp_path, size)
+    bench("JSONParser.parse", lambda: JSONParser().parse(path), size=size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_yaml_parser(bench, tmp_path: Path, size: int) -> None:
+    path = _write_yaml(tmp_path, size)
+    bench("YAMLParser.parse", lambda: YAMLParser().parse(path), size=size)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_openapi_parser(bench, tmp_path: Path, size: int) -> None:
+    path = _write_openapi(tmp_path, size)
+    bench("OpenAPIParser.parse", lambda: OpenAPIParser().parse(path), size=size)
+
+
+@pytest.mark.parametrize("kind", ["md", "json", "yaml", "openapi"])
+@pytest.mark.parametrize("size", SIZES)
+def test_spec_router(bench, tmp_path: Path, size: int, kind: str) -> None:
+    writer = {
+        "md": _write_markdown,
+        "json": _write_json,
+        "yaml": _write_yaml,
+        "openapi": _write_openapi,
+    }[kind]
+    path = writer(tmp_path, size)
+    bench(
+        f"SpecRouter.parse[{kind}]",
+        lambda: parse_spec(path, send_prompt_fn=lambda *a, **k: ""),
+        size=size,
+    )
@@ -0,0 +1,127 @@
+"""Scaling benchmarks for repository scanning, code context, response parsing and rendering."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.case_dedup import deduplicate_test_cases
+from llmtestgen.services.test_generation.python_test_writer import (
+    render_test_spec_file_markdown,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    TestSpecGenerator,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [10, 100, 1000]
+
+MODULE_TEMPLATE = '''"""Module {idx}."""
+
+
+class Service{idx}:
+    """Service number {idx}."""
+
+    def handle(self, value: int) -> int:
+        # double the value
+        return value * 2
+
+
+def helper_{idx}(items: list[int]) -> int:
+    return sum(items)
+'''
+
+
+def _write_repo(root: Path, modules: int) -> Path:
+    for idx in range(modules):
+        package = root / "pkg" / f"sub{idx % 10}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"module_{idx}.py").write_text(MODULE_TEMPLATE.format(idx=idx), encoding="utf-8")
+        if idx % 5 == 0:
+            (package / f"notes_{idx}.md").write_text("notes", encoding="utf-8")
+    return root
+
+
+def _llm_response(cases: int) -> str:
+    return json.dumps(
+        {
+            "test_cases": [
+                {
+                    "id": f"TC-{idx}",
+                    "requirement": f"Requirement {idx}",
+                    "description": f"Check behaviour {idx}",
+                    "preconditions": ["Service is running"],
+                    "steps": ["Call the API", "Inspect the result"],
+                    "expected_result": "The result is correct.\nNo error is logged.",
+                    "target_code_elements": [f"pkg/module_{idx}.py"],
+                }
+                for idx in range(cases)
+            ]
+        }
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_git_repository_list_files(bench, tmp_path: Path, size: int) -> None:
+    repo = GitRepository(str(_write_repo(tmp_path, size)))
+    bench("GitRepository.list_files", repo.list_files, size=size)
+
+
+@pytest.mark.parametrize("level", list(CodeContextLevel))
+@pytest.mark.parametrize("size", SIZES)
+def test_build_python_code_context(bench, tmp_path: Path, size: int, level) -> None:
+    repo = GitRepository(str(_write_repo(tmp_path, size)))
+    # Every file may enter the context, so its cost grows with the corpus
+    # (a fixed max_files would cap snippet contexts at the same size)
+    result = bench(
+        f"build_python_code_context[{level.value}]",
+        lambda: build_python_code_context(repo, level=level, max_files=size),
+        size=size,
+    )
+    result["context_chars"] = len(build_python_code_context(repo, level=level, max_files=size))
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_parse_llm_response(bench, size: int) -> None:
+    generator = TestSpecGenerator(lambda *a, **k: "", model="bench")
+    spec = NormalizedSpec(source_path="spec.md")
+    response = _llm_response(size)
+    bench(
+        "TestSpecGenerator._parse_llm_response",
+        lambda: generator._parse_llm_response(response_text=response, spec=spec),
+        size=size,
+    )
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_render_test_spec_file_markdown(bench, size: int) -> None:
+    generator = TestSpecGenerator(lambda *a, **k: "", model="bench")
+    test_spec = generator._parse_llm_response(
+        response_text=_llm_response(size),
+        spec=NormalizedSpec(source_path="spec.md"),
+    )
+    bench(
+        "render_test_spec_file_markdown",
+        lambda: render_test_spec_file_markdown(test_spec),
+        size=size,
+    )
+
+
+@pytest.mark.parametrize("size", [100, 1000, 10000])
+def test_deduplicate_test_cases(bench, size: int) -> None:
+    generator = TestSpecGenerator(lambda *a, **k: "", model="bench")
+    test_spec = generator._parse_llm_response(
+        response_text=_llm_response(size),
+        spec=NormalizedSpec(source_path="spec.md"),
+    )
+    bench(
+        "deduplicate_test_cases",
+        lambda: deduplicate_test_cases(test_spec.test_cases),
+        size=size,
+    )
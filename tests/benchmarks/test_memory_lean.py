@@ -0,0 +1,92 @@
+"""Per-spec memory footprint of eager vs lean spec/result models.
+
+Run with: pytest tests/benchmarks --run-benchmarks -s
+"""
+from __future__ import annotations
+
+import gc
+import json
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import parse_spec
+from llmtestgen.services.test_generation.test_spec_generator import TestSpecGenerator
+
+pytestmark = pytest.mark.benchmark
+
+SPEC_COUNT = 20
+REQUIREMENTS_PER_SPEC = 200
+
+
+def _write_specs(root: Path) -> List[Path]:
+    paths = []
+    for spec_idx in range(SPEC_COUNT):
+        lines = [f"# Spec {spec_idx}", "", "## Requirements", ""]
+        for req_idx in range(REQUIREMENTS_PER_SPEC):
+            lines.append(
+                f"- The service must handle request {req_idx} of spec {spec_idx} "
+                "without losing data, and it should log the outcome for auditing."
+            )
+        path = root / f"spec_{spec_idx}.md"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _fake_llm(*_args, **_kwargs) -> str:
+    cases = [
+        {
+            "id": f"TC-{i}",
+            "description": "Padding description for a generated case. " * 4,
+            "steps": ["step one", "step two"],
+            "expected_result": "The request is handled.",
+        }
+        for i in range(50)
+    ]
+    return json.dumps({"test_cases": cases}, indent=2)
+
+
+def _retained_bytes(build: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        retained = build()
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert retained  # keep results alive until measured
+    return current - baseline
+
+
+def test_lean_mode_reduces_per_spec_footprint(run_benchmarks, tmp_path: Path) -> None:
+    paths = _write_specs(tmp_path)
+    spill_dir = tmp_path / "responses"
+
+    def build(lean: bool) -> list:
+        generator = TestSpecGenerator(
+            _fake_llm,
+            model="bench",
+            raw_response_dir=spill_dir if lean else None,
+        )
+        results = []
+        for path in paths:
+            spec = parse_spec(path, send_prompt_fn=_fake_llm, lean=lean).spec
+            results.append((spec, generator.generate(spec)))
+        return results
+
+    eager = _retained_bytes(lambda: build(False)) / SPEC_COUNT
+    lean = _retained_bytes(lambda: build(True)) / SPEC_COUNT
+
+    print(json.dumps({
+        "benchmark": "memory_per_spec",
+        "specs": SPEC_COUNT,
+        "eager_bytes_per_spec": int(eager),
+        "lean_bytes_per_spec": int(lean),
+        "reduction": round(1 - lean / eager, 3),
+    }))
+    assert lean < eager
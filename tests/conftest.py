@@ -47,6 +47,18 @@ def pytest_addoption(parser: pytest.Parser) -> None:
         default=False,
         help="Run tests that clone remote Git repositories (requires network access).",
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the benchmark suite under tests/benchmarks (slow, prints measurements).",
+    )
+    parser.addoption(
+        "--benchmark-json",
+        action="store",
+        default=None,
+        help="Write benchmark results as JSON to this path (used with --run-benchmarks).",
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -55,9 +67,11 @@ def pytest_addoption(parser: pytest.Parser) -> None:
 
 @pytest.fixture(autouse=True)
 def forbid_llm_calls(monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest):
-    """Prevent LLM parser usage unless explicitly marked live."""
+    """Prevent LLM parser usage unless explicitly marked live (or fake_llm)."""
     if request.node.get_closest_marker("live_llm") or request.node.get_closest_marker("live-llm"):
         return
+    if request.node.get_closest_marker("fake_llm"):
+        return
 
     def _forbid(*_args: Any, **_kwargs: Any):
         raise AssertionError("LLM parser called unexpectedly")
@@ -90,6 +104,14 @@ def live_git(request):
     return request.config.getoption("--live-git")
 
 
+@pytest.fixture
+def run_benchmarks(request):
+    """Skip benchmark tests unless --run-benchmarks was passed."""
+    if not request.config.getoption("--run-benchmarks"):
+        pytest.skip("benchmarks require --run-benchmarks")
+    return True
+
+
 @pytest.fixture
 def write_file(tmp_path: Path):
     def _write(name: str, content: str) -> Path:
@@ -0,0 +1,41 @@
+"""Tests for by-reference raw text storage."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.core import RawTextRef, RawTextRefError
+
+
+def test_from_text_round_trips_through_load(write_file) -> None:
+    path = write_file("spec.md", "# Title\nMust work.\n")
+    ref = RawTextRef.from_text(path, path.read_text(encoding="utf-8"))
+
+    assert ref.size == len("# Title\nMust work.\n") #nosec
+    assert ref.load() == "# Title\nMust work.\n" #nosec
+
+
+def test_load_detects_changed_file(write_file) -> None:
+    path = write_file("spec.md", "original")
+    ref = RawTextRef.from_text(path, "original")
+    path.write_text("changed", encoding="utf-8")
+
+    with pytest.raises(RawTextRefError):
+        ref.load()
+    assert ref.load(verify=False) == "changed" #nosec
+
+
+def test_spill_is_content_addressed(tmp_path: Path) -> None:
+    first = RawTextRef.spill('{"test_cases": []}', tmp_path, suffix=".json")
+    second = RawTextRef.spill('{"test_cases": []}', tmp_path, suffix=".json")
+
+    assert first.path == second.path #nosec
+    assert Path(first.path).name == f"{first.sha256}.json" #nosec
+    assert len(list(tmp_path.iterdir())) == 1 #nosec
+    assert first.load() == '{"test_cases": []}' #nosec
+
+
+def test_load_empty_file(write_file) -> None:
+    path = write_file("empty.md", "")
+    assert RawTextRef.from_text(path, "").load() == "" #nosec
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from llmtestgen.core.utils_json import extract_json, salvage_json_array
+
+
+def test_plain_json_is_returned_as_is():
+    assert extract_json('  {"a": 1}\n') == {"a": 1}
+    assert extract_json("[1, 2]") == [1, 2]
+
+
+def test_fenced_json_with_prose_is_recovered():
+    text = 'Sure! Here you go:\n```json\n{"test_cases": []}\n```\nLet me know if you need more.'
+    assert extract_json(text) == {"test_cases": []}
+
+
+def test_largest_embedded_value_wins_over_earlier_fragments():
+    text = 'Note [1]: the result is {"test_cases": [{"id": "TC-1"}]} as requested.'
+    assert extract_json(text) == {"test_cases": [{"id": "TC-1"}]}
+
+
+def test_trailing_prose_after_raw_json():
+    assert extract_json('{"a": {"b": 2}}\nThis covers everything.') == {"a": {"b": 2}}
+
+
+def test_nothing_decodable_raises_value_error():
+    with pytest.raises(ValueError):
+        extract_json("I could not produce any JSON, sorry.")
+    with pytest.raises(json.JSONDecodeError):
+        extract_json('{"truncated": [1, 2')
+
+
+def test_salvage_keeps_complete_items_of_a_truncated_array():
+    text = '{"test_cases": [{"id": "TC-1"}, {"id": "TC-2", "steps": ["a"]}, {"id": "TC-'
+    assert salvage_json_array(text, "test_cases") == ([{"id": "TC-1"}, {"id": "TC-2", "steps": ["a"]}], False)
+
+
+def test_salvage_reports_closed_arrays_and_missing_keys():
+    assert salvage_json_array('{"test_cases": [{"id": 1}]}', "test_cases") == ([{"id": 1}], True)
+    assert salvage_json_array('[1, 2, 3]') == ([1, 2, 3], True)
+    assert salvage_json_array('{"other": []}', "test_cases") == ([], False)
@@ -0,0 +1,32 @@
+"""Tests for per-stage memory profiling."""
+from __future__ import annotations
+
+import tracemalloc
+
+from llmtestgen.core.utils_memory import MemoryProfiler, profile_stage
+
+
+def test_stage_reports_peak_and_top_allocation_site():
+    profiler = MemoryProfiler(top=3)
+    kept = []
+
+    with profiler.stage("build"):
+        kept.append(bytearray(4 << 20))
+        transient = b"x" * (8 << 20)
+        del transient
+
+    profiler.stop()
+    [entry] = profiler.stages
+    assert entry.stage == "build"
+    assert entry.peak_bytes >= 12 << 20
+    assert entry.allocated_bytes >= 4 << 20
+    assert entry.top[0].location.startswith(__file__)
+    assert entry.top[0].size_bytes >= 4 << 20
+    assert not tracemalloc.is_tracing()
+    assert "build" in profiler.render() and "Peak RSS" in profiler.render()
+
+
+def test_profile_stage_is_a_no_op_without_profiler():
+    with profile_stage(None, "anything"):
+        pass
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,63 @@
+"""Tests for the debounced file watcher (polling backend)."""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+from llmtestgen.core.utils_watch import FileWatcher
+
+
+def _touch(path: Path, text: str, stamp: int) -> None:
+    path.write_text(text)
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_poll_reports_relevant_creations_edits_and_deletions(tmp_path: Path):
+    spec = tmp_path / "spec.md"
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "__pycache__").mkdir()
+    _touch(spec, "# Spec", 1)
+    _touch(repo / "pkg" / "a.py", "a = 1", 1)
+    output = repo / "test_generated.py"
+
+    watcher = FileWatcher([spec], [repo], ignore=[output], native=False)
+    assert watcher.poll() == set()
+
+    _touch(spec, "# Spec v2", 2)
+    _touch(repo / "pkg" / "b.py", "b = 1", 2)
+    (repo / "pkg" / "a.py").unlink()
+    _touch(repo / "README.md", "not watched", 2)
+    _touch(repo / "__pycache__" / "c.py", "skipped", 2)
+    _touch(output, "ignored", 2)
+
+    assert watcher.poll() == {
+        str(spec.resolve()),
+        str((repo / "pkg" / "b.py").resolve()),
+        str((repo / "pkg" / "a.py").resolve()),
+    }
+    assert watcher.poll() == set()
+
+
+def test_changes_are_batched_until_quiet(tmp_path: Path):
+    source = tmp_path / "mod.py"
+    _touch(source, "x = 0", 1)
+    watcher = FileWatcher(roots=[tmp_path], debounce=0.2, interval=0.02, native=False)
+    stop = threading.Event()
+    batches = []
+
+    def consume():
+        for batch in watcher.changes(stop):
+            batches.append(batch)
+            stop.set()
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    for stamp in range(2, 6):  # a burst of saves
+        _touch(source, f"x = {stamp}", stamp)
+        stop.wait(0.05)
+    thread.join(timeout=5)
+    stop.set()
+
+    assert batches == [{str(source.resolve())}]
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parsers.parser_llm import LLMParser
+
+
+def _payload(**overrides) -> str:
+    data = {
+        "title": "Spec",
+        "sections": {},
+        "requirements": ["must work"],
+        "acceptance_criteria": [],
+        "examples": [],
+        "confidence": 80,
+    }
+    data.update(overrides)
+    return json.dumps(data)
+
+
+def test_parse_llm_json_tolerates_fences_and_prose():
+    parser = LLMParser(lambda *a, **k: "")
+    response = f"Extracted spec:\n```json\n{_payload()}\n```\nDone."
+
+    parsed = parser._parse_llm_json(response, raw_text="text", source_path="spec.txt")
+
+    assert parsed.requirements == ["must work"]
+    assert parsed.confidence == pytest.approx(0.8)
+
+
+def test_parse_llm_json_rejects_non_object():
+    parser = LLMParser(lambda *a, **k: "")
+    with pytest.raises(ValueError):
+        parser._parse_llm_json("[1, 2, 3]", raw_text="", source_path="s")
+
+
+@pytest.mark.fake_llm
+def test_parse_requests_schema_for_supported_models(write_file):
+    path = write_file("spec.txt", "The system must work.")
+    seen = {}
+
+    def send(prompt, **kwargs):
+        seen.update(kwargs)
+        return _payload()
+
+    LLMParser(send, model="gpt-4o-mini").parse(path)
+
+    schema = seen["response_format"]["json_schema"]["schema"]
+    assert "confidence" in schema["properties"]
+    assert "raw_text" not in schema["properties"]
@@ -49,3 +49,31 @@ def test_router_wraps_parser_errors(write_file):
     path = write_file("bad.json", "{invalid")
     with pytest.raises(SpecParsingError):
         parse_spec(path, send_prompt_fn=lambda *a, **k: "", llm_fallback=False)
+
+
+def test_lean_mode_keeps_raw_text_by_reference(write_file):
+    path = write_file("spec.md", "# Title\nMust comply.\n")
+    result = parse_spec(path, send_prompt_fn=lambda *a, **k: "", lean=True)
+
+    assert result.spec.raw_text == ""
+    assert result.spec.raw_text_ref is not None
+    assert result.spec.raw_text_ref.path == str(path)
+    assert result.spec.get_raw_text() == "# Title\nMust comply.\n"
+
+
+@pytest.mark.fake_llm
+def test_lean_llm_parse_references_the_spec_file_not_the_echoed_text(write_file):
+    path = write_file("spec.txt", "The service must respond.\n")
+    answer = json.dumps({
+        "title": "Service",
+        "sections": {},
+        "requirements": ["The service must respond."],
+        "acceptance_criteria": [],
+        "examples": [],
+        "raw_text": "something the model made up",
+        "confidence": 0.9,
+    })
+    result = parse_spec(path, send_prompt_fn=lambda *a, **k: answer, use_llm=True, lean=True)
+
+    assert result.spec.raw_text == ""
+    assert result.spec.get_raw_text() == "The service must respond.\n"
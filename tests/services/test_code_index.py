@@ -0,0 +1,107 @@
+"""Tests for the persistent repository symbol index."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from llmtestgen.services.code_index import CodeIndex, parse_python_module
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+_STORE = '''"""Task storage."""
+from .models import Task
+
+
+class TaskStore:
+    """In-memory tasks."""
+
+    def add(self, task: Task) -> int:
+        """Store a task and return its id."""
+        return 1
+
+
+async def load(path: str = "tasks.json") -> list:
+    return []
+'''
+
+
+def _repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "src" / "app").mkdir(parents=True)
+    (root / "src" / "app" / "store.py").write_text(_STORE)
+    (root / "src" / "app" / "models.py").write_text("class Task:\n    pass\n")
+    (root / "README.md").write_text("docs")
+    return root
+
+
+def test_parse_python_module_extracts_symbols_and_imports():
+    record = parse_python_module("src/app/store.py", _STORE)
+
+    assert record.module == "app.store"
+    assert record.docstring == "Task storage."
+    assert record.imports == ["app.models"]
+    assert [(s.qualname, s.kind) for s in record.symbols] == [
+        ("TaskStore", "class"), ("TaskStore.add", "method"), ("load", "function"),
+    ]
+    assert record.symbols[1].signature == "def add(self, task: Task) -> int"
+    assert record.symbols[2].signature == "async def load(path: str='tasks.json') -> list"
+
+
+def test_syntax_errors_are_recorded_not_raised():
+    record = parse_python_module("bad.py", "def broken(:\n")
+    assert record.error and not record.symbols
+
+
+def test_index_is_incremental_and_persistent(tmp_path: Path):
+    root = _repo(tmp_path)
+    db = tmp_path / "index.sqlite"
+    files = ["src/app/store.py", "src/app/models.py", "README.md"]
+
+    with CodeIndex(db) as index:
+        assert index.update(root, files).model_dump() == {"parsed": 2, "reused": 0, "removed": 0}
+
+    models = root / "src" / "app" / "models.py"
+    models.write_text("class Task:\n    def done(self) -> bool:\n        return True\n")
+    os.utime(models, ns=(1, 1))
+    with CodeIndex(db) as index:
+        update = index.update(root, ["src/app/store.py", "src/app/models.py"])
+        assert (update.parsed, update.reused) == (1, 1)
+        assert index.has_symbol("app.models", "Task.done")
+        assert index.has_symbol("src/app/store.py", "TaskStore.add")
+        assert not index.has_symbol("app.store", "missing")
+        assert [s.path for s in index.find_symbols("add")] == ["src/app/store.py"]
+        assert index.importers_of("app.models") == ["src/app/store.py"]
+
+        assert index.update(root, ["src/app/store.py"]).removed == 1
+        assert index.paths() == ["src/app/store.py"]
+
+
+def test_outline_context_level_uses_signatures_instead_of_source(tmp_path: Path):
+    repo = GitRepository(str(_repo(tmp_path)))
+
+    context = build_python_code_context(repo, level=CodeContextLevel.OUTLINE)
+
+    assert "def add(self, task: Task) -> int  # Store a task and return its id." in context
+    assert "return 1" not in context
+
+
+def test_index_keys_object_mode_files_by_blob_sha(tmp_path: Path):
+    from git import Actor, Repo
+
+    root = _repo(tmp_path)
+    git_repo = Repo.init(root)
+    author = Actor("Test", "test@example.com")
+    git_repo.index.add(["src/app/store.py", "src/app/models.py"])
+    git_repo.index.commit("init", author=author, committer=author)
+    git_repo.close()
+    (root / "src" / "app" / "store.py").write_text("# edited, not committed\n")
+
+    with CodeIndex() as index:
+        repo = GitRepository(str(root), checkout=False)
+        assert index.update_repository(repo).parsed == 2
+        assert index.has_symbol("app.store", "TaskStore.add")  # committed version
+        assert index.update_repository(repo).reused == 2
+        repo.close()
@@ -0,0 +1,87 @@
+"""Tests for dry-run prompt, cost and latency forecasting."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.cost_forecast import (
+    ModelProfile,
+    count_tokens,
+    forecast_prompt,
+    forecast_test_generation,
+    load_price_table,
+    model_profile,
+)
+from llmtestgen.services.model_routing import ModelRoutingPolicy, PipelineStage
+
+
+def _project(tmp_path: Path) -> tuple[Path, Path]:
+    spec = tmp_path / "spec.md"
+    spec.write_text(
+        "# Tasks\n\n## Requirements\n- The system must create tasks.\n"
+        "- The system must delete tasks.\n"
+    )
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "tasks.py").write_text("def create_task(name):\n    return {'name': name}\n" * 50)
+    return spec, repo
+
+
+def test_heuristic_token_counts_depend_on_model_family():
+    text = "x" * 700
+    assert count_tokens(text, "anthropic/claude-3.5-sonnet") == (200, False)
+    assert count_tokens(text, "some-local-model")[0] == 195
+
+
+def test_price_lookup_uses_longest_prefix_and_free_variants(tmp_path: Path):
+    assert model_profile("openai/gpt-4o-mini-2024-07-18").input_per_mtok == 0.15
+    assert model_profile("gpt-4o").input_per_mtok == 2.50
+    assert model_profile("vendor/model:free").output_per_mtok == 0.0
+    assert model_profile("unknown/model").input_per_mtok is None
+
+    prices = tmp_path / "prices.json"
+    prices.write_text(json.dumps({"my-model": {"input_per_mtok": 1, "output_per_mtok": 2}}))
+    assert model_profile("lab/my-model", load_price_table(prices)).output_per_mtok == 2
+
+
+def test_forecast_prompt_cost_and_latency():
+    table = {"m": ModelProfile(input_per_mtok=1.0, output_per_mtok=10.0,
+                               output_tokens_per_s=100, prefill_tokens_per_s=1000,
+                               first_token_s=0.5)}
+    forecast = forecast_prompt(PipelineStage.GENERATE, "m", "a" * 3571, 1000, table=table)
+
+    assert forecast.input_tokens == 1000
+    assert forecast.cost_usd == pytest.approx((1000 * 1.0 + 1000 * 10.0) / 1e6)
+    assert forecast.latency_s == pytest.approx(0.5 + 1.0 + 10.0)
+
+
+@pytest.mark.fake_llm
+def test_dry_run_assembles_prompts_without_sending(tmp_path: Path):
+    spec, repo = _project(tmp_path)
+    routing = ModelRoutingPolicy(routes={"parse": "openai/gpt-4o-mini", "generate": "openai/gpt-4o"})
+
+    forecast = forecast_test_generation(spec, str(repo), use_llm_for_spec=True, routing=routing)
+
+    assert [(p.stage, p.model) for p in forecast.prompts] == [
+        (PipelineStage.PARSE, "openai/gpt-4o-mini"),
+        (PipelineStage.GENERATE, "openai/gpt-4o"),
+    ]
+    generate = forecast.prompts[1]
+    assert generate.input_tokens > 900  # includes the (truncated) code context
+    assert generate.output_tokens == 6 * 140  # 3 cases for each of 2 requirements
+    assert forecast.fully_priced
+    assert forecast.budget_violations(max_cost=1.0, max_input_tokens=10**6) == []
+    assert len(forecast.budget_violations(max_cost=1e-6, max_input_tokens=10)) == 2
+    assert "Total:" in forecast.render()
+
+
+def test_unknown_prices_fail_a_cost_budget(tmp_path: Path):
+    spec, _ = _project(tmp_path)
+    forecast = forecast_test_generation(spec, None, model="unknown/model")
+
+    assert [p.stage for p in forecast.prompts] == [PipelineStage.GENERATE]
+    assert forecast.budget_violations(max_cost=100.0) == [
+        "cost cannot be checked: some models have no known price"
+    ]
@@ -0,0 +1,121 @@
+# tests/services/test_model_routing.py
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from llmtestgen.services.model_routing import ModelRoutingPolicy, PromptSize
+from llmtestgen.services.spec_analyser.parse_router_normalizer import (
+    NormalizedSpec,
+    parse_spec,
+)
+from llmtestgen.services.test_generation.test_spec_generator import TestSpecGenerator
+
+
+def _parsed_spec_json(confidence: int) -> str:
+    return json.dumps(
+        {
+            "title": "Spec",
+            "sections": {},
+            "requirements": [f"must work ({confidence})"],
+            "acceptance_criteria": [],
+            "examples": [],
+            "confidence": confidence,
+        }
+    )
+
+
+def test_select_prefers_size_route_then_stage_then_default():
+    policy = ModelRoutingPolicy(
+        default_model="base",
+        routes={"parse": "cheap", "generate.large": "long-context"},
+        small_prompt_chars=100,
+        large_prompt_chars=1000,
+    )
+
+    assert policy.select("parse", 5000) == "cheap"
+    assert policy.select("generate", 5000) == "long-context"
+    assert policy.select("generate", 500) == "base"
+    assert policy.size_class(50) is PromptSize.SMALL
+
+
+def test_from_env_and_overrides():
+    env = {
+        "LLMTESTGEN_PARSE_MODEL": "cheap  # inline comment",
+        "LLMTESTGEN_GENERATE_MODEL_LARGE": "long-context",
+        "LLMTESTGEN_GENERATE_MODEL": "",
+        "LLMTESTGEN_ESCALATION_MODEL": "strong",
+        "LLMTESTGEN_ESCALATION_CONFIDENCE": "0.5",
+    }
+    policy = ModelRoutingPolicy.from_env(env)
+
+    assert policy.routes == {"parse": "cheap", "generate.large": "long-context"}
+    assert policy.escalation_model == "strong"
+    assert policy.escalation_confidence == 0.5
+
+    overridden = policy.with_overrides(routes=["generate.small=tiny"], parse="cli-cheap")
+    assert overridden.routes["parse"] == "cli-cheap"
+    assert overridden.routes["generate.small"] == "tiny"
+    with pytest.raises(ValueError, match="expected one of parse, generate"):
+        policy.with_overrides(routes=["review=model"])
+    with pytest.raises(ValueError, match="expected one of small, medium, large"):
+        policy.with_overrides(routes=["parse.huge=model"])
+
+
+@pytest.mark.fake_llm
+def test_llm_parsing_uses_parse_route_and_escalates_on_low_confidence(write_file):
+    path = write_file("spec.txt", "The system must work.")
+    calls = []
+
+    def send(prompt, *, model=None, **kwargs):
+        calls.append(model)
+        return _parsed_spec_json(40 if model == "cheap" else 95)
+
+    policy = ModelRoutingPolicy(routes={"parse": "cheap"}, escalation_model="strong")
+    result = parse_spec(path, send_prompt_fn=send, model="base", use_llm=True, routing=policy)
+
+    assert calls == ["cheap", "strong"]
+    assert result.spec.requirements == ["must work (95)"]
+    assert any("stronger model strong" in w for w in result.warnings)
+
+
+@pytest.mark.fake_llm
+def test_llm_parsing_does_not_escalate_when_confident(write_file):
+    path = write_file("spec.txt", "The system must work.")
+    calls = []
+
+    def send(prompt, *, model=None, **kwargs):
+        calls.append(model)
+        return _parsed_spec_json(90)
+
+    policy = ModelRoutingPolicy(routes={"parse": "cheap"}, escalation_model="strong")
+    parse_spec(path, send_prompt_fn=send, use_llm=True, routing=policy)
+
+    assert calls == ["cheap"]
+
+
+def test_generation_escalates_on_invalid_json():
+    calls = []
+
+    def send(prompt, *, model=None, **kwargs):
+        calls.append(model)
+        if model == "strong":
+            return json.dumps({"test_cases": [{"description": "ok", "expected_result": "ok"}]})
+        return "not json"
+
+    generator = TestSpecGenerator(
+        send, model="base", routing=ModelRoutingPolicy(escalation_model="strong")
+    )
+    result = generator.generate(NormalizedSpec(source_path="spec.md"))
+
+    assert calls == ["base", "strong"]
+    assert result.llm_model == "strong"
+    assert len(result.test_cases) == 1
+
+
+def test_generation_without_escalation_model_still_raises():
+    generator = TestSpecGenerator(lambda *a, **k: "not json", model="base")
+    with pytest.raises(ValueError):
+        generator.generate(NormalizedSpec(source_path="spec.md"))
@@ -0,0 +1,121 @@
+"""Tests for the SQLite results store and its query CLI."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from llmtestgen.results_cli import run
+from llmtestgen.services.results_store import ResultsStore
+from llmtestgen.services.test_generation.jsonl_io import write_test_specs_jsonl
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+
+def _case(case_id: str, requirement: str, *elements: str, expected: str = "ok") -> TestCase:
+    return TestCase(
+        id=case_id,
+        requirement=requirement,
+        description=f"Check {case_id}",
+        expected_result=expected,
+        target_code_elements=list(elements),
+    )
+
+
+def _spec(*cases: TestCase, source: str = "specs/tasks.md") -> TestSpecification:
+    return TestSpecification(spec_source_path=source, llm_model="m", test_cases=list(cases))
+
+
+def test_queries_by_requirement_and_code_element():
+    with ResultsStore() as store:
+        first = store.record_run(
+            [
+                _spec(
+                    _case("TC-1", "Create tasks", "tasks.create_task"),
+                    _case("TC-2", "Delete tasks", "tasks.TaskStore.delete", "tasks.create_task"),
+                ),
+                _spec(_case("TC-1", "Create users", "users.create"), source="specs/users.md"),
+            ],
+            label="nightly",
+        )
+        second = store.record_run([_spec(_case("TC-1", "Create tasks", "tasks.create_task"))])
+
+        hits = store.cases_for_requirement("Create tasks")
+        assert [(h.run_id, h.test_case.id) for h in hits] == [(second, "TC-1"), (first, "TC-1")]
+        assert len(store.cases_for_requirement("TASKS", contains=True, run_id=first)) == 2
+        assert len(store.cases_for_requirement("users", contains=True)) == 1
+
+        in_tasks = store.cases_for_code_element("tasks", run_id=first)
+        assert [h.test_case.id for h in in_tasks] == ["TC-1", "TC-2"]
+        assert store.cases_for_code_element("tasks.create") == []
+
+        [latest, oldest] = store.runs()
+        assert (latest.id, latest.spec_count, latest.test_case_count) == (second, 1, 1)
+        assert (oldest.label, oldest.spec_count, oldest.test_case_count) == ("nightly", 2, 3)
+        assert store.test_specification(first, "specs/users.md").test_cases[0].requirement == (
+            "Create users"
+        )
+
+
+def test_diff_between_runs():
+    with ResultsStore() as store:
+        old = store.record_run([_spec(_case("TC-1", "A"), _case("TC-2", "B"), _case("TC-3", "C"))])
+        new = store.record_run(
+            [_spec(_case("TC-1", "A"), _case("TC-2", "B", expected="changed"), _case("TC-4", "D"))]
+        )
+
+        diff = store.diff_runs(old, new)
+
+    assert [s.test_case.id for s in diff.added] == ["TC-4"]
+    assert [s.test_case.id for s in diff.removed] == ["TC-3"]
+    assert [(c.before.expected_result, c.after.expected_result) for c in diff.changed] == [
+        ("ok", "changed")
+    ]
+    assert diff.unchanged == 1
+
+
+def test_lookups_use_indexes():
+    with ResultsStore() as store:
+        plans = [
+            " ".join(
+                row[-1]
+                for row in store._conn.execute(
+                    "EXPLAIN QUERY PLAN " + query, params
+                )
+            )
+            for query, params in [
+                ("SELECT id FROM test_cases WHERE requirement_id = ? AND run_id = ?", (1, 1)),
+                ("SELECT case_id FROM case_elements WHERE element_id = ?", (1,)),
+                ("SELECT id FROM requirements WHERE text = ?", ("x",)),
+            ]
+        ]
+
+    assert all("USING" in plan and "INDEX" in plan for plan in plans), plans
+
+
+def test_deleting_a_run_removes_its_cases():
+    with ResultsStore() as store:
+        run_id = store.record_run([_spec(_case("TC-1", "A", "mod.f"))])
+        store.delete_run(run_id)
+
+        assert store.runs() == []
+        assert store.cases_for_code_element("mod.f") == []
+
+
+def test_cli_imports_jsonl_and_diffs(tmp_path: Path, capsys):
+    db = str(tmp_path / "results.db")
+    first, second = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+    write_test_specs_jsonl([_spec(_case("TC-1", "A", "mod.f"))], first)
+    write_test_specs_jsonl([_spec(_case("TC-1", "A", "mod.f"), _case("TC-2", "B"))], second)
+
+    assert run(["--db", db, "import", str(first)]) == 0
+    assert run(["--db", db, "import", str(second), "--label", "after"]) == 0
+    capsys.readouterr()
+
+    assert run(["--db", db, "diff"]) == 0
+    out = capsys.readouterr().out
+    assert "+ specs/tasks.md  TC-2: Check TC-2" in out
+    assert "1 added, 0 removed, 0 changed, 1 unchanged" in out
+
+    assert run(["--db", db, "element", "mod"]) == 0
+    assert "2 test case(s)" in capsys.readouterr().out
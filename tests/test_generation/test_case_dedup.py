@@ -0,0 +1,93 @@
+# tests/test_generation/test_case_dedup.py
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.case_dedup import (
+    TestCaseDeduplicator,
+    deduplicate_test_cases,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecGenerator,
+)
+
+
+def _case(case_id: str, description: str, steps, expected: str) -> TestCase:
+    return TestCase(id=case_id, description=description, steps=steps, expected_result=expected)
+
+
+LOGIN = _case(
+    "TC-1",
+    "Login with valid credentials",
+    ["Open the login page", "Enter a valid username and password", "Submit the form"],
+    "The user is redirected to the dashboard.",
+)
+LOGIN_REWORDED = _case(
+    "TC-2",
+    "Login with valid credentials works",
+    ["Open the login page", "Enter a valid username and password", "Submit the form"],
+    "The user is redirected to the dashboard page.",
+)
+LOGOUT = _case(
+    "TC-3",
+    "Logout ends the session",
+    ["Log in", "Click the logout button"],
+    "The session cookie is cleared.",
+)
+
+
+def test_near_duplicates_are_removed_with_similarity():
+    result = deduplicate_test_cases([LOGIN, LOGOUT, LOGIN_REWORDED])
+
+    assert result.kept == [0, 1]
+    [report] = result.duplicates
+    assert (report.kept_id, report.removed_id) == ("TC-1", "TC-2")
+    assert (report.kept_index, report.removed_index) == (0, 2)
+    assert 0.8 <= report.similarity < 1.0
+
+
+def test_threshold_controls_what_counts_as_duplicate():
+    assert deduplicate_test_cases([LOGIN, LOGIN_REWORDED], threshold=0.99).kept == [0, 1]
+    assert deduplicate_test_cases([LOGIN, LOGIN.model_copy()], threshold=1.0).kept == [0]
+
+
+def test_deduplicator_is_incremental_across_batches():
+    dedup = TestCaseDeduplicator()
+
+    first = dedup.deduplicate([LOGIN, LOGOUT])
+    second = dedup.deduplicate([LOGIN_REWORDED])
+
+    assert first.kept == [0, 1]
+    assert second.kept == []
+    assert second.duplicates[0].removed_index == 2  # position across the whole stream
+    assert len(dedup) == 2
+
+
+def test_invalid_parameters_are_rejected():
+    with pytest.raises(ValueError):
+        TestCaseDeduplicator(threshold=0)
+    with pytest.raises(ValueError):
+        TestCaseDeduplicator(num_perm=10, bands=3)
+
+
+def test_generator_dedupes_llm_output():
+    response = json.dumps({"test_cases": [c.model_dump() for c in (LOGIN, LOGIN_REWORDED, LOGOUT)]})
+    spec = NormalizedSpec(source_path="spec.md")
+
+    result = TestSpecGenerator(lambda *a, **k: response).generate(spec)
+    assert [tc.id for tc in result.test_cases] == ["TC-1", "TC-3"]
+    assert [d.removed_id for d in result.duplicates] == ["TC-2"]
+
+    kept_all = TestSpecGenerator(lambda *a, **k: response, dedup_threshold=None).generate(spec)
+    assert len(kept_all.test_cases) == 3
+    assert kept_all.duplicates == []
+
+
+def test_generator_rejects_bad_threshold_before_calling_the_llm():
+    with pytest.raises(ValueError):
+        TestSpecGenerator(lambda *a, **k: "", dedup_threshold=1.5)
@@ -0,0 +1,89 @@
+"""Tests for the session-scoped repository context cache."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+
+from llmtestgen.services.test_generation.context_cache import RepoContextCache
+from llmtestgen.services.test_generation.context_compression import ContextCompression
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+
+def _repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    root.mkdir()
+    for idx in range(4):
+        (root / f"mod{idx}.py").write_text(f"def f{idx}():\n    return {idx}\n")
+    return root
+
+
+def test_context_is_memoized_until_a_file_changes(tmp_path: Path):
+    root = _repo(tmp_path)
+    cache = RepoContextCache()
+
+    first = build_python_code_context(GitRepository(str(root)), cache=cache)
+    second = build_python_code_context(GitRepository(str(root)), cache=cache)
+    assert first == second
+    assert (cache.context_misses, cache.context_hits) == (1, 1)
+    assert cache.file_misses == 4
+
+    changed = root / "mod1.py"
+    changed.write_text("def f1():\n    return 'changed'\n")
+    os.utime(changed, ns=(1, 1))
+    third = build_python_code_context(GitRepository(str(root)), cache=cache)
+
+    assert "'changed'" in third
+    assert cache.context_misses == 2
+    assert (cache.file_misses, cache.file_hits) == (5, 3)  # only mod1 re-read
+
+
+def test_settings_are_part_of_the_context_key(tmp_path: Path):
+    repo = GitRepository(str(_repo(tmp_path)))
+    cache = RepoContextCache()
+
+    build_python_code_context(repo, cache=cache, level=CodeContextLevel.FULL)
+    build_python_code_context(
+        repo, cache=cache, level=CodeContextLevel.FULL, compression=ContextCompression.disabled()
+    )
+
+    assert cache.context_misses == 2
+
+
+def test_file_cache_is_bounded_by_bytes():
+    cache = RepoContextCache(max_bytes=10)
+
+    for key in "abc":
+        cache.file(key, lambda: "x" * 4, len)
+
+    assert cache.cached_bytes == 8
+    cache.file("a", lambda: "reloaded", len)
+    assert cache.file_misses == 4  # "a" was evicted first
+
+
+def test_concurrent_requests_build_once():
+    cache = RepoContextCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.1)
+        return "context"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.context("k", build)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["context"] * 4
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+"""Tests for code context compression."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from llmtestgen.services.test_generation.context_compression import (
+    ContextCompression,
+    compress_python_source,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+SOURCE = '''# Copyright (c) Example Corp.
+# Licensed under the Apache License, Version 2.0.
+"""Task helpers."""
+
+
+import os  # inline comments stay
+
+URL = "http://example.com/#anchor"
+TEMPLATE = """
+# not a comment: part of a string
+"""
+
+
+def create(name):
+    """Create a task."""
+    # normalise the name
+    return name.strip()   
+
+
+class Empty:
+    """Nothing here."""
+'''
+
+
+def test_comment_only_lines_and_blank_runs_are_dropped():
+    result = compress_python_source(SOURCE)
+
+    assert "Copyright" not in result and "normalise" not in result
+    assert "import os  # inline comments stay" in result
+    assert "# not a comment: part of a string" in result
+    assert "\n\n\n" not in result and "   \n" not in result
+    assert '"""Create a task."""' in result
+    compile(result, "<compressed>", "exec")
+
+
+def test_docstrings_are_stripped_on_request_and_code_stays_valid():
+    result = compress_python_source(SOURCE, strip_docstrings=True)
+
+    assert "Task helpers" not in result and "Create a task" not in result
+    assert "class Empty:\n    ..." in result
+    compile(result, "<compressed>", "exec")
+
+
+def test_docstrings_sharing_a_line_with_code_are_kept():
+    source = (
+        'def f(): """doc"""\n'
+        "\n"
+        "class A:\n"
+        '    def g(self): """d"""; return 1\n'
+    )
+
+    result = compress_python_source(source, strip_docstrings=True)
+
+    assert result == source.rstrip("\n")
+    compile(result, "<compressed>", "exec")
+
+
+def test_truncated_source_falls_back_to_line_based_pass():
+    head = 'def f():\n    # comment\n    x = """unterminated\n'
+    assert compress_python_source(head) == 'def f():\n    x = """unterminated'
+
+
+def test_identical_files_are_sent_once_with_aliases(tmp_path: Path):
+    root = tmp_path / "repo"
+    for name in ("a", "b", "c"):
+        (root / name).mkdir(parents=True)
+        (root / name / "util.py").write_text(f"# vendored copy {name}\ndef helper():\n    return 1\n")
+    (root / "main.py").write_text("def main():\n    return 2\n")
+    repo = GitRepository(str(root))
+
+    compressed = build_python_code_context(repo, level=CodeContextLevel.FULL)
+    verbatim = build_python_code_context(
+        repo, level=CodeContextLevel.FULL, compression=ContextCompression.disabled()
+    )
+
+    assert compressed.count("def helper():") == 1
+    assert "# Identical copies:" in compressed
+    assert verbatim.count("def helper():") == 3
+    assert len(compressed) < len(verbatim)
@@ -0,0 +1,167 @@
+"""Tests for coverage-guided code context."""
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.coverage_targeting import (
+    CoverageData,
+    CoverageError,
+    FileCoverageData,
+    focus_uncovered,
+    run_suite_with_coverage,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestSpecGenerator,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+TASKS = (
+    "def create_task(name):\n"          # 1
+    "    if not name:\n"                # 2
+    "        raise ValueError('empty')\n"  # 3
+    "    return {'name': name}\n"       # 4
+    "\n"
+    "\n"
+    "def delete_task(tasks, name):\n"   # 7
+    "    tasks.pop(name)\n"             # 8
+    "    return tasks\n"                # 9
+)
+COVERED = 'def add(a, b):\n    """Add."""\n    return a + b\n'
+
+
+def _numbits(lines) -> bytes:
+    bits = bytearray(max(lines) // 8 + 1)
+    for line in lines:
+        bits[line // 8] |= 1 << (line % 8)
+    return bytes(bits)
+
+
+def _coverage_db(path: Path, executed: dict) -> Path:
+    """Minimal coverage.py data file (the `file` and `line_bits` tables)."""
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "CREATE TABLE file (id INTEGER PRIMARY KEY, path TEXT);"
+        "CREATE TABLE line_bits (file_id INTEGER, context_id INTEGER, numbits BLOB);"
+    )
+    for file_id, (file_path, lines) in enumerate(executed.items(), start=1):
+        conn.execute("INSERT INTO file VALUES (?, ?)", (file_id, file_path))
+        conn.execute("INSERT INTO line_bits VALUES (?, 1, ?)", (file_id, _numbits(lines)))
+    conn.commit()
+    conn.close()
+    return path
+
+
+def _repo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "tasks.py").write_text(TASKS)
+    (root / "pkg" / "covered.py").write_text(COVERED)
+    (root / "pkg" / "unused.py").write_text("VALUE = 1\n")
+    return root
+
+
+def test_data_file_is_mapped_onto_sources(tmp_path: Path):
+    # Measured elsewhere (e.g. CI): matched by path suffix
+    data = CoverageData.load(
+        _coverage_db(tmp_path / ".coverage", {"/ci/build/pkg/tasks.py": [1, 2, 4, 7]})
+    )
+
+    cov = data.analyse("pkg/tasks.py", TASKS)
+
+    assert cov.missing_lines == [3, 8, 9]
+    assert [(fn.qualname, fn.statements, fn.missing) for fn in cov.functions] == [
+        ("create_task", 3, 1),
+        ("delete_task", 2, 2),
+    ]
+    assert cov.partial_branches == ["line 2 never true"]
+    assert "delete_task (untested)" in cov.summary()
+
+    unused = data.analyse("pkg/unused.py", "VALUE = 1\n")
+    assert not unused.measured and unused.missing_lines == [1]
+
+
+def test_json_report_branches(tmp_path: Path):
+    report = tmp_path / "coverage.json"
+    report.write_text(
+        json.dumps(
+            {
+                "files": {
+                    "pkg/tasks.py": {
+                        "executed_lines": [1, 2, 3, 7],
+                        "missing_lines": [4, 8, 9],
+                        "missing_branches": [[2, 4]],
+                    }
+                }
+            }
+        )
+    )
+
+    cov = CoverageData.load(report).analyse("pkg/tasks.py", TASKS)
+
+    assert cov.missing_lines == [4, 8, 9]
+    assert cov.partial_branches == ["line 2 never jumped to line 4"]
+
+    (tmp_path / "bad.json").write_text("[]")
+    with pytest.raises(CoverageError):
+        CoverageData.load(tmp_path / "bad.json")
+
+
+def test_focus_uncovered_collapses_covered_bodies():
+    data = CoverageData({"tasks.py": FileCoverageData(executed_lines=[1, 2, 3, 4, 7])})
+
+    focused = focus_uncovered(TASKS, data.analyse("tasks.py", TASKS))
+
+    assert "raise ValueError" not in focused
+    assert "def create_task(name):\n    ...  # covered by existing tests\n" in focused
+    assert "tasks.pop(name)" in focused
+
+
+def test_context_puts_untested_code_first(tmp_path: Path):
+    root = _repo(tmp_path)
+    data = CoverageData.load(
+        _coverage_db(
+            tmp_path / ".coverage",
+            {str(root / "pkg" / "tasks.py"): [1, 2, 4, 7], str(root / "pkg" / "covered.py"): [1, 3]},
+        )
+    )
+    repo = GitRepository(str(root))
+
+    context = build_python_code_context(repo, coverage=data)
+
+    assert "Untested areas according to the existing test suite" in context
+    summary = context.split("Detailed code context:")[0]
+    assert summary.index("pkg/tasks.py: 57%") < summary.index("pkg/unused.py: never imported")
+    assert "# FILE: pkg/covered.py" not in context
+    assert "[Fully covered by existing tests, not detailed: pkg/covered.py]" in context
+    assert context.index("# FILE: pkg/tasks.py") < context.index("# FILE: pkg/unused.py")
+
+    seen = {}
+
+    def send(prompt, **_kwargs):
+        seen["prompt"] = prompt
+        return '{"test_cases": []}'
+
+    generator = TestSpecGenerator(send, model="m", coverage=data)
+    generator.generate(NormalizedSpec(source_path="spec.md"), repo)
+    assert "prioritize the untested functions and branches" in seen["prompt"]
+
+
+def test_run_suite_with_coverage(tmp_path: Path):
+    pytest.importorskip("coverage")
+    root = _repo(tmp_path)
+    (root / "test_tasks.py").write_text(
+        "from pkg.tasks import create_task\n\n"
+        "def test_create():\n    assert create_task('a') == {'name': 'a'}\n"
+    )
+
+    data = run_suite_with_coverage(root)
+    cov = data.analyse("pkg/tasks.py", TASKS)
+
+    assert cov.missing_lines == [3, 8, 9]
+    assert "line 2 never true" in cov.partial_branches
@@ -0,0 +1,110 @@
+"""Tests for JSON Lines output and the streaming loader."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.test_generation.jsonl_io import (
+    TestSpecHeader,
+    iter_jsonl_records,
+    iter_test_cases_jsonl,
+    load_test_spec_jsonl,
+    read_test_specs_jsonl,
+    write_test_specs_jsonl,
+)
+from llmtestgen.services.test_generation.python_test_writer import write_test_spec_file_outcome
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+
+def _spec(count: int, source: str = "specs/demo.md") -> TestSpecification:
+    return TestSpecification(
+        spec_source_path=source,
+        llm_model="test-model",
+        test_cases=[
+            TestCase(
+                id=f"case_{i}",
+                requirement='The "record" key\nis only a key in headers',
+                description=f"Case {i}",
+                steps=["step"],
+                expected_result="Works",
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def test_jsonl_output_round_trips(tmp_path: Path) -> None:
+    path = tmp_path / "out.jsonl"
+    spec = _spec(3)
+
+    assert write_test_spec_file_outcome(spec, path).written
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    assert json.loads(lines[0]) == {
+        "record": "header",
+        "format": 1,
+        "spec_source_path": "specs/demo.md",
+        "llm_model": "test-model",
+        "test_case_count": 3,
+    }
+    assert len(lines) == 4
+    assert load_test_spec_jsonl(path) == spec
+    assert not write_test_spec_file_outcome(spec, path).written
+
+
+def test_case_with_a_record_string_value_is_not_a_header(tmp_path: Path) -> None:
+    path = tmp_path / "out.jsonl"
+    spec = _spec(1)
+    spec.test_cases[0].target_code_elements = ["record"]
+
+    write_test_specs_jsonl([spec], path)
+
+    assert load_test_spec_jsonl(path) == spec
+
+
+def test_several_specs_stream_back_one_at_a_time(tmp_path: Path) -> None:
+    path = tmp_path / "batch.jsonl"
+    write_test_specs_jsonl((_spec(n, f"specs/{n}.md") for n in (2, 0, 1)), path)
+
+    specs = read_test_specs_jsonl(path)
+    first = next(specs)
+    assert (first.spec_source_path, len(first.test_cases)) == ("specs/2.md", 2)
+    assert [(s.spec_source_path, len(s.test_cases)) for s in specs] == [
+        ("specs/0.md", 0),
+        ("specs/1.md", 1),
+    ]
+    assert len(list(iter_test_cases_jsonl(path))) == 3
+
+
+def test_records_are_validated_lazily(tmp_path: Path) -> None:
+    path = tmp_path / "broken.jsonl"
+    good = _spec(1)
+    path.write_text(
+        TestSpecHeader.of(good).model_dump_json()
+        + "\n"
+        + good.test_cases[0].model_dump_json()
+        + "\n\n"
+        + '{"id": "x"}\n',
+        encoding="utf-8",
+    )
+
+    records = iter_jsonl_records(path)
+    assert isinstance(next(records), TestSpecHeader)
+    assert next(records) == good.test_cases[0]
+    with pytest.raises(ValueError, match=r"broken\.jsonl:4"):
+        next(records)
+
+
+def test_bare_test_case_lines_are_accepted(tmp_path: Path) -> None:
+    path = tmp_path / "cases.jsonl"
+    path.write_text('{"description": "d", "expected_result": "r"}\n', encoding="utf-8")
+
+    [spec] = read_test_specs_jsonl(path)
+
+    assert spec.spec_source_path == ""
+    assert [tc.description for tc in spec.test_cases] == ["d"]
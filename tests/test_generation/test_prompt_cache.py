@@ -0,0 +1,80 @@
+"""Tests for cache-aware prompt assembly and usage reporting."""
+from __future__ import annotations
+
+import json
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.prompt_cache import (
+    CacheAwarePromptAssembler,
+    supports_cache_control,
+)
+from llmtestgen.services.test_generation.test_spec_generator import TestSpecGenerator
+
+
+def _spec(title: str) -> NormalizedSpec:
+    return NormalizedSpec(title=title, requirements=["must work"], source_path=f"{title}.md")
+
+
+def test_supports_cache_control_by_model_prefix() -> None:
+    assert supports_cache_control("anthropic/claude-3.5-sonnet")
+    assert supports_cache_control("google/gemini-2.0-flash")
+    assert not supports_cache_control("openai/gpt-4o-mini")
+    assert not supports_cache_control(None)
+
+
+def test_assembler_puts_stable_blocks_first() -> None:
+    prompt = CacheAwarePromptAssembler().assemble(
+        system_prompt="sys",
+        stable_blocks=["CODE"],
+        volatile_blocks=["SPEC", "INSTRUCTIONS"],
+        model="openai/gpt-4o-mini",
+    )
+
+    assert prompt.user_text == "CODE\n\nSPEC\n\nINSTRUCTIONS"
+    assert prompt.user_content() == prompt.user_text
+
+
+def test_assembler_emits_cache_control_parts_when_supported() -> None:
+    prompt = CacheAwarePromptAssembler().assemble(
+        system_prompt="sys",
+        stable_blocks=["CODE"],
+        volatile_blocks=["SPEC"],
+        model="anthropic/claude-3.5-sonnet",
+    )
+
+    parts = prompt.user_content()
+    assert parts[0] == {"type": "text", "text": "CODE", "cache_control": {"type": "ephemeral"}}
+    assert parts[1] == {"type": "text", "text": "SPEC"}
+
+
+def test_prompts_for_different_specs_share_code_prefix() -> None:
+    generator = TestSpecGenerator(lambda *a, **k: "", model="m")
+
+    first = generator._build_user_prompt(_spec("alpha"), "def f(): pass")
+    second = generator._build_user_prompt(_spec("beta"), "def f(): pass")
+
+    prefix = "Code context (Python project):\n\ndef f(): pass"
+    assert first.startswith(prefix) and second.startswith(prefix)
+    assert first != second
+
+
+def test_generate_reports_cached_tokens_from_usage() -> None:
+    def _send(prompt, *, on_response=None, **_kwargs):
+        on_response(
+            {
+                "choices": [{"message": {"content": "{}"}}],
+                "usage": {
+                    "prompt_tokens": 2000,
+                    "completion_tokens": 100,
+                    "prompt_tokens_details": {"cached_tokens": 1500},
+                },
+            }
+        )
+        return json.dumps({"test_cases": []})
+
+    result = TestSpecGenerator(_send, model="m").generate(_spec("alpha"))
+
+    assert result.usage is not None
+    assert result.usage.cached_tokens == 1500
+    assert result.usage.total_tokens == 2100
+    assert result.usage.cache_hit_ratio == 0.75
@@ -0,0 +1,183 @@
+# tests/test_generation/test_pytest_validation.py
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from llmtestgen.services.test_generation.python_test_writer import (
+    build_pytest_module,
+    resolve_target_import,
+)
+from llmtestgen.services.test_generation.pytest_validation import (
+    build_llm_case_regenerator,
+    check_compile,
+    emit_validated_pytest,
+    validate_pytest_module,
+    validate_pytest_modules,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+
+def _case(case_id: str, targets=(), preconditions=()) -> TestCase:
+    return TestCase(
+        id=case_id,
+        description=f"Check {case_id}",
+        preconditions=list(preconditions),
+        steps=["do it"],
+        expected_result="it works",
+        target_code_elements=list(targets),
+    )
+
+
+def _spec(*cases: TestCase) -> TestSpecification:
+    return TestSpecification(spec_source_path="spec.md", test_cases=list(cases), llm_model="m")
+
+
+def _make_repo(tmp_path: Path) -> Path:
+    pkg = tmp_path / "repo" / "shop"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cart.py").write_text("def add_item(cart, item):\n    return cart + [item]\n")
+    return tmp_path / "repo"
+
+
+def test_resolve_target_import_handles_paths_and_dotted_names():
+    assert resolve_target_import("shop/cart.py::add_item").statement() == (
+        "from shop.cart import add_item"
+    )
+    assert resolve_target_import("shop.models.Cart.total").statement() == (
+        "from shop.models import Cart"
+    )
+    assert resolve_target_import("shop/__init__.py").statement() == "import shop"
+    assert resolve_target_import("src/shop/cart.py::add_item").statement() == (
+        "from shop.cart import add_item"
+    )
+    assert resolve_target_import("the checkout flow") is None
+
+
+def test_build_pytest_module_shares_precondition_fixtures():
+    spec = _spec(
+        _case("a", preconditions=["Cart is empty"]),
+        _case("b", preconditions=["Cart is empty"]),
+    )
+
+    module = build_pytest_module(spec)
+
+    assert module.source.count("def precondition_cart_is_empty():") == 1
+    assert "def test_001_a(precondition_cart_is_empty):" in module.source
+    assert "def test_002_b(precondition_cart_is_empty):" in module.source
+    lines = module.source.splitlines()
+    start, end = module.case_spans[1]
+    assert lines[start - 1].startswith("def test_002_b")
+    assert lines[end - 1].strip() == 'assert False, "Not implemented yet"'
+
+
+def test_check_compile_attributes_syntax_error_to_case():
+    module = build_pytest_module(_spec(_case("a"), _case("b")))
+    broken = module.case_sources[1].replace("assert False", "assert (")
+    module = module.model_copy(
+        update={
+            "source": module.source.replace(module.case_sources[1], broken),
+            "case_sources": [module.case_sources[0], broken],
+        }
+    )
+
+    result = check_compile(module)
+
+    assert not result.ok
+    assert [f.index for f in result.failures] == [1]
+    assert result.failures[0].stage == "compile"
+
+
+def test_collect_reports_unresolved_import_per_case(tmp_path: Path):
+    repo = _make_repo(tmp_path)
+    spec = _spec(
+        _case("good", targets=["shop/cart.py::add_item"]),
+        _case("bad", targets=["shop/payment.py::charge"]),
+    )
+
+    result = validate_pytest_module(build_pytest_module(spec), repo_root=repo)
+
+    assert [(f.index, f.module) for f in result.failures] == [(1, "shop.payment")]
+
+
+def test_skip_placeholders_make_the_module_run_with_every_case_skipped(tmp_path: Path):
+    spec = _spec(_case("a", preconditions=["Cart is empty"]), _case("b"))
+    test_file = tmp_path / "test_generated.py"
+    module = build_pytest_module(spec, skip_placeholders=True)
+    test_file.write_text(module.source, encoding="utf-8")
+
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", str(test_file)],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+
+    assert proc.returncode == 0, proc.stdout
+    assert "2 skipped" in proc.stdout
+
+
+def test_emit_validated_pytest_regenerates_only_failing_cases(tmp_path: Path):
+    repo = _make_repo(tmp_path)
+    spec = _spec(
+        _case("good", targets=["shop/cart.py::add_item"]),
+        _case("bad", targets=["shop/payment.py::charge"]),
+    )
+    calls = []
+
+    def regenerate(case: TestCase, error: str) -> TestCase:
+        calls.append((case.id, error))
+        return case.model_copy(update={"target_code_elements": ["shop/cart.py::add_item"]})
+
+    [emission] = emit_validated_pytest([spec], repo_root=repo, regenerate_fn=regenerate)
+
+    assert [case_id for case_id, _ in calls] == ["bad"]
+    assert emission.regenerated == [1]
+    assert emission.validation.ok
+    assert emission.validation.collected == 2
+    # The caller's spec is not mutated
+    assert spec.test_cases[1].target_code_elements == ["shop/payment.py::charge"]
+
+
+def test_emit_validated_pytest_comments_out_imports_without_regenerator(tmp_path: Path):
+    repo = _make_repo(tmp_path)
+    spec = _spec(_case("bad", targets=["shop/payment.py::charge"]))
+
+    [emission] = emit_validated_pytest([spec], repo_root=repo)
+
+    assert emission.skipped_imports == ["shop.payment"]
+    assert "# unresolved import: from shop.payment import charge" in emission.module.source
+    assert emission.validation.ok
+
+
+def test_validate_pytest_modules_in_process_pool_keeps_order():
+    modules = [build_pytest_module(_spec(_case(f"c{i}"))) for i in range(3)]
+    broken = modules[1].model_copy(update={"source": modules[1].source + "def (:\n"})
+    modules[1] = broken
+
+    results = validate_pytest_modules(modules, collect=False, max_workers=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+
+
+def test_llm_case_regenerator_merges_answer_and_keeps_case_on_bad_json():
+    prompts = []
+
+    def send(prompt, *, api_key=None, model=None, system_prompt=None, **kwargs):
+        prompts.append(prompt)
+        return json.dumps({"target_code_elements": ["shop/cart.py::add_item"]})
+
+    regenerate = build_llm_case_regenerator(send, model="m")
+    fixed = regenerate(_case("bad", targets=["x.py::y"]), "Cannot import: from x import y")
+
+    assert fixed.id == "bad"
+    assert fixed.target_code_elements == ["shop/cart.py::add_item"]
+    assert "Cannot import: from x import y" in prompts[0]
+
+    unchanged = build_llm_case_regenerator(lambda *a, **k: "not json")(_case("z"), "err")
+    assert unchanged.id == "z"
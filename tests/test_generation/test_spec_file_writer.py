@@ -0,0 +1,80 @@
+"""Tests for streaming, atomic and skip-if-unchanged Markdown output."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from llmtestgen.services.test_generation.python_test_writer import (
+    iter_test_spec_file_markdown,
+    render_test_spec_file_markdown,
+    write_test_spec_file,
+    write_test_spec_file_outcome,
+    write_test_spec_files,
+)
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestCase,
+    TestSpecification,
+)
+
+
+def _spec(count: int, source: str = "specs/demo.md") -> TestSpecification:
+    return TestSpecification(
+        spec_source_path=source,
+        llm_model="test-model",
+        test_cases=[
+            TestCase(id=f"case_{i}", description=f"Case {i}", expected_result="Works")
+            for i in range(count)
+        ],
+    )
+
+
+def test_render_matches_expected_layout() -> None:
+    content = render_test_spec_file_markdown(_spec(2))
+
+    assert content.startswith("# Auto-Generated Test Specification\n\n**Source spec:**")
+    assert "---\n\n## Test 001: case_0\n" in content
+    assert "---\n\n## Test 002: case_1\n" in content
+    assert content.endswith("---\n") and not content.endswith("\n\n")
+
+
+def test_streamed_chunks_render_one_case_each() -> None:
+    chunks = list(iter_test_spec_file_markdown(_spec(3), include_header=False))
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == render_test_spec_file_markdown(_spec(3), include_header=False)
+
+
+def test_empty_spec_renders_placeholder() -> None:
+    assert render_test_spec_file_markdown(_spec(0), include_header=False) == (
+        "_No test cases were generated._"
+    )
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path: Path) -> None:
+    output = tmp_path / "out" / "spec.md"
+    first = write_test_spec_file_outcome(_spec(2), output)
+    os.utime(output, ns=(1_000_000_000, 1_000_000_000))
+
+    second = write_test_spec_file_outcome(_spec(2), output)
+
+    assert first.written and not second.written
+    assert output.stat().st_mtime_ns == 1_000_000_000
+    assert [p.name for p in output.parent.iterdir()] == ["spec.md"]  # no temp files left
+
+
+def test_changed_output_is_replaced(tmp_path: Path) -> None:
+    output = tmp_path / "spec.md"
+    write_test_spec_file(_spec(1), output)
+    write_test_spec_file(_spec(3), output)
+
+    assert output.read_text(encoding="utf-8") == render_test_spec_file_markdown(_spec(3))
+
+
+def test_write_many_outputs_in_parallel(tmp_path: Path) -> None:
+    items = [(_spec(i + 1, f"spec_{i}.md"), tmp_path / f"out_{i}.md") for i in range(6)]
+    write_test_spec_file(items[0][0], items[0][1])
+
+    outcomes = write_test_spec_files(items, max_workers=4)
+
+    assert [o.path for o in outcomes] == [path for _, path in items]
+    assert [o.written for o in outcomes] == [False, True, True, True, True, True]
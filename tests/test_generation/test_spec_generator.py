@@ -0,0 +1,229 @@
+"""Tests for the LLM-based test specification generator (with stubbed prompts)."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.test_spec_generator import (
+    TestSpecGenerator,
+    build_python_code_context,
+)
+from llmtestgen.wrappers.git_repository import GitRepository
+
+
+def _spec() -> NormalizedSpec:
+    return NormalizedSpec(
+        title="Tasks",
+        requirements=["The system must create tasks."],
+        raw_text="# Tasks\nThe system must create tasks.\n",
+        source_path="specs/tasks.md",
+    )
+
+
+def _send_cases(*_args, **_kwargs) -> str:
+    return json.dumps(
+        {
+            "test_cases": [
+                {
+                    "id": "TC-1",
+                    "requirement": "The system must create tasks.",
+                    "description": "Create a task",
+                    "steps": ["Call create_task('a')"],
+                    "expected_result": "A task is returned.",
+                }
+            ]
+        }
+    )
+
+
+def test_generate_keeps_raw_response_by_default() -> None:
+    result = TestSpecGenerator(_send_cases, model="m").generate(_spec())
+
+    assert [tc.id for tc in result.test_cases] == ["TC-1"]
+    assert result.llm_raw_response == _send_cases()
+    assert result.llm_raw_response_ref is None
+
+
+def test_generate_spills_raw_response_in_lean_mode(tmp_path: Path) -> None:
+    generator = TestSpecGenerator(_send_cases, model="m", raw_response_dir=tmp_path)
+    result = generator.generate(_spec())
+
+    assert result.llm_raw_response is None
+    assert result.llm_raw_response_ref is not None
+    assert Path(result.llm_raw_response_ref.path).parent == tmp_path
+    assert result.get_llm_raw_response() == _send_cases()
+
+
+def test_generate_recovers_fenced_json_and_requests_schema_when_supported():
+    seen = {}
+
+    def send(prompt, **kwargs):
+        seen.update(kwargs)
+        return (
+            "Here are the tests:\n```json\n"
+            + json.dumps({"test_cases": [{"description": "d", "expected_result": "r"}]})
+            + "\n```"
+        )
+
+    spec = NormalizedSpec(source_path="spec.md")
+    result = TestSpecGenerator(send, model="openai/gpt-4o-mini").generate(spec)
+
+    assert [tc.description for tc in result.test_cases] == ["d"]
+    schema = seen["response_format"]["json_schema"]["schema"]
+    assert "test_cases" in schema["properties"]
+
+    seen.clear()
+    TestSpecGenerator(send, model="some/other-model").generate(spec)
+    assert "response_format" not in seen
+
+
+def _case(n: int) -> dict:
+    return {"id": f"TC-{n}", "description": f"Case {n}", "expected_result": "ok"}
+
+
+def test_truncated_answer_is_continued_instead_of_regenerated():
+    full_first = json.dumps({"test_cases": [_case(1), _case(2), _case(3)]})
+    answers = [
+        (full_first[: full_first.index('{"id": "TC-3"') + 10], "length"),
+        (json.dumps({"test_cases": [_case(2), _case(3)]}), "stop"),
+    ]
+    prompts = []
+
+    def send(prompt, *, on_response=None, **_kwargs):
+        prompts.append(prompt)
+        text, reason = answers[len(prompts) - 1]
+        on_response(
+            {
+                "choices": [{"finish_reason": reason}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            }
+        )
+        return text
+
+    result = TestSpecGenerator(send, model="m", dedup_threshold=None).generate(_spec())
+
+    assert [tc.id for tc in result.test_cases] == ["TC-1", "TC-2", "TC-3"]
+    assert result.continuations == 1 and not result.truncated
+    assert result.usage.total_tokens == 30
+    continuation = prompts[1] if isinstance(prompts[1], str) else prompts[1][-1]["text"]
+    assert "TC-1" in continuation and "TC-2" in continuation
+
+
+def test_continuations_are_bounded():
+    truncated = json.dumps({"test_cases": [_case(1), _case(2)]})[:-20]
+    calls = []
+
+    def send(prompt, *, on_response=None, **_kwargs):
+        calls.append(prompt)
+        on_response({"choices": [{"finish_reason": "length"}]})
+        return truncated.replace("TC-1", f"TC-1-{len(calls)}")
+
+    generator = TestSpecGenerator(send, model="m", max_continuations=1, dedup_threshold=None)
+    result = generator.generate(_spec())
+
+    assert len(calls) == 2
+    assert [tc.id for tc in result.test_cases] == ["TC-1-1", "TC-1-2"]
+    assert result.continuations == 1
+    assert result.truncated
+
+
+def test_answer_cut_off_without_continuations_is_flagged():
+    truncated = json.dumps({"test_cases": [_case(1), _case(2)]})[:-20]
+
+    def send(prompt, *, on_response=None, **_kwargs):
+        on_response({"choices": [{"finish_reason": "length"}]})
+        return truncated
+
+    generator = TestSpecGenerator(send, model="m", max_continuations=0, dedup_threshold=None)
+    result = generator.generate(_spec())
+
+    assert [tc.id for tc in result.test_cases] == ["TC-1"]
+    assert result.truncated and result.continuations == 0
+
+
+def test_cut_off_chatty_answer_is_an_error_not_an_empty_result():
+    def send(prompt, *, on_response=None, **_kwargs):
+        on_response({"choices": [{"finish_reason": "length"}]})
+        return "Sorry, I can't help with that [] request, because"
+
+    with pytest.raises(ValueError):
+        TestSpecGenerator(send, model="m").generate(_spec())
+
+
+def test_code_context_reads_heads_and_skips_binary_and_oversized_files(tmp_path: Path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "a_small.py").write_text("def ok():\n    return 1\n")
+    (root / "b_huge.py").write_text("x = 1\n" * 50_000)
+    (root / "c_blob.py").write_bytes(b"\x00\x01binary")
+    (root / "d_minified.py").write_text("y=" + "1+" * 5000 + "1\n")
+
+    context = build_python_code_context(
+        GitRepository(str(root)), max_chars_per_file=100, max_file_bytes=100_000
+    )
+
+    files = [line for line in context.splitlines() if line.startswith("# FILE:")]
+    assert files == [f"# FILE: {path}" for path in GitRepository(str(root)).list_files()]
+    assert "def ok():" in context
+    assert "# [Skipped: 300000 bytes]" in context
+    assert "# [Skipped: binary or not UTF-8]" in context
+    assert context.count("# [Truncated content...]") == 1
+
+
+def test_spec_parsing_repo_loading_and_warm_up_overlap(tmp_path: Path, monkeypatch):
+    import threading
+
+    from llmtestgen.services.spec_analyser.parse_router_normalizer import ParseResult
+    from llmtestgen.services.test_generation import test_spec_generator as module
+
+    # Each stage waits for the other two: a sequential pipeline would time out
+    barrier = threading.Barrier(3, timeout=5)
+
+    def parse_spec(*_args, **_kwargs):
+        barrier.wait()
+        return ParseResult(spec=_spec(), warnings=[])
+
+    def build_context(repo, **_kwargs):
+        barrier.wait()
+        return "CONTEXT"
+
+    monkeypatch.setattr(module, "parse_spec", parse_spec)
+    monkeypatch.setattr(module, "build_python_code_context", build_context)
+    prompts = []
+
+    def send(prompt, **kwargs):
+        prompts.append(prompt if isinstance(prompt, str) else json.dumps(prompt))
+        return _send_cases()
+
+    result = module.generate_test_spec_from_paths(
+        "specs/tasks.md", str(tmp_path), send_prompt_fn=send, model="m", warm_up=barrier.wait
+    )
+
+    assert [tc.id for tc in result.test_cases] == ["TC-1"]
+    assert "CONTEXT" in prompts[0]
+
+
+def test_memory_profiler_records_each_pipeline_stage(tmp_path: Path):
+    from llmtestgen.core.utils_memory import MemoryProfiler
+    from llmtestgen.services.test_generation.test_spec_generator import (
+        generate_test_spec_from_paths,
+    )
+
+    spec = tmp_path / "spec.md"
+    spec.write_text("# Tasks\n\n## Requirements\n- The system must create tasks.\n")
+    (tmp_path / "repo").mkdir()
+    (tmp_path / "repo" / "tasks.py").write_text("def create_task():\n    pass\n")
+    profiler = MemoryProfiler()
+
+    generate_test_spec_from_paths(
+        spec, str(tmp_path / "repo"), send_prompt_fn=_send_cases, model="m",
+        memory_profiler=profiler,
+    )
+    profiler.stop()
+
+    assert [s.stage for s in profiler.stages] == [
+        "parse", "context", "prompt", "request", "response_parse", "dedup"
+    ]
@@ -0,0 +1,142 @@
+"""Tests for incremental regeneration in watch mode."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    TestSpecGenerator,
+)
+from llmtestgen.services.test_generation.watch_session import WatchSession, spec_delta
+from llmtestgen.wrappers.git_repository import GitRepository
+
+
+class _Sender:
+    """Fake LLM answering one test case per requirement listed in the prompt."""
+
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def __call__(self, prompt, **_kwargs) -> str:
+        text = prompt if isinstance(prompt, str) else "".join(p["text"] for p in prompt)
+        self.prompts.append(text)
+        listed = text.split("Extracted requirements:", 1)[-1].split("\n\n")[0]
+        requirements = [line[2:] for line in listed.splitlines() if line.startswith("- ")]
+        return json.dumps(
+            {
+                "test_cases": [
+                    {
+                        "id": f"TC-{idx}",
+                        "requirement": req,
+                        "description": f"Check that {req}",
+                        "expected_result": "ok",
+                    }
+                    for idx, req in enumerate(requirements, 1)
+                ]
+            }
+        )
+
+
+def _spec(*requirements: str, title: str = "Tasks") -> NormalizedSpec:
+    return NormalizedSpec(title=title, requirements=list(requirements), source_path="spec.md")
+
+
+def _session(tmp_path: Path, specs: list, level=CodeContextLevel.FULL):
+    repo_root = tmp_path / "repo"
+    repo_root.mkdir()
+    (repo_root / "tasks.py").write_text("def create_task(name):\n    return name\n")
+    sender = _Sender()
+    generator = TestSpecGenerator(sender, model="m", code_context_level=level)
+    session = WatchSession(
+        tmp_path / "spec.md", generator, lambda: specs[-1], GitRepository(str(repo_root))
+    )
+    return session, sender, repo_root
+
+
+def test_spec_delta_reports_changed_parts():
+    old = NormalizedSpec(
+        sections={"A": "a", "B": "b"}, requirements=["r1", "r2"], source_path="s.md"
+    )
+    new = NormalizedSpec(
+        sections={"A": "a2", "C": "c"}, requirements=["r2", "r3"], source_path="s.md"
+    )
+
+    delta = spec_delta(old, new)
+
+    assert delta.changed_sections == ["A", "C"]
+    assert delta.removed_sections == ["B"]
+    assert delta.added["requirements"] == ["r3"]
+    assert delta.removed["requirements"] == ["r1"]
+    assert spec_delta(old, old).empty
+
+
+def test_spec_edit_regenerates_only_changed_requirements(tmp_path: Path):
+    specs = [_spec("create a task", "delete a task")]
+    session, sender, _ = _session(tmp_path, specs)
+    spec_file = str((tmp_path / "spec.md").resolve())
+
+    first = session.refresh()
+    assert first.regenerated == "all" and first.new_cases == 2
+
+    specs.append(_spec("create a task", "rename a task"))
+    run = session.refresh({spec_file})
+
+    assert (run.reparsed, run.context_rebuilt, run.regenerated) == (True, False, "partial")
+    assert "- rename a task" in sender.prompts[-1]
+    assert "create a task" not in sender.prompts[-1]
+    assert [(tc.id, tc.requirement) for tc in run.test_spec.test_cases] == [
+        ("TC-1", "create a task"),
+        ("TC-1-2", "rename a task"),
+    ]
+
+
+def test_unchanged_inputs_skip_the_llm(tmp_path: Path):
+    specs = [_spec("create a task")]
+    session, sender, repo_root = _session(tmp_path, specs)
+    session.refresh()
+
+    # Re-saved spec with the same content
+    assert session.refresh({str((tmp_path / "spec.md").resolve())}).regenerated == "none"
+
+    # Comment-only edit: compression drops it, so the context is the same
+    source = repo_root / "tasks.py"
+    source.write_text("# helper\ndef create_task(name):\n    return name\n")
+    os.utime(source, ns=(1, 1))
+    run = session.refresh({str(source.resolve())})
+
+    assert (run.reparsed, run.context_rebuilt, run.regenerated) == (False, True, "none")
+    assert len(sender.prompts) == 1
+
+
+def test_code_change_regenerates_everything(tmp_path: Path):
+    specs = [_spec("create a task")]
+    session, sender, repo_root = _session(tmp_path, specs)
+    session.refresh()
+
+    source = repo_root / "tasks.py"
+    source.write_text("def create_task(name):\n    return name.strip()\n")
+    os.utime(source, ns=(1, 1))
+    run = session.refresh({str(source.resolve())})
+
+    assert run.regenerated == "all"
+    assert "name.strip()" in sender.prompts[-1]
+    assert session.generator.context_cache.file_hits == 0  # the only file changed
+
+
+def test_failed_refresh_keeps_previous_state(tmp_path: Path):
+    specs = [_spec("create a task")]
+    session, _, _ = _session(tmp_path, specs)
+    first = session.refresh()
+
+    def broken():
+        raise ValueError("spec does not parse")
+
+    session.parse_fn = broken
+    with pytest.raises(ValueError):
+        session.refresh({str((tmp_path / "spec.md").resolve())})
+    assert session.test_spec is first.test_spec
@@ -0,0 +1,71 @@
+"""Tests for the offline OpenAI-compatible fake LLM server."""
+from __future__ import annotations
+
+import json
+import random
+
+import httpx
+import pytest
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import NormalizedSpec
+from llmtestgen.services.test_generation.test_spec_generator import TestSpecGenerator
+from llmtestgen.testing.fake_llm_server import FakeLLMConfig, FakeLLMServer, LatencyProfile
+from llmtestgen.wrappers import openrouter_client as orc
+
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(FakeLLMConfig(seed=7, test_cases_per_response=3)) as srv:
+        yield srv
+
+
+def test_generator_round_trip_through_base_url(server, monkeypatch) -> None:
+    monkeypatch.setenv("OPENROUTER_BASE_URL", server.base_url)
+    spec = NormalizedSpec(
+        requirements=[
+            "The system must store tasks.",
+            "Tasks must have a due date.",
+            "Completed tasks should be archived after a week.",
+        ],
+        source_path="s.md",
+    )
+
+    result = TestSpecGenerator(orc.send_prompt, api_key="fake", model="fake/llm").generate(spec)
+
+    assert len(result.test_cases) == 3 #nosec
+    assert result.test_cases[0].requirement == "The system must store tasks." #nosec
+    assert result.usage is not None and result.usage.prompt_tokens > 0 #nosec
+
+
+def test_models_endpoint_supports_test_connection(server) -> None:
+    client = orc.OpenRouterClient(api_key="fake", base_url=server.base_url)
+    assert client.test_connection() is True #nosec
+
+
+def test_error_injection_returns_429(monkeypatch) -> None:
+    with FakeLLMServer(FakeLLMConfig(rate_429=1.0)) as srv:
+        client = orc.OpenRouterClient(api_key="fake", base_url=srv.base_url, default_model="m")
+        with pytest.raises(orc.OpenRouterError, match="429"):
+            client.chat_completion([{"role": "user", "content": "hi"}])
+        assert srv.stats["429"] == 1 #nosec
+
+
+def test_streaming_emits_sse_chunks(server) -> None:
+    body = {"model": "m", "stream": True, "messages": [{"role": "user", "content": "- must"}]}
+    with httpx.stream("POST", f"{server.base_url}/chat/completions", json=body) as response:
+        events = [line[6:] for line in response.iter_lines() if line.startswith("data: ")]
+
+    assert events[-1] == "[DONE]" #nosec
+    chunks = [json.loads(event) for event in events[:-1]]
+    content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+    assert len(json.loads(content)["test_cases"]) == 3 #nosec
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop" #nosec
+
+
+def test_latency_profile_is_seeded_and_bounded() -> None:
+    profile = LatencyProfile(distribution="lognormal", mean_ms=100, stddev_ms=80, max_ms=250)
+    first = [profile.sample(random.Random(3)) for _ in range(5)]
+    second = [profile.sample(random.Random(3)) for _ in range(5)]
+
+    assert first == second #nosec
+    assert all(0 <= value <= 0.25 for value in first) #nosec
@@ -0,0 +1,64 @@
+"""Tests for the deterministic synthetic corpus generator."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from llmtestgen.services.spec_analyser.parse_router_normalizer import parse_spec
+from llmtestgen.services.test_generation.test_spec_generator import (
+    CodeContextLevel,
+    generate_test_spec_from_paths,
+)
+from llmtestgen.testing.synthetic_corpus import (
+    CorpusConfig,
+    canned_send_prompt,
+    generate_corpus,
+    scaled_config,
+)
+
+
+def test_same_seed_produces_identical_corpus(tmp_path: Path) -> None:
+    config = CorpusConfig(seed=3, requirements=25, endpoints=8, modules=6, git_history=True)
+    first = generate_corpus(tmp_path / "a", config)
+    second = generate_corpus(tmp_path / "b", config)
+    other = generate_corpus(tmp_path / "c", config.model_copy(update={"seed": 4}))
+
+    assert first.content_hash == second.content_hash
+    assert first.content_hash != other.content_hash
+
+    from git import Repo
+
+    assert Repo(first.repo_path).head.commit.hexsha == Repo(second.repo_path).head.commit.hexsha
+
+
+def test_corpus_sizes_follow_config(tmp_path: Path) -> None:
+    manifest = generate_corpus(tmp_path, scaled_config(10, seed=1, duplicate_ratio=0.5))
+
+    assert len(manifest.requirements) == 100
+    assert len(manifest.endpoints) == 50
+    assert len(manifest.modules) == 30
+    assert len(list((Path(manifest.repo_path) / "vendor").glob("*.py"))) == 15
+
+
+def test_specs_parse_with_classical_parsers(tmp_path: Path) -> None:
+    manifest = generate_corpus(tmp_path, CorpusConfig(seed=2, requirements=12, endpoints=6))
+    send = canned_send_prompt(manifest)
+
+    markdown = parse_spec(manifest.spec_markdown, send_prompt_fn=send).spec
+    openapi = parse_spec(manifest.spec_openapi, send_prompt_fn=send).spec
+
+    assert all(any(req in line for line in markdown.requirements) for req in manifest.requirements)
+    assert openapi.title == "Synthetic API"
+
+
+def test_canned_responses_drive_full_pipeline(tmp_path: Path) -> None:
+    manifest = generate_corpus(tmp_path, CorpusConfig(seed=5, requirements=7, modules=4))
+
+    result = generate_test_spec_from_paths(
+        manifest.spec_markdown,
+        manifest.repo_path,
+        send_prompt_fn=canned_send_prompt(manifest),
+        code_context_level=CodeContextLevel.FILE_LIST,
+    )
+
+    assert [tc.requirement for tc in result.test_cases] == manifest.requirements
+    assert all(tc.target_code_elements for tc in result.test_cases)
@@ -38,4 +38,88 @@ def test_clone_linux_repo_lists_files(live_git: bool) -> None:
     files = gitrepo.list_repo_files("https://github.com/octocat/Hello-World", branch="master")
     assert "README" in files # nosec
     readme = gitrepo.get_file_from_repo("https://github.com/octocat/Hello-World", "README", branch="master")
-    assert "Hello World" in readme # nosec
\ No newline at end of file
+    assert "Hello World" in readme # nosec
+
+@pytest.fixture
+def temp_git_repo(tmp_path: Path) -> Path:
+    from git import Actor, Repo
+
+    root = tmp_path / "gitrepo"
+    repo = Repo.init(root)
+    author = Actor("Test", "test@example.com")
+    (root / "app.py").write_text("VERSION = 1\n")
+    repo.index.add(["app.py"])
+    repo.index.commit("v1", author=author, committer=author)
+    repo.create_tag("v1")
+    (root / "pkg").mkdir()
+    (root / "pkg" / "mod.py").write_text("VERSION = 2\n")
+    (root / "app.py").write_text("VERSION = 2\n")
+    repo.index.add(["app.py", "pkg/mod.py"])
+    repo.index.commit("v2", author=author, committer=author)
+    (root / "app.py").write_text("VERSION = 'uncommitted'\n")
+    repo.close()
+    return root
+
+
+def test_object_mode_reads_refs_without_touching_the_working_tree(temp_git_repo: Path) -> None:
+    head_before = (temp_git_repo / ".git" / "HEAD").read_text()
+
+    with gitrepo.GitRepository(str(temp_git_repo), ref="v1", checkout=False) as old, \
+            gitrepo.GitRepository(str(temp_git_repo), checkout=False) as new:
+        assert old.reads_objects and new.reads_objects
+        assert old.list_files() == ["app.py"]
+        assert sorted(new.list_files()) == ["app.py", "pkg/mod.py"]
+        assert old.get_file_contents("app.py") == "VERSION = 1\n"
+        assert new.get_file_contents("app.py") == "VERSION = 2\n"
+        assert new.file_size("pkg/mod.py") == len("VERSION = 2\n")
+        assert old.file_key("app.py") != new.file_key("app.py")
+        with pytest.raises(gitrepo.GitRepositoryError):
+            old.get_file_contents("pkg/mod.py")
+
+    assert (temp_git_repo / "app.py").read_text() == "VERSION = 'uncommitted'\n"
+    assert (temp_git_repo / ".git" / "HEAD").read_text() == head_before
+
+
+def test_object_mode_rejects_unknown_refs(temp_git_repo: Path) -> None:
+    with pytest.raises(gitrepo.GitRepositoryError, match="Unable to resolve ref"):
+        gitrepo.GitRepository(str(temp_git_repo), ref="nope", checkout=False).open()
+
+
+def test_object_mode_reads_nested_files_from_many_threads(tmp_path: Path) -> None:
+    import threading
+
+    from git import Actor, Repo
+
+    from llmtestgen.services.test_generation.test_spec_generator import _load_file_heads
+
+    root = tmp_path / "nested"
+    repo = Repo.init(root)
+    paths = []
+    for pkg in range(8):
+        for idx in range(40):
+            path = f"pkg/p{pkg}/sub/mod_{idx}.py"
+            (root / path).parent.mkdir(parents=True, exist_ok=True)
+            (root / path).write_text(f"VALUE = {pkg * 100 + idx}\n")
+            paths.append(path)
+    repo.index.add(paths)
+    author = Actor("Test", "test@example.com")
+    repo.index.commit("nested", author=author, committer=author)
+    repo.close()
+
+    heads = []
+    with gitrepo.GitRepository(str(root), checkout=False) as git_repo:
+        # Run in a thread so a deadlock fails the test instead of hanging it
+        worker = threading.Thread(
+            target=lambda: heads.extend(
+                _load_file_heads(
+                    git_repo, paths, max_bytes=100, max_file_bytes=None, max_workers=16
+                )
+            ),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(timeout=60)
+        assert not worker.is_alive(), "reading a ref from several threads deadlocked"
+
+    assert len(heads) == len(paths)
+    assert heads[-1].text == "VALUE = 739\n"
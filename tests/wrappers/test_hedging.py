@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from llmtestgen.wrappers.hedging import HedgedSender, LatencyTracker
+from llmtestgen.wrappers.llm_backend import LLMBackend
+
+
+def _backend(name, *, delay=0.0, answer=None, error=None, calls=None, model=None):
+    def send(prompt, *, api_key=None, model=None, system_prompt=None, on_response=None, **kwargs):
+        if calls is not None:
+            calls.append((name, model, system_prompt))
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        if on_response is not None:
+            on_response({"backend": name})
+        return answer if answer is not None else f"answer from {name}"
+
+    return LLMBackend(name, send, model=model)
+
+
+def test_fast_primary_does_not_hedge():
+    calls = []
+    sender = HedgedSender(
+        _backend("primary", calls=calls),
+        [_backend("secondary", calls=calls)],
+        initial_delay=1.0,
+    )
+
+    assert sender("hi", model="m", system_prompt="sys") == "answer from primary"
+    assert calls == [("primary", "m", "sys")]
+    assert sender.hedges_fired == 0
+
+
+def test_slow_primary_is_hedged_and_secondary_wins():
+    responses = []
+    sender = HedgedSender(
+        _backend("primary", delay=2.0),
+        [_backend("secondary", model="other")],
+        initial_delay=0.05,
+    )
+
+    started = time.perf_counter()
+    answer = sender("hi", on_response=responses.append)
+
+    assert answer == "answer from secondary"
+    assert time.perf_counter() - started < 1.0
+    assert responses == [{"backend": "secondary"}]
+    assert (sender.hedges_fired, sender.hedge_wins) == (1, 1)
+
+
+def test_failed_primary_fails_over_immediately():
+    sender = HedgedSender(
+        _backend("primary", error=RuntimeError("boom")),
+        [_backend("secondary")],
+        initial_delay=30.0,
+    )
+
+    started = time.perf_counter()
+    assert sender("hi") == "answer from secondary"
+    assert time.perf_counter() - started < 1.0
+    assert sender.hedges_fired == 0  # a failover, not a hedge
+
+
+def test_failed_calls_stay_out_of_the_latency_window():
+    sender = HedgedSender(
+        _backend("primary", error=RuntimeError("boom")), [_backend("secondary")]
+    )
+
+    sender("hi")
+
+    assert sender.tracker.count("primary") == 0
+    assert sender.tracker.stats()["primary"].errors == 1
+
+
+def test_hedges_are_scheduled_from_the_request_start():
+    fired = []
+
+    def backend(name, delay, error=None):
+        def send(prompt, **kwargs):
+            fired.append((name, time.perf_counter() - started))
+            time.sleep(delay)
+            if error is not None:
+                raise error
+            return f"answer from {name}"
+
+        return LLMBackend(name, send)
+
+    sender = HedgedSender(
+        backend("primary", 3.0),
+        [backend("flaky", 0.8, RuntimeError("down")), backend("secondary", 0.0)],
+        initial_delay=0.5,
+    )
+
+    started = time.perf_counter()
+    assert sender("hi") == "answer from secondary"
+
+    # Second hedge due at 1.0s; it fires as soon as "flaky" fails (~1.3s),
+    # not a full delay after that failure (~1.8s)
+    assert dict(fired)["secondary"] < 1.6
+    assert sender.hedges_fired == 2
+
+
+def test_invalid_answers_count_as_failures_and_first_error_is_raised():
+    sender = HedgedSender(
+        _backend("primary", answer=""),
+        [_backend("secondary", error=RuntimeError("down"))],
+    )
+
+    with pytest.raises(ValueError, match="Invalid answer from primary"):
+        sender("hi")
+
+
+def test_hedge_delay_tracks_primary_latency_percentile():
+    tracker = LatencyTracker()
+    sender = HedgedSender(
+        _backend("primary"), [], hedge_percentile=0.9, initial_delay=5.0,
+        min_delay=0.1, min_samples=10, tracker=tracker,
+    )
+    assert sender.hedge_delay() == 5.0
+
+    for value in range(1, 11):
+        tracker.record("primary", value / 10)
+
+    assert sender.hedge_delay() == pytest.approx(0.9)
+    stats = tracker.stats()["primary"]
+    assert stats.count == 10 and stats.p50 == pytest.approx(0.5)
+
+
+def test_latency_of_abandoned_request_is_still_recorded():
+    release = threading.Event()
+
+    def slow(prompt, **kwargs):
+        release.wait(5)
+        return "late"
+
+    tracker = LatencyTracker()
+    sender = HedgedSender(
+        LLMBackend("primary", slow), [_backend("secondary")], initial_delay=0.01, tracker=tracker
+    )
+
+    assert sender("hi") == "answer from secondary"
+    release.set()
+    deadline = time.time() + 5
+    while tracker.count("primary") == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert tracker.count("primary") == 1
+
+
+def test_backend_from_spec():
+    backend = LLMBackend.from_spec("openai:gpt-4o-mini")
+    assert backend.model == "gpt-4o-mini"
+
+    local = LLMBackend.from_spec("openrouter:vendor/model:free@http://localhost:9/v1*3")
+    assert (local.model, local.base_url, local.weight) == (
+        "vendor/model:free", "http://localhost:9/v1", 3
+    )
+    with pytest.raises(ValueError):
+        LLMBackend.from_spec("mystery:model")
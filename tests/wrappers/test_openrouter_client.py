@@ -39,3 +39,19 @@ def test_test_connection_handles_failure(stub_httpx_client) -> None:
 
     client = orc.OpenRouterClient()
     assert client.test_connection() is False #nosec
+
+
+def test_send_prompt_reports_full_response(stub_httpx_client) -> None:
+    httpx_helper = stub_httpx_client(orc)
+    payload = {
+        "choices": [{"message": {"content": "ok"}}],
+        "usage": {"prompt_tokens": 10, "prompt_tokens_details": {"cached_tokens": 8}},
+    }
+    httpx_helper["queue_post"](payload)
+    seen = []
+
+    assert orc.send_prompt("Hi", on_response=seen.append) == "ok" #nosec
+    assert seen == [payload] #nosec
+    sent_payload = httpx_helper["calls"]["post"][0]["json"]
+    assert sent_payload["usage"] == {"include": True} #nosec
+    assert "on_response" not in sent_payload #nosec
@@ -0,0 +1,172 @@
+import pytest
+
+from llmtestgen.wrappers.llm_backend import LLMBackend
+from llmtestgen.wrappers.provider_pool import ProviderPool, ProviderPoolError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _backend(name, *, weight=1, fail=None, healthy=True, calls=None):
+    state = {"fail": fail, "healthy": healthy}
+
+    def send(prompt, **kwargs):
+        if calls is not None:
+            calls.append((name, kwargs.get("model")))
+        if state["fail"] is not None:
+            raise state["fail"]
+        return f"answer from {name}"
+
+    backend = LLMBackend(
+        name, send, weight=weight, test_connection_fn=lambda **_: state["healthy"]
+    )
+    backend.state = state
+    return backend
+
+
+def test_weighted_round_robin_spreads_requests_by_weight():
+    calls = []
+    pool = ProviderPool([_backend("a", weight=3, calls=calls), _backend("b", calls=calls)])
+
+    for _ in range(8):
+        pool("hi")
+
+    names = [name for name, _ in calls]
+    assert names.count("a") == 6 and names.count("b") == 2
+    assert names[:4] == ["a", "a", "b", "a"]  # smooth: no long bursts
+
+
+def test_failed_request_fails_over_and_backend_is_ejected():
+    clock = FakeClock()
+    broken = _backend("broken", fail=RuntimeError("boom"))
+    pool = ProviderPool([broken, _backend("ok")], failure_threshold=2, clock=clock)
+
+    assert [pool("hi") for _ in range(3)] == ["answer from ok"] * 3
+
+    status = {s.name: s for s in pool.status()}
+    assert status["broken"].healthy is False
+    assert status["broken"].ejections == 1
+
+
+def test_quota_errors_eject_immediately():
+    pool = ProviderPool(
+        [_backend("limited", fail=RuntimeError("request failed (429): quota")), _backend("ok")],
+        failure_threshold=5,
+    )
+
+    pool("hi")
+
+    assert {s.name: s.healthy for s in pool.status()} == {"limited": False, "ok": True}
+
+
+def test_readmission_after_cooldown_requires_health_check():
+    clock = FakeClock()
+    flaky = _backend("flaky", fail=RuntimeError("(503)"), healthy=False)
+    pool = ProviderPool([flaky, _backend("ok")], failure_threshold=1, cooldown=10, clock=clock)
+    pool("hi")  # ejects flaky
+
+    clock.now = 11
+    pool("hi")  # health check fails -> cool-down doubles
+    assert pool.status()[0].healthy is False
+    assert pool.status()[0].ejected_for == pytest.approx(20)
+
+    flaky.state.update(fail=None, healthy=True)
+    clock.now = 32
+    pool("hi")
+    assert pool.status()[0].healthy is True
+
+
+def test_all_backends_failing_raises_pool_error():
+    pool = ProviderPool([_backend("a", fail=RuntimeError("x")), _backend("b", fail=RuntimeError("y"))])
+
+    with pytest.raises(ProviderPoolError, match="a: x"):
+        pool("hi")
+
+
+def test_everything_ejected_still_tries_the_soonest_backend():
+    clock = FakeClock()
+    backend = _backend("only", fail=RuntimeError("(429)"))
+    pool = ProviderPool([backend], clock=clock, cooldown=100)
+    with pytest.raises(ProviderPoolError):
+        pool("hi")
+
+    backend.state["fail"] = None
+    assert pool("hi") == "answer from only"
+    assert pool.status()[0].healthy is True
+
+
+def test_pinned_model_overrides_caller_model():
+    calls = []
+    pinned = _backend("pinned", calls=calls)
+    pinned.model = "fixed"
+    pool = ProviderPool([pinned])
+
+    pool("hi", model="routed")
+
+    assert calls == [("pinned", "fixed")]
+
+
+def test_caller_model_and_key_only_reach_the_callers_provider(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-openai")
+    seen = []
+
+    def send(prompt, **kwargs):
+        seen.append((kwargs.get("model"), kwargs.get("api_key")))
+        raise RuntimeError("down")
+
+    router = LLMBackend("openrouter", send, provider="openrouter")
+    openai = LLMBackend("openai:gpt-4o-mini", send, model="gpt-4o-mini", provider="openai")
+    pool = ProviderPool([router, openai])
+
+    with pytest.raises(ProviderPoolError):
+        pool("hi", model="anthropic/claude-3.5-sonnet", api_key="sk-or-key")
+
+    assert seen == [("anthropic/claude-3.5-sonnet", "sk-or-key"), ("gpt-4o-mini", None)]
+
+
+def test_other_providers_must_pin_a_model_and_have_a_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    with pytest.raises(ValueError, match="openai:MODEL"):
+        ProviderPool.from_specs(["openrouter", "openai"])
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        ProviderPool.from_specs(["openrouter", "openai:gpt-4o-mini"])
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-openai")
+    ProviderPool.from_specs(["openrouter", "openai:gpt-4o-mini"])
+
+
+def test_check_health_ejects_unhealthy_backends():
+    pool = ProviderPool([_backend("up"), _backend("down", healthy=False)])
+
+    assert pool.check_health() == {"up": True, "down": False}
+    assert [s.healthy for s in pool.status()] == [True, False]
+
+
+def test_options_for_the_callers_model_are_adapted_to_pinned_models(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-openai")
+    seen = []
+
+    def send(prompt, **kwargs):
+        seen.append((prompt, "response_format" in kwargs))
+        raise RuntimeError("down")
+
+    parts = [
+        {"type": "text", "text": "context", "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "spec"},
+    ]
+    pool = ProviderPool([
+        LLMBackend("openrouter", send, provider="openrouter"),
+        LLMBackend("openai:llama3", send, model="llama3", provider="openai"),
+        LLMBackend("openai:gpt-4o-mini", send, model="gpt-4o-mini", provider="openai"),
+    ])
+
+    with pytest.raises(ProviderPoolError):
+        pool(parts, model="anthropic/claude-3.5-sonnet", response_format={"type": "json_schema"})
+
+    assert seen == [(parts, True), ("context\n\nspec", False), ("context\n\nspec", True)]